@@ -0,0 +1,124 @@
+"""
+add_drop.py — Add/Drop Marginal Value
+For every free agent × every player on my roster, how much my weighted
+category totals change if I add one and drop the other — over the rest of
+this fantasy week and over the rest of the season.
+
+    value(FA, drop) = Σ_cat weight · (per-game z(FA) · games(FA) − per-game z(drop) · games(drop))
+
+Per-game z: counting stats are per-game rates divided by the league spread of
+that rate; GAA / SV% use their {cat}V z-score once per game started. A goalie
+only starts part of his team's games, so his games are his team's games × his
+start share (gp_planner.goalie_start_shares). The full (FAs × roster ×
+categories) tensor is computed in one broadcast.
+"""
+
+import numpy as np
+import pandas as pd
+from lineup_optimizer import eligible_slots
+
+
+RATE_CATS = {'GAA', 'SV%'}
+
+
+def per_game_z(players, pool, cats):
+    """
+    Players × cats matrix of per-game value in league standard units.
+
+    Args:
+        players: scored players (raw category totals, GP, {cat}V)
+        pool:    the scored league pool that sets each category's spread
+    """
+    gp_pool = pd.to_numeric(pool['GP'], errors='coerce').clip(lower=1)
+    gp      = pd.to_numeric(players['GP'], errors='coerce').clip(lower=1)
+    out = np.zeros((len(players), len(cats)))
+    for j, c in enumerate(cats):
+        if c in RATE_CATS:
+            col = f"{c}V"
+            if col in players.columns:
+                out[:, j] = pd.to_numeric(players[col], errors='coerce').fillna(0).to_numpy()
+        elif c in players.columns and c in pool.columns:
+            spread = (pd.to_numeric(pool[c], errors='coerce') / gp_pool).std()
+            if spread and spread > 0:
+                out[:, j] = (pd.to_numeric(players[c], errors='coerce') / gp / spread).fillna(0).to_numpy()
+    return out
+
+
+def expected_games(players, games, start_share=None):
+    """
+    Games each player is expected to play: his team's games, times his start
+    share for a goalie (a goalie missing from start_share starts every game).
+    """
+    g = players['Team'].map(games).fillna(0).to_numpy(dtype=float)
+    if not start_share or players.empty:
+        return g
+    names = players['Player'].fillna(players['name']) if 'Player' in players.columns else players['name']
+    share = np.array([float(start_share.get(n, 1.0)) if eligible_slots(r) == {'G'} else 1.0
+                      for n, r in zip(names, players.to_dict('records'))])
+    return g * share
+
+
+def add_drop_matrix(fa, roster, pool, cats, weights, week_games, season_games=None, start_share=None):
+    """
+    Marginal value of every add/drop pair.
+
+    Args:
+        fa, roster:   free agents / my roster (scored overlay slices with Team)
+        pool:         scored league pool (final)
+        cats:         categories (skater + goalie)
+        weights:      {cat: weight}; goalie cats default to 1.0
+        week_games:   {NHL team: games left this fantasy week}
+        season_games: {NHL team: games left this season}; None skips the season horizon
+        start_share:  {Player: share of team games started} for goalies (goalie_start_shares)
+
+    Returns:
+        Dict with 'week' and 'season' DataFrames (FA name × roster name) and the
+        (FAs × roster × cats) 'by_cat_week' / 'by_cat_season' arrays
+    """
+    w  = np.array([weights.get(c, 1.0) for c in cats], dtype=float)
+    fz = per_game_z(fa, pool, cats)
+    rz = per_game_z(roster, pool, cats)
+
+    out = {}
+    for horizon, games in (('week', week_games), ('season', season_games)):
+        if games is None:
+            continue
+        fg = expected_games(fa, games, start_share)
+        rg = expected_games(roster, games, start_share)
+        by_cat = (fz * fg[:, None])[:, None, :] - (rz * rg[:, None])[None, :, :]
+        out[f"by_cat_{horizon}"] = by_cat * w
+        out[horizon] = pd.DataFrame(out[f"by_cat_{horizon}"].sum(axis=2),
+                                    index=fa['name'].to_numpy(), columns=roster['name'].to_numpy())
+    return out
+
+
+def rank_add_drops(matrix, fa, roster, cats, by='week', top_n=25):
+    """
+    Best add/drop pairs as a table, ranked on one horizon.
+
+    Returns:
+        DataFrame: Add, Drop, Week_Gain, Season_Gain (only when the matrix has the
+        season horizon), Add_G / Drop_G (games this week), Top_Cats
+    """
+    key   = matrix[by].to_numpy()
+    flat  = np.argsort(-key, axis=None)[:top_n]
+    fi, ri = np.unravel_index(flat, key.shape)
+    by_cat = matrix[f"by_cat_{by}"]
+    rows = []
+    for f, r in zip(fi, ri):
+        gains = by_cat[f, r]
+        top   = [cats[j] for j in np.argsort(-gains)[:3] if gains[j] > 0]
+        row = {
+            'Add':         fa['name'].iat[f],
+            'Drop':        roster['name'].iat[r],
+            'Week_Gain':   matrix['week'].iat[f, r],
+        }
+        if 'season' in matrix:
+            row['Season_Gain'] = matrix['season'].iat[f, r]
+        row.update({
+            'Add_G':       int(fa['Rem G'].iat[f]) if 'Rem G' in fa.columns else None,
+            'Drop_G':      int(roster['Rem G'].iat[r]) if 'Rem G' in roster.columns else None,
+            'Top_Cats':    ", ".join(top),
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -6,31 +6,113 @@ from datetime import datetime, timedelta, date
 
 warnings.filterwarnings("ignore", category=SyntaxWarning)
 
-# ── Inject secrets into env BEFORE importing supabase ────────────────────────
+# ── Inject secrets into env BEFORE the Supabase client is created ─────────────
 try:
     if "SUPABASE_URL" in st.secrets: os.environ["SUPABASE_URL"] = st.secrets["SUPABASE_URL"]
     if "SUPABASE_KEY" in st.secrets: os.environ["SUPABASE_KEY"] = st.secrets["SUPABASE_KEY"]
 except Exception:
     pass
 
-from supabase_config import supabase
+import shared_frames  # switches pandas to copy-on-write before any frame is built
+from supabase_config import get_supabase
 from data_fetcher import get_nhl_skater_stats, get_nhl_goalie_stats, get_nhl_schedule, get_fantasy_weeks, get_multi_week_schedule, get_blended_projections
-from goalie_intel import get_todays_goalies, calculate_sos_score, get_goalie_streaming_ranks, GOALIE_RESOURCES
 from monster_math import calculate_z_scores
 from config import SUPPORTED_CATS, GOALIE_CATS, DEFAULT_CATS, DEFAULT_G_CATS, get_team_logo, get_headshot
-
-# Tab renderers
-from tabs import dashboard, schedule, war_room, trends, wire_hawk, power_rankings, matchup
-from tabs import goalie_intel_tab, playoff_primer, nexus_board_tab
+from league_overlay import refresh_league_overlay, use_league_snapshot, use_private_league_data, to_cache_records, from_cache_records
+from league_cache import get_league_snapshot, peek_league_snapshot, get_shared_projections, ros_snapshot_key
+from swr_cache import get_swr, snapshot_status
 
 # ── Cached data loaders ───────────────────────────────────────────────────────
-@st.cache_data
+# Stale-while-revalidate: one read-only copy per season/timeframe shared by every
+# session, served instantly from the last good snapshot while a refresh runs.
+STATS_MAX_AGE = 30 * 60   # seconds before a stats snapshot is refreshed in the background
+rendered_snapshots = []   # keys this run rendered from (drives the freshness badge)
+
 def load_skaters(season, start_date, end_date=None):
-    return get_nhl_skater_stats(season, start_date, end_date)
+    key = ('skaters', season, start_date, end_date)
+    rendered_snapshots.append(key)
+    return get_swr(key, lambda: get_nhl_skater_stats(season, start_date, end_date), STATS_MAX_AGE)
 
-@st.cache_data
 def load_goalies(season, start_date, end_date=None):
-    return get_nhl_goalie_stats(season, start_date, end_date)
+    key = ('goalies', season, start_date, end_date)
+    rendered_snapshots.append(key)
+    return get_swr(key, lambda: get_nhl_goalie_stats(season, start_date, end_date), STATS_MAX_AGE)
+
+def _age_label(seconds):
+    minutes = int(seconds // 60)
+    if minutes < 1:  return "just now"
+    if minutes < 60: return f"{minutes} min ago"
+    return f"{minutes // 60} h {minutes % 60} min ago"
+
+def render_freshness_badge(keys):
+    status = snapshot_status(keys)
+    if status is None:
+        return
+    age = _age_label(datetime.now().timestamp() - status['fetched_at'])
+    if not status['refreshing']:
+        st.caption(f"🟢 Data updated {age}")
+        return
+
+    rendered_versions = status['versions']
+
+    # Poll only while a background refresh is in flight; rerun the page once it lands
+    @st.fragment(run_every=5)
+    def refreshing_badge():
+        now = snapshot_status(keys)
+        if now is None or now['versions'] != rendered_versions:
+            st.rerun()
+        st.caption(f"🟡 Showing snapshot from {age} — refreshing in the background…")
+
+    refreshing_badge()
+
+# ── League sync helpers ───────────────────────────────────────────────────────
+def apply_yahoo_league(league_key, snapshot, league_meta):
+    """
+    Makes a synced Yahoo league this session's active league: settings into
+    session state, the shared snapshot into the overlay, and the Supabase
+    restore cache brought up to date (only the changed rows when possible).
+
+    Returns:
+        False if there is no snapshot to use.
+    """
+    from yahoo_bridge import find_my_yahoo_team
+
+    league_meta = league_meta or {}
+    if league_meta.get('cats'):
+        st.session_state['league_cats'] = league_meta['cats']
+    if league_meta.get('roster_slots'):
+        st.session_state['league_roster_slots'] = league_meta['roster_slots']
+    if league_meta.get('end_date'):
+        st.session_state['league_end_date'] = str(league_meta['end_date'])
+    if snapshot is None:
+        return False
+
+    my_team = find_my_yahoo_team(snapshot, league_key)
+    use_league_snapshot(snapshot, 'Yahoo', league_key, my_team)
+    st.session_state['sync_platform']     = 'Yahoo'
+    st.session_state['active_league_key'] = league_key
+    guid = st.session_state['yahoo_token_data'].get('guid', 'unknown')
+    supabase = get_supabase()
+    if supabase:
+        try:
+            yahoo_df = snapshot['players'].assign(Is_Mine=snapshot['players']['Fantasy_Team'] == my_team)
+            saved    = st.session_state.get('league_cache_saved')
+            changed  = snapshot.get('changed')
+            table    = supabase.table('yahoo_league_cache')
+            if saved == (league_key, my_team, snapshot['version']):
+                pass   # this snapshot is already in the cache
+            elif changed is not None and saved == (league_key, my_team, snapshot.get('base_version')):
+                # Only the rows the transactions touched
+                if changed:
+                    table.delete().eq('guid', guid).in_('match_key', list(changed)).execute()
+                    table.insert(to_cache_records(yahoo_df[yahoo_df['match_key'].isin(changed)], guid)).execute()
+            else:
+                table.delete().eq('guid', guid).execute()
+                table.insert(to_cache_records(yahoo_df, guid)).execute()
+            st.session_state['league_cache_saved'] = (league_key, my_team, snapshot['version'])
+        except Exception as e:
+            print(f"⚠️ Cache save failed: {e}")
+    return True
 
 # ── Page config & global CSS ──────────────────────────────────────────────────
 st.set_page_config(page_title="PuckNexus", layout="wide")
@@ -101,7 +183,7 @@ with st.expander("📡 GLOBAL CONTROL CENTER & LEAGUE SYNC", expanded=True):
 
     with col_sync:
         st.markdown("### 🏒 League Sync")
-        from yahoo_bridge import get_yahoo_auth_url, exchange_code_for_token, get_user_leagues, fetch_yahoo_data, get_league_cats
+        from yahoo_bridge import get_yahoo_auth_url, exchange_code_for_token, get_user_leagues, sync_yahoo_league, sync_all_yahoo_leagues, get_league_meta
 
         platform = st.radio("Platform", ["Yahoo", "ESPN"], horizontal=True, key="platform_choice")
 
@@ -126,44 +208,47 @@ with st.expander("📡 GLOBAL CONTROL CENTER & LEAGUE SYNC", expanded=True):
                 leagues_dict = st.session_state.get('available_leagues', {})
                 if leagues_dict:
                     selected_league_name = st.selectbox("Active League", options=list(leagues_dict.keys()), label_visibility="collapsed")
-                    c_sync, c_dis = st.columns(2)
+                    league_key = leagues_dict[selected_league_name]
+                    # A league synced earlier (or via Sync All) is switched to straight from the cache
+                    if st.session_state.get('active_league_key') != league_key:
+                        cached = peek_league_snapshot('Yahoo', league_key)
+                        if cached is not None:
+                            apply_yahoo_league(league_key, cached, get_league_meta(league_key))
+                            st.rerun()
+                    c_sync, c_all, c_dis = st.columns(3)
                     with c_sync:
                         if st.button("🔄 Sync Data", use_container_width=True):
                             with st.spinner("Pulling fresh data..."):
-                                yahoo_df    = fetch_yahoo_data(leagues_dict[selected_league_name])
-                                league_cats = get_league_cats(leagues_dict[selected_league_name])
-                                if league_cats:
-                                    st.session_state['league_cats'] = league_cats
-                                # Fetch league end date for ROS projections
-                                from yahoo_bridge import get_league_end_date
-                                league_end = get_league_end_date(leagues_dict[selected_league_name])
-                                if league_end:
-                                    st.session_state['league_end_date'] = str(league_end)
-                                if yahoo_df is None or yahoo_df.empty:
-                                    st.error("Sync failed — no data returned.")
-                                else:
-                                    st.session_state['yahoo_data']    = yahoo_df
-                                    st.session_state['sync_platform'] = 'Yahoo'
-                                    guid = st.session_state['yahoo_token_data'].get('guid', 'unknown')
-                                    if supabase:
-                                        try:
-                                            records = yahoo_df.astype(str).to_dict(orient='records')
-                                            for rec in records: rec['guid'] = guid
-                                            supabase.table('yahoo_league_cache').delete().eq('guid', guid).execute()
-                                            supabase.table('yahoo_league_cache').insert(records).execute()
-                                        except Exception as e:
-                                            print(f"⚠️ Cache save failed: {e}")
+                                # Replays the transactions feed onto the last snapshot when there is one;
+                                # forced, so a move made minutes after another session's sync still shows
+                                snapshot    = get_league_snapshot('Yahoo', league_key,
+                                                                  lambda: sync_yahoo_league(league_key, peek_league_snapshot('Yahoo', league_key)),
+                                                                  force=True)
+                                # Settings, cats, roster slots and end date in one cached pull
+                                league_meta = get_league_meta(league_key)
+                                if apply_yahoo_league(league_key, snapshot, league_meta):
                                     st.success("Synced!")
                                     st.rerun()
+                                st.error("Sync failed — no data returned.")
+                    with c_all:
+                        if st.button("🔁 Sync All", use_container_width=True, help="Sync every league at once"):
+                            with st.spinner(f"Syncing {len(leagues_dict)} leagues..."):
+                                results = sync_all_yahoo_leagues(list(leagues_dict.values()))
+                                snapshot, league_meta = results.get(league_key, (None, None))
+                                if apply_yahoo_league(league_key, snapshot, league_meta):
+                                    st.rerun()
+                                st.error("Sync failed — no data returned.")
                     with c_dis:
                         if st.button("Disconnect", type="tertiary", use_container_width=True):
+                            from yahoo_bridge import forget_yahoo_session
+                            forget_yahoo_session(st.session_state['yahoo_token_data'].get('guid'))
                             del st.session_state['yahoo_token_data']
                             st.rerun()
                 else:
                     st.warning("No hockey leagues found.")
 
         else:  # ESPN
-            from espn_bridge import fetch_espn_data, get_espn_league_cats
+            from espn_bridge import fetch_espn_league, find_my_espn_team
             st.caption("Cookies found in Chrome DevTools → Application → Cookies → espn.com")
             espn_lid  = st.text_input("ESPN League ID", key="espn_lid")
             espn_year = st.text_input("Season Year", value="2026", key="espn_year")
@@ -175,13 +260,21 @@ with st.expander("📡 GLOBAL CONTROL CENTER & LEAGUE SYNC", expanded=True):
                 if espn_lid and espn_s2 and espn_swid:
                     with st.spinner("Connecting to ESPN..."):
                         try:
-                            espn_df     = fetch_espn_data(espn_lid, espn_year, espn_s2, espn_swid)
-                            league_cats = get_espn_league_cats(espn_lid, espn_year, espn_s2, espn_swid)
-                            if league_cats:
-                                st.session_state['league_cats'] = league_cats
-                            st.session_state['yahoo_data']    = espn_df
+                            espn_key    = f"{espn_lid}:{espn_year}"
+                            # Shared snapshot only served to SWIDs that own a team in the league;
+                            # the same single League build carries the scoring cats
+                            snapshot    = get_league_snapshot(
+                                'ESPN', espn_key,
+                                lambda: fetch_espn_league(espn_lid, espn_year, espn_s2, espn_swid),
+                                authorize=lambda snap: find_my_espn_team(snap, espn_swid) is not None,
+                            )
+                            if snapshot is None:
+                                raise ValueError("no data returned")
+                            if snapshot.get('cats'):
+                                st.session_state['league_cats'] = snapshot['cats']
+                            use_league_snapshot(snapshot, 'ESPN', espn_key, find_my_espn_team(snapshot, espn_swid))
                             st.session_state['sync_platform'] = 'ESPN'
-                            st.success(f"ESPN synced: {len(espn_df)} players loaded.")
+                            st.success(f"ESPN synced: {len(snapshot['players'])} players loaded.")
                             st.rerun()
                         except Exception as e:
                             st.error(f"ESPN sync failed: {e}")
@@ -200,9 +293,9 @@ if 'yahoo_data' not in st.session_state and 'yahoo_token_data' in st.session_sta
     guid = st.session_state['yahoo_token_data'].get('guid')
     if guid:
         try:
-            cached = supabase.table('yahoo_league_cache').select('*').eq('guid', guid).execute()
+            cached = get_supabase().table('yahoo_league_cache').select('*').eq('guid', guid).execute()
             if cached.data:
-                st.session_state['yahoo_data'] = pd.DataFrame(cached.data)
+                use_private_league_data(from_cache_records(cached.data))
         except Exception:
             pass
 
@@ -214,32 +307,23 @@ calc_end_date   = stats_end_date   if stats_end_date   else None
 s_df_global = load_skaters(calc_season, calc_start_date, calc_end_date)
 g_df_global = load_goalies(calc_season, calc_start_date, calc_end_date)
 
-# Blended ROS projections — computed separately and stored in session state
-ros_projections = st.session_state.get('ros_projections', None)
-
-# Force clear stale/empty cached projections
-if ros_projections is not None:
-    if not isinstance(ros_projections, dict) or ros_projections.get('skaters', pd.DataFrame()).empty:
-        del st.session_state['ros_projections']
-        ros_projections = None
+# Blended ROS projections — shared by every session for the same season / end date
+ros_projections = None
 
 if projection_mode == "Blended ROS" and timeframe == "Full Season" and "code" not in st.query_params:
     league_end_date = st.session_state.get('league_end_date', None)
     end_label = f"to {league_end_date}" if league_end_date else "to end of NHL regular season"
-    if ros_projections is None:
-        with st.spinner(f"🔀 Building Blended ROS projections ({end_label})..."):
-            ros_projections = get_blended_projections(calc_season, season_end_date=league_end_date)
-            st.session_state['ros_projections'] = ros_projections
+    with st.spinner(f"🔀 Building Blended ROS projections ({end_label})..."):
+        ros_projections = get_shared_projections(
+            calc_season, league_end_date,
+            lambda: get_blended_projections(calc_season, season_end_date=league_end_date)
+        )
+    rendered_snapshots.append(ros_snapshot_key(calc_season, league_end_date))
     if ros_projections and not ros_projections['skaters'].empty:
         s_df_global = ros_projections['skaters']
     if ros_projections and not ros_projections['goalies'].empty:
         g_df_global = ros_projections['goalies']
     st.caption(f"📊 **Blended ROS Mode** — GP = games remaining, stats = projected totals ({end_label}). 65% recent pace + 35% season average.")
-else:
-    # Clear cached projections when switching back to Season Stats
-    if 'ros_projections' in st.session_state and projection_mode == "Season Stats":
-        del st.session_state['ros_projections']
-        ros_projections = None
 
 if timeframe != "Full Season":
     s_base = load_skaters(calc_season, None, None)
@@ -324,7 +408,21 @@ elif not evaluated_df.empty:
 else:
     final = pd.DataFrame()
 
+# ── League overlay: synced rosters × scores, sliced by every tab ─────────────
+refresh_league_overlay(final, (
+    calc_season, calc_start_date, calc_end_date, projection_mode,
+    ros_projections.get('end_date') if ros_projections else None,
+    tuple(sorted(weights.items())),
+))
+
+render_freshness_badge(list(dict.fromkeys(rendered_snapshots)))
+
 # ── Tabs ──────────────────────────────────────────────────────────────────────
+# Tab renderers are imported here, not at the top, so the header and control
+# center paint before the tab modules (Styler, goalie intel, NexusBoard) load.
+from tabs import dashboard, schedule, war_room, trends, wire_hawk, power_rankings, matchup
+from tabs import goalie_intel_tab, playoff_primer, nexus_board_tab
+
 tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
     "📊 DASHBOARD", "📅 SCHEDULE", "⚖️ WAR ROOM", "📈 TRENDS",
     "🦅 WIRE HAWK", "🏆 POWER RANKINGS", "⚔️ MATCHUP",
@@ -333,10 +431,10 @@ tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
 
 dashboard.render(tab1, final, evaluated_df, evaluated_goalies, cats, g_cats, weights, selected_pos)
 schedule.render(tab2)
-war_room.render(tab3, final, cats, weights)
+war_room.render(tab3, final, g_df_global, cats, g_cats, weights)
 trends.render(tab4, calc_season, cats, weights, selected_pos)
-wire_hawk.render(tab5, final, cats, weights)
-power_rankings.render(tab6, evaluated_df, evaluated_goalies, cats, weights)
+wire_hawk.render(tab5, final, g_df_global, cats, g_cats, weights)
+power_rankings.render(tab6, evaluated_df, evaluated_goalies, cats, weights, s_df_global, g_df_global, calc_season)
 matchup.render(tab7, s_df_global, g_df_global, cats, g_cats, weights, calc_season, timeframe, projection_mode)
 goalie_intel_tab.render(tab8, g_df_global)
 nexus_board_tab.render(tab9, evaluated_df, g_df_global, cats, weights, calc_season)
@@ -10,6 +10,11 @@ GOALIE_CATS   = {'W', 'GAA', 'SV%', 'SHO', 'GA', 'SA', 'SV', 'GS', 'L'}
 DEFAULT_CATS  = ['G', 'A', '+/-', 'PIM', 'PPP', 'SOG', 'HIT', 'BLK']
 DEFAULT_G_CATS = ['W', 'GAA', 'SV%', 'SHO']
 
+# ── Roster slots ──────────────────────────────────────────────────────────────
+DEFAULT_ROSTER_SLOTS = {'C': 2, 'LW': 2, 'RW': 2, 'D': 4, 'Util': 1, 'G': 2}
+GP_CAP_PER_SLOT      = 82   # typical games-played limit per lineup spot over a season
+NHL_POS_TO_SLOT      = {'C': 'C', 'L': 'LW', 'R': 'RW', 'D': 'D', 'G': 'G', 'LW': 'LW', 'RW': 'RW'}
+
 # ── Team logo helper ──────────────────────────────────────────────────────────
 _LOGO_MAP = {
     "NJD": "nj", "SJS": "sj", "LAK": "la",
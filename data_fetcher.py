@@ -1,7 +1,9 @@
 import requests
 import pandas as pd
 from datetime import datetime, timedelta, date
-from supabase_config import supabase  # Added for Phase 2
+from supabase_config import get_supabase  # Added for Phase 2
+
+NHL_SEASON_END = date(2026, 4, 17)  # last day of the NHL regular season
 
 # --- HELPER: PAGINATION ENGINE ---
 def _fetch_all(url, params, limit=100):
@@ -67,6 +69,7 @@ def _fetch_all(url, params, limit=100):
 def get_nhl_skater_stats(season="20252026", start_date=None, end_date=None):
 
     is_full_season = start_date is None and end_date is None
+    supabase = get_supabase() if is_full_season else None
     
     # --- PHASE 2: SUPABASE CACHE CHECK ---
     if is_full_season:
@@ -192,8 +195,46 @@ def get_nhl_skater_stats(season="20252026", start_date=None, end_date=None):
     
 
 # --- GOALIES ---
+# Goalie frame column → Supabase goalie_stats column
+GOALIE_DB_COLUMNS = {
+    'playerId': 'player_id', 'Player': 'player_name', 'Team': 'team_abbrev',
+    'GP': 'gp', 'W': 'w', 'GAA': 'gaa', 'SV%': 'sv_pct', 'SHO': 'sho',
+    'GA': 'ga', 'SA': 'sa', 'SV': 'sv', 'TOI_min': 'toi_min',
+}
+GOALIE_COMPONENT_DB_COLUMNS = ['ga', 'sa', 'sv', 'toi_min']
+
+# Run once in the Supabase SQL editor on a goalie_stats table created before component stats
+GOALIE_CACHE_MIGRATION = """
+alter table goalie_stats
+    add column if not exists ga      integer,
+    add column if not exists sa      integer,
+    add column if not exists sv      integer,
+    add column if not exists toi_min double precision;
+"""
+
+
+def goalie_rates_from_components(df):
+    """
+    Recomputes GAA and SV% from GA / SA / SV / TOI_min wherever the components are present,
+    vectorized over the whole frame. Works for a single goalie's line or any sum of lines.
+    Rows with missing or zero TOI / shots against keep their stored rate (NaN if there is none).
+    """
+    if df.empty:
+        return df
+    if {'GA', 'TOI_min'} <= set(df.columns):
+        toi = pd.to_numeric(df['TOI_min'], errors='coerce')
+        gaa = (pd.to_numeric(df['GA'], errors='coerce') * 60 / toi.where(toi > 0)).round(3)
+        df['GAA'] = gaa.fillna(pd.to_numeric(df['GAA'], errors='coerce')) if 'GAA' in df.columns else gaa
+    if {'SV', 'SA'} <= set(df.columns):
+        sa = pd.to_numeric(df['SA'], errors='coerce')
+        sv_pct = (pd.to_numeric(df['SV'], errors='coerce') / sa.where(sa > 0)).round(4)
+        df['SV%'] = sv_pct.fillna(pd.to_numeric(df['SV%'], errors='coerce')) if 'SV%' in df.columns else sv_pct
+    return df
+
+
 def get_nhl_goalie_stats(season="20252026", start_date=None, end_date=None):
     is_full_season = start_date is None and (end_date is None or end_date == str(date.today()))
+    supabase = get_supabase() if is_full_season else None
     
     # --- SUPABASE CACHE CHECK ---
     if is_full_season:
@@ -206,12 +247,16 @@ def get_nhl_goalie_stats(season="20252026", start_date=None, end_date=None):
                     print("📦 PuckNexus Cache Hit: Loading Goalies from Supabase...")
                     full_db = supabase.table("goalie_stats").select("*").execute()
                     db_df = pd.DataFrame(full_db.data)
-                    
-                    return db_df.rename(columns={
-                        'player_id': 'playerId', 'player_name': 'Player', 
-                        'team_abbrev': 'Team', 'gp': 'GP', 'w': 'W', 
-                        'gaa': 'GAA', 'sv_pct': 'SV%', 'sho': 'SHO'
-                    })
+
+                    missing = [c for c in GOALIE_COMPONENT_DB_COLUMNS if c not in db_df.columns]
+                    if missing:
+                        # Table not migrated: W / SHO still serve from it; GAA / SV% matchups
+                        # count as ties until the components are stored
+                        print(f"⚠️ goalie_stats has no {', '.join(missing)} columns — run GOALIE_CACHE_MIGRATION:{GOALIE_CACHE_MIGRATION}")
+                        return db_df.rename(columns={v: k for k, v in GOALIE_DB_COLUMNS.items()})
+                    # Migrated but never backfilled (components all null) — refetch once to fill them
+                    if db_df[GOALIE_COMPONENT_DB_COLUMNS].notna().all(axis=1).any():
+                        return db_df.rename(columns={v: k for k, v in GOALIE_DB_COLUMNS.items()})
         except Exception as e:
             print(f"⚠️ Goalie cache check failed: {e}")
 
@@ -237,33 +282,45 @@ def get_nhl_goalie_stats(season="20252026", start_date=None, end_date=None):
         rename_map = {
             'goalieFullName': 'Player', 'teamAbbrevs': 'Team',
             'gamesPlayed': 'GP', 'wins': 'W', 'goalsAgainstAverage': 'GAA',
-            'savePct': 'SV%', 'shutouts': 'SHO'
+            'savePct': 'SV%', 'shutouts': 'SHO',
+            'goalsAgainst': 'GA', 'shotsAgainst': 'SA', 'saves': 'SV', 'timeOnIce': 'TOI_min'
         }
         
         available_cols = ['playerId'] + [c for c in rename_map.keys() if c in final_df.columns]
         final_df = final_df[available_cols].rename(columns=rename_map)
         
-        int_cols = ['GP', 'W', 'SHO']
+        int_cols = ['GP', 'W', 'SHO', 'GA', 'SA', 'SV']
         for col in int_cols:
             if col in final_df.columns:
                 final_df[col] = pd.to_numeric(final_df[col], errors='coerce').fillna(0).astype(int)
                 
-        float_cols = ['GAA', 'SV%']
+        float_cols = ['GAA', 'SV%', 'TOI_min']
         for col in float_cols:
             if col in final_df.columns:
                 final_df[col] = pd.to_numeric(final_df[col], errors='coerce').fillna(0.0).astype(float)
 
+        # Components are what aggregates: timeOnIce is seconds, and GAA / SV%
+        # are re-derived from them so rates and components always agree
+        if 'TOI_min' in final_df.columns:
+            final_df['TOI_min'] = (final_df['TOI_min'] / 60).round(2)
+        final_df = goalie_rates_from_components(final_df)
+
         # FIX 2: Only update Supabase if it's a true full season pull
         if not final_df.empty and is_full_season:
-            upload_df = final_df.rename(columns={
-                'playerId': 'player_id', 'Player': 'player_name', 
-                'Team': 'team_abbrev', 'GP': 'gp', 'W': 'w', 
-                'GAA': 'gaa', 'SV%': 'sv_pct', 'SHO': 'sho'
-            }).drop_duplicates(subset=['player_id'])
-            
-            upload_data = upload_df.to_dict(orient='records')
-            supabase.table("goalie_stats").upsert(upload_data).execute()
-            print("💾 Supabase Goalie Cache Updated.")
+            try:
+                upload_df = final_df.rename(columns=GOALIE_DB_COLUMNS).drop_duplicates(subset=['player_id'])
+                upload_df = upload_df[[c for c in GOALIE_DB_COLUMNS.values() if c in upload_df.columns]]
+                try:
+                    supabase.table("goalie_stats").upsert(upload_df.to_dict(orient='records')).execute()
+                except Exception as e:
+                    # Unmigrated table: keep W / SHO fresh without the component columns
+                    print(f"⚠️ Goalie cache upsert failed ({e}) — retrying without component stats; "
+                          f"run GOALIE_CACHE_MIGRATION:{GOALIE_CACHE_MIGRATION}")
+                    legacy = upload_df.drop(columns=GOALIE_COMPONENT_DB_COLUMNS, errors='ignore')
+                    supabase.table("goalie_stats").upsert(legacy.to_dict(orient='records')).execute()
+                print("💾 Supabase Goalie Cache Updated.")
+            except Exception as e:
+                print(f"⚠️ Supabase goalie cache update failed: {e}")
 
         return final_df
 
@@ -284,7 +341,7 @@ def get_fantasy_weeks(season_start=date(2025, 10, 6), num_weeks=26):
 def get_nhl_schedule(start_date=None):
     url = f"https://api-web.nhle.com/v1/schedule/{start_date}" if start_date else "https://api-web.nhle.com/v1/schedule/now"
     try:
-        data = requests.get(url).json()
+        data = requests.get(url, timeout=15).json()
         schedule = {}
         for day in data.get('gameWeek', []):
             date_str = day['date']
@@ -296,6 +353,31 @@ def get_nhl_schedule(start_date=None):
         return schedule
     except: return {}
 
+def get_schedule_range(start_str, end_str):
+    """Day-by-day NHL schedule {date: {team: 'vs OPP'}} between two dates, one pull per week."""
+    schedule = {}
+    try:
+        # get_nhl_schedule only returns one week — fetch week by week
+        check_date = date.fromisoformat(start_str)
+        while str(check_date) <= end_str:
+            for d, games in get_nhl_schedule(str(check_date)).items():
+                if start_str <= d <= end_str:
+                    schedule[d] = games
+            # Advance by 7 days (schedule endpoint returns ~1 week)
+            check_date = check_date + timedelta(days=7)
+    except Exception as e:
+        print(f"⚠️ Schedule fetch error: {e}")
+    return schedule
+
+
+def get_remaining_games_by_team(start_str, end_str):
+    """NHL games per team between two dates (inclusive)."""
+    rem_games_by_team = {}
+    for games in get_schedule_range(start_str, end_str).values():
+        for team in games:
+            rem_games_by_team[team] = rem_games_by_team.get(team, 0) + 1
+    return rem_games_by_team
+
 def get_blended_projections(season="20252026", recent_days=21, recent_weight=0.65, season_end_date=None):
     """
     Projects remaining stats for all skaters AND goalies for the rest of the fantasy season.
@@ -324,7 +406,7 @@ def get_blended_projections(season="20252026", recent_days=21, recent_weight=0.6
 
     # Default end date: NHL regular season end
     if season_end_date is None:
-        season_end_date = date_type(2026, 4, 17)
+        season_end_date = NHL_SEASON_END
     elif isinstance(season_end_date, str):
         season_end_date = date_type.fromisoformat(season_end_date)
 
@@ -333,23 +415,7 @@ def get_blended_projections(season="20252026", recent_days=21, recent_weight=0.6
     print(f"🔀 Blended ROS projections to {end_str} ({int(recent_weight*100)}% last {recent_days}d / {int(season_weight*100)}% season)...")
 
     # ── 1. Build remaining schedule game count per team ───────────────────────
-    rem_games_by_team = {}
-    try:
-        sched = get_nhl_schedule(today_str)
-        # get_nhl_schedule only returns one week — fetch week by week
-        check_date = date.today()
-        while str(check_date) <= end_str:
-            day_sched = get_nhl_schedule(str(check_date))
-            for d, games in day_sched.items():
-                if today_str <= d <= end_str:
-                    for team in games:
-                        rem_games_by_team[team] = rem_games_by_team.get(team, 0) + 1
-            # Advance by 7 days (schedule endpoint returns ~1 week)
-            check_date = check_date + timedelta(days=7)
-            if check_date > season_end_date + timedelta(days=7):
-                break
-    except Exception as e:
-        print(f"⚠️ Schedule fetch error: {e}")
+    rem_games_by_team = get_remaining_games_by_team(today_str, end_str)
 
     # ── 2. Skater projections ─────────────────────────────────────────────────
     df_season = get_nhl_skater_stats(season)
@@ -395,8 +461,8 @@ def get_blended_projections(season="20252026", recent_days=21, recent_weight=0.6
     # Recent 21-day windows are too small (6-10 starts) and create absurd projections.
     # Season-long sample is more reliable for goalie roles and true rates.
     g_season = get_nhl_goalie_stats(season)
-    goalie_stat_cols = [c for c in ['W', 'GAA', 'SV%', 'SHO'] if c in g_season.columns]
-    goalie_rate_cols = ['GAA', 'SV%']  # already rates — do not scale by GP
+    goalie_stat_cols = [c for c in ['W', 'GAA', 'SV%', 'SHO', 'GA', 'SA', 'SV', 'TOI_min'] if c in g_season.columns]
+    goalie_rate_cols = ['GAA', 'SV%']  # rates — re-derived from the projected components below
     goalie_result    = pd.DataFrame()
 
     if not g_season.empty:
@@ -407,7 +473,10 @@ def get_blended_projections(season="20252026", recent_days=21, recent_weight=0.6
         dg['Rem_GP'] = dg['Team'].map(rem_games_by_team).fillna(0).astype(int)
 
         for c in goalie_stat_cols:
-            dg[c] = pd.to_numeric(dg[c], errors='coerce').fillna(0)
+            # Missing components / rates stay NaN so the rate below isn't derived from zeros
+            dg[c] = pd.to_numeric(dg[c], errors='coerce')
+            if c not in goalie_rate_cols + ['GA', 'SA', 'SV', 'TOI_min']:
+                dg[c] = dg[c].fillna(0)
             if c in goalie_rate_cols:
                 # Rates project forward as-is
                 pass
@@ -415,6 +484,8 @@ def get_blended_projections(season="20252026", recent_days=21, recent_weight=0.6
                 # Count stats: season per-game rate × remaining games
                 dg[c] = (dg[c] / dg['GP'] * dg['Rem_GP']).round(1)
 
+        dg = goalie_rates_from_components(dg)
+
         gkeep = ['Player', 'Team', 'Rem_GP'] + goalie_stat_cols
         gkeep = [c for c in gkeep if c in dg.columns]
         goalie_result = dg[gkeep].rename(columns={'Rem_GP': 'GP'})
@@ -1,18 +1,65 @@
 import pandas as pd
 
 
-def fetch_espn_data(league_id, year, espn_s2, swid, my_team_name=None):
+# ESPN stat ID → PuckNexus internal column name
+ESPN_STAT_MAP = {
+    1:   'G',
+    2:   'A',
+    3:   'PTS',
+    4:   'PIM',
+    5:   'PPG',
+    6:   'PPA',
+    7:   'PPP',
+    8:   'SHG',
+    9:   'SHA',
+    10:  'SHP',
+    11:  'GWG',
+    12:  'SOG',
+    13:  'SH%',
+    14:  'HIT',
+    15:  'BLK',
+    16:  '+/-',
+    17:  'FOW',
+    19:  'W',
+    20:  'L',
+    21:  'SHO',
+    22:  'SV',
+    23:  'GA',
+    24:  'GAA',
+    25:  'SV%',
+    26:  'GS',
+}
+
+ESPN_SUPPORTED_CATS = {'G', 'A', '+/-', 'PIM', 'PPP', 'SOG', 'HIT', 'BLK',
+                       'W', 'GAA', 'SV%', 'SHO', 'GWG', 'SHP', 'TOI',
+                       'SV', 'GA', 'SA', 'L'}
+
+def _normalize_swid(swid):
+    """Adds curly braces if the user omitted them and upper-cases for comparison."""
+    swid_clean = (swid or '').strip()
+    if not swid_clean.startswith('{'): swid_clean = '{' + swid_clean
+    if not swid_clean.endswith('}'): swid_clean = swid_clean + '}'
+    return swid_clean.upper()
+
+
+def _eligible(player):
+    """ESPN eligible lineup slots as a Yahoo-style 'C,LW,Util' string (bench / IR / group slots dropped)."""
+    slots = {'C': 'C', 'LW': 'LW', 'RW': 'RW', 'D': 'D', 'G': 'G', 'UTIL': 'Util'}
+    return ",".join(slots[s] for s in getattr(player, 'eligibleSlots', []) or [] if s in slots)
+
+
+def fetch_espn_league(league_id, year, espn_s2, swid):
     """
-    Connects to an ESPN fantasy hockey league using browser cookies.
-    Returns a DataFrame with the same schema as yahoo_bridge output:
-      name, Status, Fantasy_Team, Manager, Is_Mine, match_key
-
-    Args:
-        league_id:    ESPN league ID (integer or string)
-        year:         Season year (e.g. 2026)
-        espn_s2:      espn_s2 browser cookie (from Chrome DevTools)
-        swid:         SWID browser cookie (from Chrome DevTools)
-        my_team_name: Exact team name string to flag Is_Mine=True
+    Pulls the league-wide roster and free agent data for an ESPN league.
+    Carries no per-user Is_Mine flag, so one pull can be shared by every manager.
+    The League is constructed once; rosters, owners, free agents and scoring
+    categories are all read from it.
+
+    Returns:
+        Dict with keys:
+          players: DataFrame (name, Status, Fantasy_Team, Manager, match_key, Eligible)
+          teams:   { team_name: {'key': team_id, 'owners': [SWIDs], 'manager': name} }
+          cats:    active scoring categories as PuckNexus names, or None
     """
     try:
         from espn_api.hockey import League
@@ -27,27 +74,17 @@ def fetch_espn_data(league_id, year, espn_s2, swid, my_team_name=None):
     )
 
     all_players = []
-
-    # Normalize SWID — add curly braces if user omitted them
-    swid_clean = swid.strip()
-    if not swid_clean.startswith('{'): swid_clean = '{' + swid_clean
-    if not swid_clean.endswith('}'): swid_clean = swid_clean + '}'
-    swid_normalized = swid_clean.upper()
+    team_info   = {}
 
     # Rostered players
     for team in league.teams:
-        # Match by SWID — works regardless of whether user entered braces or not
-        is_mine = any(
-            owner.get('id', '').strip().upper() == swid_normalized
-            for owner in team.owners
-        ) if team.owners else False
-
-        # Fallback: team name match if SWID didn't work
-        if not is_mine and my_team_name:
-            is_mine = team.team_name.strip().lower() == my_team_name.strip().lower()
-
         manager = (team.owners[0].get('firstName', '') + ' ' + team.owners[0].get('lastName', '')).strip() \
             if team.owners else 'Unknown'
+        team_info[team.team_name] = {
+            'key':     getattr(team, 'team_id', None),
+            'owners':  [owner.get('id', '').strip().upper() for owner in (team.owners or [])],
+            'manager': manager.strip(),
+        }
 
         for player in team.roster:
             all_players.append({
@@ -55,8 +92,8 @@ def fetch_espn_data(league_id, year, espn_s2, swid, my_team_name=None):
                 'Status':       'Rostered',
                 'Fantasy_Team': team.team_name,
                 'Manager':      manager.strip(),
-                'Is_Mine':      is_mine,
-                'match_key':    player.name.lower().strip()
+                'match_key':    player.name.lower().strip(),
+                'Eligible':     _eligible(player)
             })
 
     # Free agents
@@ -67,75 +104,44 @@ def fetch_espn_data(league_id, year, espn_s2, swid, my_team_name=None):
                 'Status':       'Free Agent',
                 'Fantasy_Team': 'Available',
                 'Manager':      'None',
-                'Is_Mine':      False,
-                'match_key':    player.name.lower().strip()
+                'match_key':    player.name.lower().strip(),
+                'Eligible':     _eligible(player)
             })
     except Exception as e:
         print(f"⚠️ Could not fetch ESPN free agents: {e}")
 
     df = pd.DataFrame(all_players)
     df = df.drop_duplicates(subset=['match_key'])
-    return df
+    return {'players': df, 'teams': team_info, 'cats': _scoring_cats(league)}
 
 
-def get_espn_league_cats(league_id, year, espn_s2, swid):
-    """
-    Fetches the scoring categories active in the ESPN league.
-    Returns a list of PuckNexus category names, or None if undetectable.
-    """
-    # ESPN stat ID → PuckNexus internal column name
-    ESPN_STAT_MAP = {
-        1:   'G',
-        2:   'A',
-        3:   'PTS',
-        4:   'PIM',
-        5:   'PPG',
-        6:   'PPA',
-        7:   'PPP',
-        8:   'SHG',
-        9:   'SHA',
-        10:  'SHP',
-        11:  'GWG',
-        12:  'SOG',
-        13:  'SH%',
-        14:  'HIT',
-        15:  'BLK',
-        16:  '+/-',
-        17:  'FOW',
-        19:  'W',
-        20:  'L',
-        21:  'SHO',
-        22:  'SV',
-        23:  'GA',
-        24:  'GAA',
-        25:  'SV%',
-        26:  'GS',
-    }
-
-    SUPPORTED = {'G', 'A', '+/-', 'PIM', 'PPP', 'SOG', 'HIT', 'BLK',
-                 'W', 'GAA', 'SV%', 'SHO', 'GWG', 'SHP', 'TOI',
-                 'SV', 'GA', 'SA', 'L'}
+def find_my_espn_team(league, swid, my_team_name=None):
+    """Resolves the user's team name in a shared league snapshot by SWID, then by team name."""
+    swid_normalized = _normalize_swid(swid)
+    for team_name, info in league.get('teams', {}).items():
+        # Match by SWID — works regardless of whether user entered braces or not
+        if swid_normalized in info.get('owners', []):
+            return team_name
 
+    # Fallback: team name match if SWID didn't work
+    if my_team_name:
+        for team_name in league.get('teams', {}):
+            if team_name.strip().lower() == my_team_name.strip().lower():
+                return team_name
+    return None
+
+
+def _scoring_cats(league):
+    """Active scoring categories of a built League as PuckNexus names, or None if undetectable."""
     try:
-        from espn_api.hockey import League
-        league = League(
-            league_id=int(league_id),
-            year=int(year),
-            espn_s2=espn_s2,
-            swid=swid
-        )
-
-        scoring_settings = league.settings.scoring_format
         cats = []
-        for stat in scoring_settings:
+        for stat in league.settings.scoring_format:
             stat_id = getattr(stat, 'statId', None) or getattr(stat, 'id', None)
             if stat_id and stat_id in ESPN_STAT_MAP:
                 cat = ESPN_STAT_MAP[stat_id]
-                if cat in SUPPORTED:
+                if cat in ESPN_SUPPORTED_CATS:
                     cats.append(cat)
-
         return cats if cats else None
-
     except Exception as e:
         print(f"⚠️ Could not fetch ESPN league cats: {e}")
-        return None
\ No newline at end of file
+        return None
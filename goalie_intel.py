@@ -1,8 +1,12 @@
 import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 
 
+BOXSCORE_WORKERS = 8   # boxscores requested at once on a busy night
+
+
 # External resources to link to in the UI
 GOALIE_RESOURCES = [
     {"name": "Daily Faceoff",  "url": "https://www.dailyfaceoff.com/starting-goalies/",  "desc": "Human-confirmed starting goalies"},
@@ -11,29 +15,63 @@ GOALIE_RESOURCES = [
 ]
 
 
-def get_todays_game_ids():
+def _goalie_name(goalie):
+    name = (goalie or {}).get('name', {})
+    return (name.get('default', '') if isinstance(name, dict) else name) or None
+
+
+def get_schedule_days():
+    """
+    Yesterday's and today's NHL games from one schedule request.
+    schedule/{date} returns the week starting at that date, so asking from
+    yesterday covers back-to-back detection and tonight's slate together.
+
+    Returns:
+        {date_str: [raw game dicts]} (empty on failure)
+    """
+    yesterday = str(date.today() - timedelta(days=1))
     try:
-        data = requests.get("https://api-web.nhle.com/v1/schedule/now", timeout=10).json()
-        today_str = str(date.today())
-        games = []
-        for day in data.get('gameWeek', []):
-            if day['date'] != today_str:
-                continue
-            for g in day['games']:
-                games.append({
-                    'game_id':    g['id'],
-                    'home':       g['homeTeam']['abbrev'],
-                    'away':       g['awayTeam']['abbrev'],
-                    'game_time':  g.get('startTimeUTC', ''),
-                    'game_state': g.get('gameState', 'FUT'),
-                })
-        return games
+        data = requests.get(f"https://api-web.nhle.com/v1/schedule/{yesterday}", timeout=10).json()
+        return {day['date']: day.get('games', []) for day in data.get('gameWeek', [])}
     except Exception as e:
-        print(f"Game ID fetch error: {e}")
-        return []
+        print(f"Schedule fetch error: {e}")
+        return {}
+
+
+def get_todays_game_ids(schedule_days=None):
+    """Tonight's games (id, teams, start time, state, probable goalies); reuses `schedule_days` if given."""
+    if schedule_days is None:
+        schedule_days = get_schedule_days()
+    games = []
+    for g in schedule_days.get(str(date.today()), []):
+        games.append({
+            'game_id':       g['id'],
+            'home':          g['homeTeam']['abbrev'],
+            'away':          g['awayTeam']['abbrev'],
+            'game_time':     g.get('startTimeUTC', ''),
+            'game_state':    g.get('gameState', 'FUT'),
+            'home_probable': _goalie_name(g['homeTeam'].get('probableGoalie')),
+            'away_probable': _goalie_name(g['awayTeam'].get('probableGoalie')),
+        })
+    return games
+
+
+def get_teams_played_yesterday(schedule_days=None):
+    """Team abbrevs that played yesterday (back-to-back tonight); reuses `schedule_days` if given."""
+    if schedule_days is None:
+        schedule_days = get_schedule_days()
+    played = set()
+    for g in schedule_days.get(str(date.today() - timedelta(days=1)), []):
+        played.add(g['homeTeam']['abbrev'])
+        played.add(g['awayTeam']['abbrev'])
+    return played
 
 
 def get_confirmed_from_boxscore(game_id):
+    """
+    Starters listed in a game's boxscore. A side with no goalie listed yet is
+    None — its probable (schedule) goalie is not a confirmation.
+    """
     try:
         bs = requests.get(
             f"https://api-web.nhle.com/v1/gamecenter/{game_id}/boxscore",
@@ -44,12 +82,7 @@ def get_confirmed_from_boxscore(game_id):
             team_data = bs.get(side, {})
             goalies = team_data.get('goalies', [])
             if goalies:
-                name = goalies[0].get('name', {})
-                result[key] = name.get('default', '') if isinstance(name, dict) else name
-            if not result[key]:
-                pg = team_data.get('probableGoalie', {})
-                name = pg.get('name', {})
-                result[key] = name.get('default', '') if isinstance(name, dict) else name or None
+                result[key] = _goalie_name(goalies[0])
         return result
     except Exception as e:
         print(f"Boxscore error for {game_id}: {e}")
@@ -77,7 +110,26 @@ def get_recent_goalie_starts(season="20252026", days_back=14):
         return pd.DataFrame()
 
 
-def project_starters_from_rotation(todays_games, season_goalie_df):
+def get_confirmed_goalies(todays_games):
+    """
+    Confirmed starters for every game that has started, boxscores fetched concurrently.
+
+    Returns:
+        {team_abbrev: goalie name}
+    """
+    started = [g for g in todays_games if g.get('game_state') not in ['FUT', 'PRE']]
+    if not started:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(BOXSCORE_WORKERS, len(started))) as pool:
+        boxscores = pool.map(get_confirmed_from_boxscore, [g['game_id'] for g in started])
+    confirmed = {}
+    for game, bs in zip(started, boxscores):
+        if bs['home']: confirmed[game['home']] = bs['home']
+        if bs['away']: confirmed[game['away']] = bs['away']
+    return confirmed
+
+
+def project_starters_from_rotation(todays_games, season_goalie_df, played_yesterday=None):
     if season_goalie_df.empty or not todays_games:
         return pd.DataFrame()
 
@@ -93,17 +145,8 @@ def project_starters_from_rotation(todays_games, season_goalie_df):
         }
 
     # Check B2B
-    yesterday = str(date.today() - timedelta(days=1))
-    played_yesterday = set()
-    try:
-        ys = requests.get(f"https://api-web.nhle.com/v1/schedule/{yesterday}", timeout=10).json()
-        for day in ys.get('gameWeek', []):
-            if day['date'] == yesterday:
-                for g in day['games']:
-                    played_yesterday.add(g['homeTeam']['abbrev'])
-                    played_yesterday.add(g['awayTeam']['abbrev'])
-    except Exception:
-        pass
+    if played_yesterday is None:
+        played_yesterday = get_teams_played_yesterday()
 
     rows = []
     for game in todays_games:
@@ -126,6 +169,62 @@ def project_starters_from_rotation(todays_games, season_goalie_df):
     return pd.DataFrame(rows)
 
 
+def build_goalie_rows(todays_games, confirmed):
+    """
+    One row per team playing tonight: confirmed starter if its game has begun,
+    else the schedule's probable goalie, else TBD.
+
+    Args:
+        todays_games: get_todays_game_ids() output
+        confirmed:    {team_abbrev: goalie name} from get_confirmed_goalies()
+    """
+    rows = []
+    for game in todays_games:
+        for side, team, opp, is_home in [
+            ('home', game['home'], game['away'], True),
+            ('away', game['away'], game['home'], False)
+        ]:
+            if team in confirmed:
+                goalie_name, status = confirmed[team], 'Confirmed'
+            elif game.get(f'{side}_probable'):
+                goalie_name, status = game[f'{side}_probable'], 'Probable'
+            else:
+                goalie_name, status = 'TBD', 'TBD'
+
+            rows.append({
+                'Team':       team,
+                'Opponent':   opp,
+                'Home':       is_home,
+                'GameTime':   game.get('game_time', ''),
+                'GoalieName': goalie_name,
+                'Status':     status,
+                'Confirmed':  status == 'Confirmed',
+                'Note':       '',
+            })
+    return pd.DataFrame(rows)
+
+
+def fill_rotation_projections(df, todays_games, season_goalie_df, played_yesterday=None):
+    """Returns a copy of `df` with TBD rows filled from the rotation model."""
+    df = df.copy()
+    if df.empty or season_goalie_df is None or season_goalie_df.empty:
+        return df
+    tbd_teams = set(df[df['Status'] == 'TBD']['Team'].tolist())
+    tbd_games = [g for g in todays_games
+                 if g['home'] in tbd_teams or g['away'] in tbd_teams]
+    if not tbd_games:
+        return df
+    proj_df = project_starters_from_rotation(tbd_games, season_goalie_df, played_yesterday)
+    if not proj_df.empty:
+        for _, prow in proj_df.iterrows():
+            mask = (df['Team'] == prow['Team']) & (df['Status'] == 'TBD')
+            if mask.any():
+                df.loc[mask, 'GoalieName'] = prow['Projected']
+                df.loc[mask, 'Status']     = 'Projected'
+                df.loc[mask, 'Note']       = prow.get('Note', '📊 Rotation model')
+    return df
+
+
 def get_todays_goalies(season_goalie_df=None):
     """
     Master function combining:
@@ -134,77 +233,16 @@ def get_todays_goalies(season_goalie_df=None):
     3. Rotation model projection (TBD fallback)
     """
     try:
-        todays_games = get_todays_game_ids()
+        # One schedule pull serves game ids, probables and B2B detection
+        schedule_days = get_schedule_days()
+        todays_games  = get_todays_game_ids(schedule_days)
         if not todays_games:
             return pd.DataFrame()
 
-        today_str = str(date.today())
-
-        # Probable goalies from schedule
-        schedule_data = requests.get("https://api-web.nhle.com/v1/schedule/now", timeout=10).json()
-        probable = {}
-        for day in schedule_data.get('gameWeek', []):
-            if day['date'] != today_str:
-                continue
-            for g in day['games']:
-                for side in [g['homeTeam'], g['awayTeam']]:
-                    pg = side.get('probableGoalie', {})
-                    name = pg.get('name', {})
-                    name = name.get('default', '') if isinstance(name, dict) else name
-                    if name:
-                        probable[side['abbrev']] = {'name': name, 'id': pg.get('id')}
-
         # Confirmed from boxscore (in-progress/finished games)
-        confirmed = {}
-        for game in todays_games:
-            if game.get('game_state') not in ['FUT', 'PRE']:
-                bs = get_confirmed_from_boxscore(game['game_id'])
-                if bs['home']: confirmed[game['home']] = bs['home']
-                if bs['away']: confirmed[game['away']] = bs['away']
-
-        # Build rows
-        rows = []
-        for game in todays_games:
-            for team, opp, is_home in [
-                (game['home'], game['away'], True),
-                (game['away'], game['home'], False)
-            ]:
-                if team in confirmed:
-                    goalie_name, status = confirmed[team], 'Confirmed'
-                elif team in probable:
-                    goalie_name, status = probable[team]['name'], 'Probable'
-                else:
-                    goalie_name, status = 'TBD', 'TBD'
-
-                rows.append({
-                    'Team':       team,
-                    'Opponent':   opp,
-                    'Home':       is_home,
-                    'GameTime':   game.get('game_time', ''),
-                    'GoalieName': goalie_name,
-                    'Status':     status,
-                    'Confirmed':  status == 'Confirmed',
-                    'Note':       '',
-                })
-
-        df = pd.DataFrame(rows)
-
-        # Fill TBD with rotation model
-        if season_goalie_df is not None and not season_goalie_df.empty:
-            tbd_teams = set(df[df['Status'] == 'TBD']['Team'].tolist())
-            tbd_games = [g for g in todays_games
-                         if g['home'] in tbd_teams or g['away'] in tbd_teams]
-            if tbd_games:
-                proj_df = project_starters_from_rotation(tbd_games, season_goalie_df)
-                if not proj_df.empty:
-                    for _, prow in proj_df.iterrows():
-                        mask = (df['Team'] == prow['Team']) & (df['Status'] == 'TBD')
-                        if mask.any():
-                            df.loc[mask, 'GoalieName'] = prow['Projected']
-                            df.loc[mask, 'Status']     = 'Projected'
-                            df.loc[mask, 'Note']       = prow.get('Note', '📊 Rotation model')
-
-        return df
+        df = build_goalie_rows(todays_games, get_confirmed_goalies(todays_games))
+        return fill_rotation_projections(df, todays_games, season_goalie_df,
+                                         get_teams_played_yesterday(schedule_days))
 
     except Exception as e:
         print(f"get_todays_goalies error: {e}")
@@ -0,0 +1,188 @@
+"""
+goalie_poller.py — Background Goalie Status Poller
+One daemon thread per process tracks tonight's probable and confirmed
+starters and publishes them to a shared store that every session reads.
+
+  - one schedule call per poll (probables + game states + yesterday's B2B teams)
+  - a boxscore is only fetched for a started game whose starter isn't listed in
+    it yet; once the boxscore lists a starter, it is kept for the rest of the night
+  - the poll interval tightens as the next puck drop approaches
+  - a new version is published only when some team's goalie or status changed,
+    and each change is logged so the tab can show what moved since last look
+
+The rotation-model fill for TBD teams depends on each session's season
+goalie frame, so it stays in the tab (goalie_intel.fill_rotation_projections).
+"""
+
+import threading
+import time
+from datetime import date, datetime, timezone
+import pandas as pd
+from goalie_intel import (
+    get_schedule_days, get_todays_game_ids, get_teams_played_yesterday,
+    get_confirmed_goalies, build_goalie_rows
+)
+from shared_frames import freeze_frame
+
+
+GOALIE_POLL_IDLE    = 30 * 60   # seconds between polls once every game tonight has started (or none scheduled)
+GOALIE_POLL_FAR     = 15 * 60   # next puck drop more than 3 h away
+GOALIE_POLL_NEAR    = 5 * 60    # within 3 h — when teams announce starters
+GOALIE_POLL_CLOSE   = 60        # within 45 min, or past start time and not yet live
+GOALIE_POLL_RETRY   = 2 * 60    # after a failed schedule pull
+GOALIE_POLL_MIN_GAP = 30        # a manual poll request never polls faster than this
+GOALIE_CHANGE_LOG   = 50        # changes kept for the tab
+
+_lock       = threading.Lock()
+_wake       = threading.Event()
+_first_poll = threading.Event()
+_thread     = None
+_state      = {
+    'date':             None,
+    'games':            [],
+    'played_yesterday': set(),
+    'confirmed':        {},      # team -> starter, kept once known
+    'goalies':          freeze_frame(pd.DataFrame()),
+    'version':          0,
+    'polled_at':        0.0,
+    'next_poll_at':     0.0,
+    'changes':          [],      # newest first: at, Team, Opponent, From, To, Status
+}
+
+
+# ── Polling ──────────────────────────────────────────────────────────────────
+
+def next_poll_delay(games, now=None):
+    """Seconds until the next poll, from how close tonight's next unstarted game is."""
+    now = now or datetime.now(timezone.utc)
+    upcoming = []
+    for g in games:
+        if g.get('game_state') not in ('FUT', 'PRE'):
+            continue
+        try:
+            start = datetime.fromisoformat(g['game_time'].replace('Z', '+00:00'))
+        except (KeyError, AttributeError, ValueError):
+            continue
+        upcoming.append((start - now).total_seconds())
+    if not upcoming:
+        return GOALIE_POLL_IDLE
+    until = min(upcoming)
+    if until > 3 * 60 * 60:
+        return GOALIE_POLL_FAR
+    if until > 45 * 60:
+        return GOALIE_POLL_NEAR
+    return GOALIE_POLL_CLOSE
+
+
+def _goalie_map(df):
+    if df.empty:
+        return {}
+    return {r['Team']: (r['GoalieName'], r['Status']) for r in df.to_dict('records')}
+
+
+def poll_once():
+    """
+    One poll: re-reads the schedule, fetches boxscores for newly started
+    games, and publishes a new version if any goalie or status changed.
+
+    Returns:
+        Seconds until the next poll should run
+    """
+    today_str = str(date.today())
+    schedule_days = get_schedule_days()
+    if not schedule_days:
+        return GOALIE_POLL_RETRY
+    games = get_todays_game_ids(schedule_days)
+
+    with _lock:
+        new_day   = _state['date'] != today_str
+        confirmed = {} if new_day else dict(_state['confirmed'])
+        previous  = {} if new_day else _goalie_map(_state['goalies'])
+
+    # Boxscores only for started games whose boxscore hasn't listed a starter yet
+    pending = [g for g in games if g['home'] not in confirmed or g['away'] not in confirmed]
+    confirmed.update(get_confirmed_goalies(pending))
+
+    goalies = build_goalie_rows(games, confirmed)
+    current = _goalie_map(goalies)
+    changed = [t for t in current if previous.get(t) != current[t]]
+    delay   = next_poll_delay(games)
+
+    now = time.time()
+    with _lock:
+        _state.update(games=games, confirmed=confirmed, polled_at=now, next_poll_at=now + delay,
+                      played_yesterday=get_teams_played_yesterday(schedule_days))
+        if new_day or changed or set(previous) != set(current):
+            if not new_day:
+                opp = dict(zip(goalies['Team'], goalies['Opponent']))
+                log = [{
+                    'at':       now,
+                    'Team':     t,
+                    'Opponent': opp.get(t, ''),
+                    'From':     previous[t][0] if t in previous else None,
+                    'To':       current[t][0],
+                    'Status':   current[t][1],
+                } for t in changed]
+                _state['changes'] = (log + _state['changes'])[:GOALIE_CHANGE_LOG]
+            else:
+                _state['changes'] = []
+            _state.update(date=today_str, goalies=freeze_frame(goalies), version=_state['version'] + 1)
+            print(f"🥅 Goalie status v{_state['version']}: "
+                  + (f"{len(current)} teams tonight" if new_day else f"{len(changed)} change(s)"))
+    return delay
+
+
+def _run():
+    while True:
+        try:
+            delay = poll_once()
+        except Exception as e:
+            print(f"⚠️ Goalie poll failed: {e}")
+            delay = GOALIE_POLL_RETRY
+        _first_poll.set()
+        _wake.wait(delay)
+        _wake.clear()
+        # A manual request right after a poll waits out the minimum gap
+        since = time.time() - _state['polled_at']
+        if since < GOALIE_POLL_MIN_GAP:
+            time.sleep(GOALIE_POLL_MIN_GAP - since)
+
+
+def start_goalie_poller():
+    """Starts the process-wide poller thread (no-op if it is already running)."""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_run, name='goalie-poller', daemon=True)
+        _thread.start()
+
+
+def request_goalie_poll():
+    """Asks the poller to poll now (at most once per GOALIE_POLL_MIN_GAP)."""
+    start_goalie_poller()
+    _wake.set()
+
+
+# ── Shared store ─────────────────────────────────────────────────────────────
+
+def get_goalie_status(wait=0):
+    """
+    The latest published goalie status, shared by every session. Starts the
+    poller if needed and waits up to `wait` seconds for its first poll
+    (version 0 = nothing published yet).
+
+    Returns:
+        Dict with goalies (read-only frame, one row per team tonight), games,
+        played_yesterday, version, polled_at, next_poll_at and changes
+    """
+    start_goalie_poller()
+    _first_poll.wait(wait)
+    with _lock:
+        return {k: (set(v) if isinstance(v, set) else list(v) if isinstance(v, list) else v)
+                for k, v in _state.items() if k != 'confirmed'}
+
+
+def goalie_status_version():
+    with _lock:
+        return _state['version']
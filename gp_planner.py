@@ -0,0 +1,161 @@
+"""
+gp_planner.py — Games-Played Limit Planner
+Projects how my season games-played budget gets spent when the league caps
+starts per lineup slot (e.g. 164 C games, 328 D games, a goalie-start maximum)
+and checks goalie-start minimums.
+
+Every remaining (player, date) NHL game is a candidate start worth the
+player's per-game value. Starts are taken best-first, each into the scarcest
+eligible slot that still has a spot open that day and GP left under its cap.
+For single-position players this is exact: each slot's constraints (spots per
+day, season cap) form a laminar matroid, on which best-first greedy is optimal.
+Ties go to the earlier date — a start used now is not at injury risk later.
+
+A goalie only starts part of his team's games, so each goalie game counts as
+his expected start share (goalie_start_shares) — of the G cap, of the day's G
+spots and of the value — instead of a full start; a tandem on one roster is
+about one start a night, not two.
+
+Only the games list is looped over (~1–2k for a full roster), so ~180 days
+re-plan in milliseconds after every roster move.
+"""
+
+import numpy as np
+import pandas as pd
+from config import DEFAULT_ROSTER_SLOTS, GP_CAP_PER_SLOT
+from lineup_optimizer import eligible_slots
+from matchup_engine import additive_columns, apply_rates
+
+
+def default_gp_limits(slots=None):
+    """{slot: season GP cap} at GP_CAP_PER_SLOT games per lineup spot."""
+    return {s: int(n) * GP_CAP_PER_SLOT for s, n in (slots or DEFAULT_ROSTER_SLOTS).items()}
+
+
+def goalie_start_shares(goalie_df):
+    """
+    {Player: expected share of his team's games started}: GS over the team's
+    GS when starts are known, otherwise GP over the team's goalie GP.
+    """
+    if goalie_df is None or goalie_df.empty or 'Team' not in goalie_df.columns:
+        return {}
+    col = 'GS' if 'GS' in goalie_df.columns else 'GP'
+    games = pd.to_numeric(goalie_df[col], errors='coerce').fillna(0)
+    team_games = games.groupby(goalie_df['Team']).transform('sum')
+    share = (games / team_games.where(team_games > 0)).fillna(0).clip(0, 1)
+    return dict(zip(goalie_df['Player'], share))
+
+
+def plan_season(roster, days, schedule, limits, used=None, slots=None, cats=None,
+                value_col='NexusScore', goalie_min=0, start_share=None):
+    """
+    Season-horizon allocation of capped slot games.
+
+    Args:
+        roster:     my players — Player, Team, Pos, optional Eligible, value_col, GP and raw stats
+        days:       remaining date strings (today → season end)
+        schedule:   day-by-day schedule {date: {team: 'vs OPP'}}
+        limits:     {slot: season GP cap}; a slot missing here is uncapped
+        used:       {slot: GP already used this season}
+        cats:       categories to project (rate cats are rebuilt from their components)
+        goalie_min: minimum goalie starts still required this season
+        start_share: {Player: expected share of team games started} for goalies
+                     (goalie_start_shares); a goalie missing here starts every game
+
+    Returns:
+        Dict with
+          'starts':  Day, Slot, Player, Team, Opp, Share — one row per planned start
+                     (Share < 1 for a goalie's expected start)
+          'slots':   Slot, Cap, Used, Starts, Left (after the plan), Unused_Games, Cap_Hit (date)
+          'players': Player, Games, Starts, Sat (games lost to the caps / full lineup)
+          Goalie counts are expected starts, so they can be fractional.
+          'totals':  Series of projected category totals from the planned starts
+          'goalie_short': goalie starts missing against goalie_min (0 if met)
+    """
+    slots  = dict(slots or DEFAULT_ROSTER_SLOTS)
+    used   = used or {}
+    cats   = list(cats or [])
+    empty  = {'starts': pd.DataFrame(), 'slots': pd.DataFrame(), 'players': pd.DataFrame(),
+              'totals': pd.Series(dtype=float), 'goalie_short': int(goalie_min)}
+    if roster.empty or not days:
+        return empty
+    roster = roster.reset_index(drop=True)
+    schedule = schedule or {}
+
+    left = {s: (max(int(limits[s]) - int(used.get(s, 0)), 0) if s in limits else np.inf) for s in slots}
+    open_ = np.array([[n] * len(days) for n in slots.values()], dtype=float)   # (slots, days) spots
+    s_idx = {s: i for i, s in enumerate(slots)}
+
+    raw   = pd.to_numeric(roster[value_col], errors='coerce').fillna(0).to_numpy(dtype=float)
+    plays = np.array([[team in schedule.get(d, {}) for d in days] for team in roster['Team']])
+    elig  = [[s for s in eligible_slots(r) if s in s_idx] for r in roster.to_dict('records')]
+
+    # Expected starts per game: 1 for skaters, the start share for goalies
+    share = start_share or {}
+    weight = np.array([float(share.get(name, 1.0)) if e == ['G'] else 1.0
+                       for name, e in zip(roster['Player'], elig)])
+    eps = 1e-9
+
+    # Every game as (player, day), best value first, earlier day on ties
+    p_i, d_i = np.nonzero(plays)
+    order = np.lexsort((d_i, -raw[p_i]))
+
+    started = np.full(plays.shape, -1, dtype=int)   # slot index per (player, day), -1 = not started
+    taken   = np.zeros(plays.shape)                  # expected starts used per (player, day)
+    cap_hit = {}
+    for k in order:
+        p, d = p_i[k], d_i[k]
+        # Scarcest slot first: least GP left, then fewest daily spots (Util last)
+        options = sorted((s for s in elig[p] if left[s] > eps and open_[s_idx[s], d] > eps),
+                         key=lambda s: (left[s], slots[s], s == 'Util'))
+        if not options or weight[p] <= eps:
+            continue
+        s = options[0]
+        use = min(weight[p], left[s], open_[s_idx[s], d])
+        started[p, d] = s_idx[s]
+        taken[p, d] = use
+        open_[s_idx[s], d] -= use
+        left[s] -= use
+        if left[s] <= eps:
+            cap_hit[s] = days[d]
+
+    slot_names = list(slots)
+    rows = []
+    for p, d in zip(*np.nonzero(started >= 0)):
+        team = roster.at[p, 'Team']
+        rows.append({'Day': days[d], 'Slot': slot_names[started[p, d]], 'Player': roster.at[p, 'Player'],
+                     'Team': team, 'Opp': schedule[days[d]].get(team, ''), 'Share': round(taken[p, d], 2)})
+    starts = pd.DataFrame(rows, columns=['Day', 'Slot', 'Player', 'Team', 'Opp', 'Share']).sort_values(['Day', 'Slot'])
+
+    n_starts = taken.sum(axis=1)
+    sat      = plays.sum(axis=1) * weight - n_starts
+    players  = pd.DataFrame({'Player': roster['Player'], 'Games': plays.sum(axis=1),
+                             'Starts': n_starts.round(1), 'Sat': sat.round(1)})
+    players  = players.sort_values('Starts', ascending=False)
+
+    # Games an eligible player had but could not start — what the cap (or a full lineup) costs
+    unused = {s: round(float(sum(sat[p] for p in range(len(roster)) if s in elig[p])), 1) for s in slots}
+    by_slot = starts.groupby('Slot')['Share'].sum()
+    slot_table = pd.DataFrame([{
+        'Slot':         s,
+        'Cap':          limits.get(s),
+        'Used':         int(used.get(s, 0)),
+        'Starts':       round(float(by_slot.get(s, 0)), 1),
+        'Left':         None if left[s] == np.inf else round(max(left[s], 0), 1),
+        'Unused_Games': unused[s],
+        'Cap_Hit':      cap_hit.get(s),
+    } for s in slots])
+
+    # Projected totals: per-game rates × planned starts (components summed, rates derived after)
+    cols = [c for c in additive_columns(cats) if c in roster.columns]
+    gp = pd.to_numeric(roster['GP'], errors='coerce').clip(lower=1) if 'GP' in roster.columns else 1
+    per_game = roster[cols].apply(pd.to_numeric, errors='coerce').fillna(0).div(gp, axis=0)
+    totals = per_game.mul(n_starts, axis=0).sum()
+    known  = [c for c in cats if set(additive_columns([c])) <= set(totals.index)]
+    totals = apply_rates(totals.to_frame().T, known).iloc[0]
+
+    g_starts = float(by_slot.get('G', 0))
+    return {
+        'starts': starts.reset_index(drop=True), 'slots': slot_table, 'players': players.reset_index(drop=True),
+        'totals': totals, 'goalie_short': int(np.ceil(max(int(goalie_min) - g_starts - eps, 0))),
+    }
@@ -0,0 +1,95 @@
+"""
+import_budget.py — Cold-Start Import Budget
+Imports everything app.py loads on its first run in a fresh interpreter, times
+it, and fails if the total exceeds the budget or if a deferred dependency
+(Supabase, Yahoo, ESPN, plotly) was pulled in at startup.
+
+Usage:
+    python import_budget.py                 # default budget
+    python import_budget.py --budget 2.5    # seconds
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+IMPORT_BUDGET_SECONDS = 2.0
+
+# Modules app.py imports before the first page is rendered (incl. tab renderers)
+STARTUP_MODULES = [
+    'streamlit', 'pandas',
+    'shared_frames', 'supabase_config', 'data_fetcher', 'monster_math', 'config',
+    'league_overlay', 'league_cache', 'swr_cache',
+    'tabs.dashboard', 'tabs.schedule', 'tabs.war_room', 'tabs.trends', 'tabs.wire_hawk',
+    'tabs.power_rankings', 'tabs.matchup', 'tabs.goalie_intel_tab', 'tabs.playoff_primer',
+    'tabs.nexus_board_tab',
+]
+
+# Must only be imported when the subsystem is first used
+# (streamlit itself loads the plotly base package for its theme; plotly.express is ours to defer)
+DEFERRED_MODULES = ['supabase', 'yahoo_oauth', 'yahoo_fantasy_api', 'espn_api', 'plotly.express', 'matplotlib']
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - t0
+loaded = sorted(d for d in {deferred!r} if any(m == d or m.startswith(d + '.') for m in sys.modules))
+print(json.dumps({{'elapsed': elapsed, 'deferred_loaded': loaded}}))
+"""
+
+
+def measure():
+    """Runs the startup imports in a fresh interpreter with -X importtime."""
+    probe = _PROBE.format(modules=STARTUP_MODULES, deferred=DEFERRED_MODULES)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', probe],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import probe failed")
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    top_level = []
+    for line in proc.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        if not name.startswith(' ') or name.startswith('  '):
+            continue  # nested import — already counted in its parent's cumulative time
+        top_level.append((int(parts[1]) / 1e6, name.strip()))
+    result['slowest'] = sorted(top_level, reverse=True)[:10]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PuckNexus cold-start import budget")
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_SECONDS, help="seconds")
+    args = parser.parse_args()
+
+    result = measure()
+    print(f"⏱️ Startup imports: {result['elapsed']:.2f}s (budget {args.budget:.2f}s)")
+    for seconds, name in result['slowest']:
+        print(f"   {seconds:6.3f}s  {name}")
+
+    failed = False
+    if result['elapsed'] > args.budget:
+        print("❌ Over the import-time budget.")
+        failed = True
+    if result['deferred_loaded']:
+        print(f"❌ Deferred dependencies imported at startup: {', '.join(result['deferred_loaded'])}")
+        failed = True
+    if not failed:
+        print("✅ Within budget.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
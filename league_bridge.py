@@ -0,0 +1,249 @@
+"""
+league_bridge.py — League Bridge Interface
+One interface over paginated fantasy platforms. A bridge exposes three
+primitives — all rosters in one batched call, one page of available players,
+league settings — and LeagueBridge composes them into the concurrent league
+pull (rosters alongside every FA page) and the multi-league fan-out.
+
+yahoo_bridge.YahooBridge is the production implementation: Yahoo's full pull
+and Sync All run through this code. FakeLeagueBridge is a deterministic local
+provider (20-team leagues, full FA pools, configurable latency) running the
+same code, so max_workers / fa_page_wave / league_workers can be measured and
+tuned offline — see sync_bench.py.
+"""
+
+import random
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+import pandas as pd
+
+
+SNAPSHOT_COLS = ['name', 'Status', 'Fantasy_Team', 'Manager', 'match_key', 'Eligible', 'player_key']
+
+
+class LeagueSnapshot(TypedDict):
+    """What every bridge's sync returns (a plain dict, so league_cache and the tabs take it as-is)."""
+    platform:  str
+    league_id: str
+    players:   pd.DataFrame   # SNAPSHOT_COLS, one row per player, str dtypes
+    teams:     dict           # team_name -> {'key', 'owners', 'manager'}
+    settings:  dict           # cats, roster_slots, end_date ... (whatever the platform exposes)
+    synced_at: float
+
+
+def typed_players(rows):
+    """
+    League rows as a frame with SNAPSHOT_COLS in order, string-typed, one row per
+    player (first row wins). Players are told apart by the platform's player_key,
+    or by match_key where the platform doesn't give one.
+    """
+    df = pd.DataFrame(rows, columns=SNAPSHOT_COLS).fillna('').astype({c: str for c in SNAPSHOT_COLS})
+    ident = df['player_key'].where(df['player_key'] != '', df['match_key'])
+    return df[~ident.duplicated()].reset_index(drop=True)
+
+
+def page_concurrently(fetch_page, groups, page_size, pool, wave=4, max_pages=40):
+    """
+    Reads every page of several paginated listings (e.g. FAs per position).
+    Each group's pages are requested `wave` at a time on `pool` until a short
+    page comes back or `max_pages` is reached.
+
+    A page that fails must raise: the exception propagates so the caller keeps
+    its previous listing, instead of a short page ending the group early.
+
+    Args:
+        fetch_page: callable(group, start) -> [(item_id, row)]
+        groups:     listing keys, e.g. ['C', 'LW', 'RW', 'D', 'G']
+
+    Returns:
+        {item_id: row}, first occurrence kept
+    """
+    rows = {}
+    next_start = {g: 0 for g in groups}
+    active = list(groups)
+    while active:
+        batch = {(g, start): pool.submit(fetch_page, g, start)
+                 for g in active
+                 for start in range(next_start[g], next_start[g] + page_size * wave, page_size)}
+        finished = set()
+        for (g, _), fut in batch.items():
+            page = fut.result()
+            for item_id, row in page:
+                rows.setdefault(item_id, row)
+            if len(page) < page_size:
+                finished.add(g)
+        for g in active:
+            next_start[g] += page_size * wave
+        active = [g for g in active if g not in finished and next_start[g] < page_size * max_pages]
+    return rows
+
+
+class LeagueBridge(ABC):
+    """
+    Base class for a platform. Subclasses implement the fetch primitives;
+    fetch_league / sync_league / sync_leagues are shared.
+    """
+
+    platform       = None
+    fa_positions   = ['C', 'LW', 'RW', 'D', 'G']
+    fa_page_size   = 25
+    fa_page_wave   = 4
+    fa_max_pages   = 40
+    max_workers    = 10   # requests in flight per league pull
+    league_workers = 4    # leagues synced at once by sync_leagues
+
+    @abstractmethod
+    def fetch_rosters(self, league_id):
+        """Every team's roster in one batched call: (rows, teams)."""
+
+    @abstractmethod
+    def fetch_fa_page(self, league_id, position, start):
+        """One page of available players at `position`: [(player_id, row)]; raises on failure."""
+
+    @abstractmethod
+    def fetch_settings(self, league_id):
+        """League settings dict (cats, roster_slots, end_date ...)."""
+
+    def fetch_fa_pool(self, league_id, pool):
+        """Every available player, all positions paged concurrently on `pool`: [row]."""
+        rows = page_concurrently(lambda pos, start: self.fetch_fa_page(league_id, pos, start),
+                                 self.fa_positions, self.fa_page_size, pool,
+                                 self.fa_page_wave, self.fa_max_pages)
+        return list(rows.values())
+
+    def _fetch_league(self, league_id, pool):
+        rosters = pool.submit(self.fetch_rosters, league_id)
+        fa_rows = self.fetch_fa_pool(league_id, pool)
+        rows, teams = rosters.result()
+        # Rostered rows first, so a player both rostered and listed as available stays rostered
+        return {'players': typed_players(rows + fa_rows), 'teams': teams}
+
+    def fetch_league(self, league_id):
+        """Every roster and the full FA pool, fetched concurrently: {'players', 'teams'}."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return self._fetch_league(league_id, pool)
+
+    def sync_league(self, league_id):
+        """Rosters, settings and every FA page of one league, fetched concurrently."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            settings = pool.submit(self.fetch_settings, league_id)
+            league   = self._fetch_league(league_id, pool)
+            return LeagueSnapshot(
+                platform=self.platform, league_id=str(league_id),
+                players=league['players'], teams=league['teams'],
+                settings=settings.result() or {}, synced_at=time.time(),
+            )
+
+    def sync_leagues(self, league_ids, sync=None):
+        """
+        Syncs several leagues at once, `league_workers` at a time.
+
+        Args:
+            sync: callable(league_id) run per league; defaults to sync_league
+
+        Returns:
+            {league_id: result, or None on failure}
+        """
+        sync = sync or self.sync_league
+
+        def sync_one(league_id):
+            try:
+                return sync(league_id)
+            except Exception as e:
+                print(f"⚠️ {self.platform} sync failed for {league_id}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.league_workers) as pool:
+            return dict(zip(league_ids, pool.map(sync_one, league_ids)))
+
+
+class FakeLeagueBridge(LeagueBridge):
+    """
+    Deterministic offline league provider. The same league id always yields
+    the same teams, rosters and FA pool; each call sleeps `latency` seconds
+    (± `jitter`, also deterministic) to stand in for the network.
+
+    Counters in .stats: requests made and peak requests in flight.
+    """
+
+    platform = 'Fake'
+    _POSITIONS = ['C', 'C', 'LW', 'LW', 'RW', 'RW', 'D', 'D', 'D', 'G']
+
+    def __init__(self, n_teams=20, roster_size=16, fa_pool=800, latency=0.05, jitter=0.0,
+                 seed=0, max_workers=None, league_workers=None, page_size=25):
+        self.n_teams, self.roster_size, self.fa_pool = n_teams, roster_size, fa_pool
+        self.latency, self.jitter, self.seed = latency, jitter, seed
+        self.fa_page_size = page_size
+        if max_workers:
+            self.max_workers = max_workers
+        if league_workers:
+            self.league_workers = league_workers
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._leagues = {}
+        self.stats = {'requests': 0, 'peak_in_flight': 0}
+
+    def _rng(self, *parts):
+        return random.Random(zlib.crc32(repr((self.seed,) + parts).encode()))
+
+    def _call(self, *parts):
+        """Simulated round trip: counts the request and sleeps its latency."""
+        with self._lock:
+            self.stats['requests'] += 1
+            self._in_flight += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self._in_flight)
+        try:
+            time.sleep(max(self.latency + self._rng('latency', *parts).uniform(-self.jitter, self.jitter), 0))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _league(self, league_id):
+        with self._lock:
+            if league_id not in self._leagues:
+                self._leagues[league_id] = self._build_league(league_id)
+            return self._leagues[league_id]
+
+    def _build_league(self, league_id):
+        """The league's fixed player universe: (teams, rostered rows, FA rows with ids)."""
+        rng = self._rng('league', league_id)
+        players = []
+        for i in range(self.n_teams * self.roster_size + self.fa_pool):
+            pos = rng.choice(self._POSITIONS)
+            elig = [pos]
+            if pos in ('C', 'LW', 'RW') and rng.random() < 0.3:
+                elig.append(rng.choice([p for p in ('C', 'LW', 'RW') if p != pos]))
+            if pos != 'G':
+                elig.append('Util')
+            name = f"Fake {league_id} Player {i:04d}"
+            players.append((f"{league_id}.p.{i}", {'name': name, 'match_key': name.lower(), 'Eligible': ",".join(elig)}))
+        rng.shuffle(players)
+
+        teams, rostered = {}, []
+        for t in range(self.n_teams):
+            team_name, manager = f"Fake Team {t + 1:02d}", f"GM {t + 1:02d}"
+            teams[team_name] = {'key': f"{league_id}.t.{t + 1}", 'owners': [f"guid-{t + 1:02d}"], 'manager': manager}
+            for _, p in players[t * self.roster_size:(t + 1) * self.roster_size]:
+                rostered.append({**p, 'Status': 'Rostered', 'Fantasy_Team': team_name, 'Manager': manager})
+        free = [(pid, {**p, 'Status': 'Free Agent', 'Fantasy_Team': 'Available', 'Manager': 'None'})
+                for pid, p in players[self.n_teams * self.roster_size:]]
+        return teams, rostered, free
+
+    def fetch_rosters(self, league_id):
+        self._call('rosters', league_id)
+        teams, rostered, _ = self._league(league_id)
+        return list(rostered), dict(teams)
+
+    def fetch_fa_page(self, league_id, position, start):
+        self._call('fa', league_id, position, start)
+        free = [fa for fa in self._league(league_id)[2] if position in fa[1]['Eligible'].split(',')]
+        return free[start:start + self.fa_page_size]
+
+    def fetch_settings(self, league_id):
+        from config import DEFAULT_CATS, DEFAULT_G_CATS, DEFAULT_ROSTER_SLOTS
+        self._call('settings', league_id)
+        return {'cats': DEFAULT_CATS + DEFAULT_G_CATS, 'roster_slots': dict(DEFAULT_ROSTER_SLOTS), 'end_date': None}
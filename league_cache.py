@@ -0,0 +1,101 @@
+"""
+league_cache.py — Shared League Cache
+Process-wide, league-scoped snapshots shared by every session.
+
+When all 12 managers of a league use the app, the roster sync and the Blended
+ROS build run once per league / season instead of once per session. Sessions
+hold a reference to the same immutable snapshot and keep only a tiny overlay
+of their own (which team is theirs).
+"""
+
+import threading
+import time
+from shared_frames import freeze_frame
+from swr_cache import get_swr
+
+
+LEAGUE_SNAPSHOT_TTL = 10 * 60       # seconds a synced league is reused before re-pulling
+ROS_PROJECTION_TTL  = 6 * 60 * 60   # seconds a Blended ROS build is reused
+
+_store_lock  = threading.Lock()
+_key_locks   = {}   # cache key -> threading.Lock (one builder per key)
+_snapshots   = {}   # (platform, league_id) -> snapshot dict
+_version     = 0
+
+
+def _lock_for(key):
+    with _store_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _next_version():
+    global _version
+    with _store_lock:
+        _version += 1
+        return _version
+
+
+def _as_snapshot(fetched, shared=True):
+    if not fetched or fetched.get('players') is None or fetched['players'].empty:
+        return None
+    extra = {k: v for k, v in fetched.items() if k not in ('players', 'teams')}   # e.g. sync watermarks
+    return {
+        **extra,
+        'players':   freeze_frame(fetched['players'].drop(columns=['Is_Mine'], errors='ignore')),
+        'teams':     fetched.get('teams', {}),
+        'version':   _next_version(),
+        'synced_at': time.time(),
+        'shared':    shared,
+    }
+
+
+def get_league_snapshot(platform, league_id, fetch_fn, max_age=LEAGUE_SNAPSHOT_TTL, force=False, authorize=None):
+    """
+    Returns the shared snapshot for one league, calling `fetch_fn` at most once
+    per `max_age` no matter how many sessions ask for it at the same time.
+
+    Args:
+        platform:  'Yahoo' or 'ESPN'
+        league_id: Yahoo league key / ESPN league id (+ year)
+        fetch_fn:  zero-arg callable returning {'players': DataFrame, 'teams': {...}}
+        force:     ignore the TTL and re-pull
+        authorize: optional callable(snapshot) -> bool. A caller that fails it
+                   never reads the shared copy and is served its own pull instead.
+
+    Returns:
+        Dict with keys players, teams, version, synced_at — or the last good
+        snapshot (possibly None) when the pull fails.
+    """
+    key = (platform, str(league_id))
+    with _lock_for(key):
+        snap = _snapshots.get(key)
+        if snap is not None and authorize is not None and not authorize(snap):
+            return _as_snapshot(fetch_fn(), shared=False)
+        if snap is not None and not force and time.time() - snap['synced_at'] < max_age:
+            return snap
+
+        fresh = _as_snapshot(fetch_fn())
+        if fresh is None:
+            return snap
+
+        _snapshots[key] = fresh
+        print(f"🗂️ League snapshot {platform}:{league_id} v{fresh['version']} cached ({len(fresh['players'])} players)")
+        return fresh
+
+
+def peek_league_snapshot(platform, league_id):
+    """Current shared snapshot for a league without triggering a pull."""
+    return _snapshots.get((platform, str(league_id)))
+
+
+def ros_snapshot_key(season, end_date):
+    return ('ros', season, str(end_date) if end_date else None)
+
+
+def get_shared_projections(season, end_date, build_fn, max_age=ROS_PROJECTION_TTL):
+    """
+    Returns Blended ROS projections shared by every session for (season, end date).
+    Served stale-while-revalidate: a stale build is returned immediately while
+    `build_fn` re-runs in the background (see swr_cache).
+    """
+    return get_swr(ros_snapshot_key(season, end_date), build_fn, max_age)
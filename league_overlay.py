@@ -0,0 +1,186 @@
+"""
+league_overlay.py — League Overlay
+Synced league rosters joined once with the scored player pool.
+Built at sync time (and whenever scores change) and sliced by every tab
+instead of each tab re-merging st.session_state['yahoo_data'] on its own.
+"""
+
+import pandas as pd
+import streamlit as st
+from league_cache import peek_league_snapshot
+
+
+OVERLAY_INDEX = ['Fantasy_Team', 'Status']
+LEAGUE_COLS   = ['name', 'Status', 'Fantasy_Team', 'Manager', 'Is_Mine', 'match_key', 'Eligible']
+CACHE_COLS    = ['name', 'Status', 'Fantasy_Team', 'Manager', 'Is_Mine', 'match_key']   # yahoo_league_cache table
+
+
+def to_cache_records(yahoo_df, guid):
+    """League rows as native-typed dicts for the Supabase cache (Is_Mine stays a bool)."""
+    rows = yahoo_df[[c for c in CACHE_COLS if c in yahoo_df.columns]]
+    return [
+        {**{c: (bool(v) if c == 'Is_Mine' else str(v)) for c, v in rec.items()}, 'guid': guid}
+        for rec in rows.to_dict(orient='records')
+    ]
+
+
+def from_cache_records(rows):
+    """Supabase cache rows back into a league frame with the original dtypes."""
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    df = df[[c for c in CACHE_COLS if c in df.columns]]
+    if 'Is_Mine' in df.columns:
+        # Rows written before the cache was typed come back as "True" / "False"
+        df['Is_Mine'] = df['Is_Mine'].isin([True, 'True', 'true'])
+    return df
+
+
+def mark_league_synced():
+    """Bumps the sync version so the overlay is rebuilt on the next run."""
+    st.session_state['league_sync_version'] = st.session_state.get('league_sync_version', 0) + 1
+
+
+def use_league_snapshot(snapshot, platform, league_id, my_team):
+    """
+    Points this session at a shared league snapshot (see league_cache).
+    The frame is shared by reference — the only per-user state is `my_team`.
+    """
+    st.session_state['yahoo_data']      = snapshot['players']
+    st.session_state['my_fantasy_team'] = my_team
+    if snapshot.get('shared', True):
+        st.session_state['league_ref'] = (platform, str(league_id), snapshot['version'])
+    else:
+        st.session_state.pop('league_ref', None)
+    mark_league_synced()
+
+
+def use_private_league_data(yahoo_df):
+    """Session-owned league frame (e.g. a Supabase cache restore) with its own Is_Mine column."""
+    st.session_state['yahoo_data'] = yahoo_df
+    st.session_state.pop('league_ref', None)
+    st.session_state.pop('my_fantasy_team', None)
+    mark_league_synced()
+
+
+def _follow_shared_snapshot():
+    """Swaps in a newer shared snapshot if another manager of the league re-synced it."""
+    ref = st.session_state.get('league_ref')
+    if not ref:
+        return
+    platform, league_id, version = ref
+    snap = peek_league_snapshot(platform, league_id)
+    if snap is not None and snap['version'] != version:
+        st.session_state['yahoo_data'] = snap['players']
+        st.session_state['league_ref'] = (platform, league_id, snap['version'])
+        mark_league_synced()
+
+
+def build_league_overlay(yahoo_df, final, my_team=None):
+    """
+    Joins the synced league frame with the scored player frame.
+
+    Args:
+        yahoo_df: league frame from yahoo_bridge / espn_bridge
+                  (name, Status, Fantasy_Team, Manager, Is_Mine, match_key)
+        final:    combined scored skaters + goalies from app.py
+        my_team:  this user's fantasy team; when given, Is_Mine is derived from it
+                  (shared snapshots carry no Is_Mine column)
+
+    Returns:
+        DataFrame indexed by (Fantasy_Team, Status) with the league columns,
+        an 'Own' label (Mine / Taken / FA) and every scored column from `final`
+        (Player, Team, Pos, NexusScore, raw cats, {cat}V ...).
+        Players the engine did not score keep NaN score columns.
+    """
+    if yahoo_df is None or yahoo_df.empty:
+        return pd.DataFrame()
+
+    league = yahoo_df[[c for c in LEAGUE_COLS if c in yahoo_df.columns]].copy()
+    if 'match_key' not in league.columns:
+        league['match_key'] = league['name'].str.lower().str.strip()
+    if 'Manager' not in league.columns:
+        league['Manager'] = 'None'
+    if my_team is not None:
+        league['Is_Mine'] = league['Fantasy_Team'] == my_team
+    elif 'Is_Mine' in league.columns:
+        league['Is_Mine'] = league['Is_Mine'].astype(bool)
+    else:
+        league['Is_Mine'] = False
+    league = league.drop_duplicates(subset=['match_key'])
+
+    league['Own'] = 'FA'
+    league.loc[league['Status'] == 'Rostered', 'Own'] = 'Taken'
+    league.loc[league['Is_Mine'], 'Own'] = 'Mine'
+
+    if final is not None and not final.empty:
+        scored = final
+        if 'match_key' not in scored.columns:
+            scored = scored.assign(match_key=scored['Player'].str.lower().str.strip())
+        score_cols = [c for c in scored.columns if c not in league.columns or c == 'match_key']
+        scored = scored[score_cols].drop_duplicates(subset=['match_key'])
+        league = pd.merge(league, scored, on='match_key', how='left')
+
+    return league.set_index(OVERLAY_INDEX).sort_index()
+
+
+def refresh_league_overlay(final, score_key):
+    """
+    Rebuilds st.session_state['league_overlay'] only when the synced league
+    or the scoring inputs (`score_key`) changed since the last build.
+    """
+    if 'yahoo_data' not in st.session_state:
+        st.session_state.pop('league_overlay', None)
+        st.session_state.pop('league_overlay_key', None)
+        return None
+
+    _follow_shared_snapshot()
+    my_team     = st.session_state.get('my_fantasy_team')
+    overlay_key = (st.session_state.get('league_sync_version', 0), my_team, score_key)
+    if st.session_state.get('league_overlay_key') != overlay_key or 'league_overlay' not in st.session_state:
+        st.session_state['league_overlay']     = build_league_overlay(st.session_state['yahoo_data'], final, my_team)
+        st.session_state['league_overlay_key'] = overlay_key
+    return st.session_state['league_overlay']
+
+
+def slice_overlay(overlay, fantasy_team=None, status=None, mine=None, scored=False):
+    """
+    Returns a flat (index reset) slice of the overlay.
+
+    Args:
+        fantasy_team: keep a single fantasy team
+        status:       'Rostered' or 'Free Agent'
+        mine:         True → only my roster, False → everyone else
+        scored:       drop players the engine did not score
+    """
+    if overlay is None or overlay.empty:
+        return pd.DataFrame()
+
+    key = (
+        fantasy_team if fantasy_team is not None else slice(None),
+        status       if status       is not None else slice(None),
+    )
+    try:
+        part = overlay.loc[key, :]
+    except KeyError:
+        part = overlay.iloc[0:0]
+
+    part = part.reset_index()
+    if mine is not None:
+        part = part[part['Is_Mine'] == mine]
+    if scored and 'NexusScore' in part.columns:
+        part = part[part['NexusScore'].notna()]
+    return part
+
+
+def league_teams(overlay):
+    """Sorted fantasy team names, skipping the 'Available' free agent bucket."""
+    if overlay is None or overlay.empty:
+        return []
+    teams = overlay.index.get_level_values('Fantasy_Team').unique()
+    return sorted(t for t in teams.dropna() if t != 'Available')
+
+
+def my_team_name(overlay):
+    mine = slice_overlay(overlay, mine=True)
+    return mine['Fantasy_Team'].iloc[0] if not mine.empty else None
@@ -0,0 +1,144 @@
+"""
+lineup_optimizer.py — Weekly Lineup Optimizer
+Assigns my roster to the league's lineup slots (C / LW / RW / D / Util / G) for
+every remaining day of the fantasy week, maximizing projected value started.
+
+The whole week is one (days × players × slots) value tensor: a player scores
+in a slot only if his NHL team plays that day and he is eligible for it.
+Each day is then an exact maximum-weight assignment (Hungarian algorithm).
+Players with a game who do not fit a slot overflow to the bench.
+"""
+
+import numpy as np
+import pandas as pd
+from config import DEFAULT_ROSTER_SLOTS, NHL_POS_TO_SLOT
+
+
+def slot_list(slots=None):
+    """Expands {'C': 2, ...} into one entry per lineup spot."""
+    return [s for s, n in (slots or DEFAULT_ROSTER_SLOTS).items() for _ in range(int(n))]
+
+
+def eligible_slots(row):
+    """
+    A player's eligible slots: the platform's list when synced ('C,LW'),
+    otherwise his NHL position. Every skater can fill Util.
+    """
+    raw = row.get('Eligible')
+    if isinstance(raw, str) and raw.strip():
+        slots = {s.strip() for s in raw.split(',') if s.strip()}
+    else:
+        slots = {NHL_POS_TO_SLOT.get(str(row.get('Pos', '')).upper(), '')} - {''}
+    if slots - {'G'}:
+        slots.add('Util')
+    return slots
+
+
+def _hungarian(cost):
+    """
+    Minimum-cost assignment for a square matrix (O(n³) Kuhn–Munkres with potentials).
+
+    Returns:
+        col_of_row — for each row, the column it is assigned to
+    """
+    n = cost.shape[0]
+    u, v = np.zeros(n + 1), np.zeros(n + 1)
+    p, way = np.zeros(n + 1, dtype=int), np.zeros(n + 1, dtype=int)
+    for i in range(1, n + 1):
+        p[0], j0 = i, 0
+        minv = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            free = ~used[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    col_of_row = np.zeros(n, dtype=int)
+    col_of_row[p[1:] - 1] = np.arange(n)
+    return col_of_row
+
+
+def optimize_week(roster, days, schedule, slots=None, value_col='NexusScore'):
+    """
+    Best lineup for each day.
+
+    Args:
+        roster:    my players — Player, Team, Pos, optional Eligible, and value_col
+        days:      date strings to plan (e.g. today → end of the fantasy week)
+        schedule:  get_nhl_schedule() dict {date: {team: 'vs OPP' / '@ OPP'}}
+        slots:     {slot: count}; defaults to DEFAULT_ROSTER_SLOTS
+
+    Returns:
+        (lineup, summary)
+          lineup:  one row per day × player with a game — Day, Slot ('BN' = benched), Player, Team, Opp, Value
+          summary: per player — Games, Starts, Benched, Value started
+    """
+    spots = slot_list(slots)
+    if roster.empty or not days or not spots:
+        return pd.DataFrame(), pd.DataFrame()
+    roster = roster.reset_index(drop=True)
+
+    # Any start beats an empty spot, so shift values to be strictly positive (order preserved)
+    raw   = pd.to_numeric(roster[value_col], errors='coerce').fillna(0).to_numpy(dtype=float)
+    value = raw - raw.min() + 1.0
+
+    elig  = np.array([[s in eligible_slots(r) for s in spots] for r in roster.to_dict('records')])
+    plays = np.array([[team in (schedule or {}).get(d, {}) for team in roster['Team']] for d in days])
+
+    # (days, players, spots) value tensor — zero where the player can't start there
+    week = np.where(plays[:, :, None] & elig[None, :, :], value[None, :, None], 0.0)
+
+    # Days share no players or spots, so the week's joint assignment is block-diagonal:
+    # solving each day alone gives the same lineup as one (days·players)² problem at a
+    # fraction of its O(n³) cost. Days with the same set of players in action share one solve.
+    n = max(len(roster), len(spots))
+    solved = {}
+    rows = []
+    for d_i, day in enumerate(days):
+        key = plays[d_i].tobytes()
+        if key not in solved:
+            square = np.zeros((n, n))
+            square[:len(roster), :len(spots)] = week[d_i]
+            solved[key] = _hungarian(-square)
+        assigned = solved[key]
+        for p_i in np.nonzero(plays[d_i])[0]:
+            s_i = assigned[p_i]
+            started = s_i < len(spots) and week[d_i, p_i, s_i] > 0
+            team = roster.at[p_i, 'Team']
+            rows.append({
+                'Day':    day,
+                'Slot':   spots[s_i] if started else 'BN',
+                'Player': roster.at[p_i, 'Player'],
+                'Team':   team,
+                'Opp':    schedule[day].get(team, ''),
+                'Value':  raw[p_i],
+            })
+
+    lineup = pd.DataFrame(rows)
+    if lineup.empty:
+        return lineup, pd.DataFrame()
+    order = {s: i for i, s in enumerate(dict.fromkeys(spots + ['BN']))}
+    lineup = lineup.sort_values(['Day', 'Slot'], key=lambda c: c.map(order) if c.name == 'Slot' else c)
+
+    started = lineup['Slot'] != 'BN'
+    summary = lineup.assign(Started=started, Benched=~started).groupby('Player').agg(
+        Games=('Day', 'size'), Starts=('Started', 'sum'), Benched=('Benched', 'sum'),
+    )
+    summary['Value'] = lineup[started].groupby('Player')['Value'].sum().reindex(summary.index).fillna(0)
+    return lineup.reset_index(drop=True), summary.sort_values('Starts', ascending=False).reset_index()
@@ -0,0 +1,226 @@
+"""
+live_scoring.py — Live In-Game Scoring Feed
+Tonight's per-player box-score stats from api-web.nhle.com, folded into the
+current matchup week as deltas.
+
+  - one schedule call per poll tells which of today's games have started
+  - only games in progress are re-fetched; a final box score is fetched once
+    and kept for the rest of the process
+  - box scores are shared by every session; each session keeps the last stats
+    it has seen per game and applies only the difference to its week totals
+  - PPP gets no live delta (the box score has power-play goals only), so it
+    stays at the base week total rather than mixing two definitions
+"""
+
+import threading
+import time
+from datetime import date
+import pandas as pd
+import requests
+from matchup_engine import project_matchup, additive_columns, apply_rates, combine_totals
+
+
+LIVE_POLL_SECONDS = 30
+LIVE_STATES       = {'LIVE', 'CRIT'}
+FINAL_STATES      = {'FINAL', 'OFF'}
+
+# Box-score field → category
+SKATER_FIELDS = {
+    'goals': 'G', 'assists': 'A', 'plusMinus': '+/-', 'pim': 'PIM',
+    'sog': 'SOG', 'hits': 'HIT', 'blockedShots': 'BLK',
+}
+# The box score only carries power-play goals, not assists — these keep their base total
+BASE_ONLY_CATS = {'PPP'}
+
+_lock      = threading.Lock()
+_games     = {'fetched_at': 0.0, 'date': None, 'games': []}
+_boxscores = {}   # game_id -> {'stats', 'state', 'fetched_at'}
+
+
+# ── NHL feed ─────────────────────────────────────────────────────────────────
+
+def get_todays_games():
+    """Today's games with their current state, re-read at most every LIVE_POLL_SECONDS."""
+    today_str = str(date.today())
+    with _lock:
+        if _games['date'] == today_str and time.time() - _games['fetched_at'] < LIVE_POLL_SECONDS:
+            return _games['games']
+    try:
+        data = requests.get(f"https://api-web.nhle.com/v1/score/{today_str}", timeout=10).json()
+        games = [{
+            'game_id':    g['id'],
+            'home':       g['homeTeam']['abbrev'],
+            'away':       g['awayTeam']['abbrev'],
+            'game_state': g.get('gameState', 'FUT'),
+        } for g in data.get('games', [])]
+    except Exception as e:
+        print(f"⚠️ Live scoreboard fetch failed: {e}")
+        return _games['games'] if _games['date'] == today_str else []
+    with _lock:
+        _games.update(fetched_at=time.time(), date=today_str, games=games)
+    return games
+
+
+def _toi_minutes(toi):
+    try:
+        mins, secs = str(toi).split(':')
+        return int(mins) + int(secs) / 60
+    except (ValueError, AttributeError):
+        return 0.0
+
+
+def parse_boxscore(bs, final=False):
+    """
+    Flattens a gamecenter box score into one row per player.
+
+    Returns:
+        DataFrame indexed by playerId — skater categories, plus W / SHO / GA / SA / SV / TOI_min for goalies
+    """
+    rows = []
+    for side in ('awayTeam', 'homeTeam'):
+        team = bs.get('playerByGameStats', {}).get(side, {})
+        for p in team.get('forwards', []) + team.get('defense', []):
+            row = {'playerId': p.get('playerId')}
+            row.update({cat: p.get(field, 0) or 0 for field, cat in SKATER_FIELDS.items()})
+            rows.append(row)
+        for p in team.get('goalies', []):
+            toi = _toi_minutes(p.get('toi'))
+            if toi <= 0:
+                continue  # dressed as backup, never played
+            ga = p.get('goalsAgainst', 0) or 0
+            sa = p.get('shotsAgainst', 0) or 0
+            won = p.get('decision') == 'W'
+            rows.append({
+                'playerId': p.get('playerId'),
+                'W':   int(won),
+                'SHO': int(final and won and ga == 0),
+                'GA':  ga, 'SA': sa, 'SV': p.get('saves', sa - ga),
+                'TOI_min': toi,
+            })
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).fillna(0).groupby('playerId').sum()
+
+
+def get_boxscore_stats(game):
+    """
+    Per-player stats for one started game. Final games are fetched once;
+    live games at most every LIVE_POLL_SECONDS across all sessions.
+
+    Returns:
+        {'stats', 'state'} — state is the game state the stats were read at
+    """
+    gid   = game['game_id']
+    final = game['game_state'] in FINAL_STATES
+    with _lock:
+        cached = _boxscores.get(gid)
+    if cached is not None and (cached['state'] in FINAL_STATES
+                               or (not final and time.time() - cached['fetched_at'] < LIVE_POLL_SECONDS)):
+        return cached
+    try:
+        bs = requests.get(f"https://api-web.nhle.com/v1/gamecenter/{gid}/boxscore", timeout=10).json()
+        stats = parse_boxscore(bs, final=final)
+    except Exception as e:
+        print(f"⚠️ Live boxscore fetch failed for {gid}: {e}")
+        return cached or {'stats': pd.DataFrame(), 'state': 'FUT'}
+    entry = {'stats': stats, 'state': game['game_state'], 'fetched_at': time.time()}
+    with _lock:
+        _boxscores[gid] = entry
+    return entry
+
+
+# ── Per-session deltas ───────────────────────────────────────────────────────
+
+def start_live_week(totals, week, id_map):
+    """
+    Live state for one matchup view, kept in the caller's session.
+
+    Args:
+        totals: project_week() totals for the teams being followed
+        week:   project_week() week info (dates, rosters, proj_df, rem_games)
+        id_map: {playerId: match_key} for every player who can appear in a box score
+    """
+    cats     = totals['cats']
+    cols     = additive_columns(cats)
+    roster_m = pd.crosstab(week['rosters']['Fantasy_Team'], week['rosters']['match_key'])
+    roster_m = roster_m.reindex(totals['current'].index, fill_value=0)
+
+    # Box scores carry today's games, so the base score must stop at yesterday
+    # (categories the box score can't supply keep whatever the base has)
+    current = totals['current'][cols].copy()
+    if week['current_end'] >= week['today']:
+        live_cols = [c for c in cols if c not in BASE_ONLY_CATS]
+        current[live_cols] = 0.0
+    return {
+        'current':  current,
+        'week':     week,
+        'roster_m': roster_m,
+        'id_map':   id_map,
+        'cats':     cats,
+        'cols':     cols,    # additive stats the deltas are applied to (rates are re-derived)
+        'live':     pd.DataFrame(0.0, index=roster_m.index, columns=cols),
+        'seen':     {},      # game_id -> last per-player stats folded in
+        'started':  set(),   # NHL teams whose game today has started
+    }
+
+
+def poll_live_week(state):
+    """
+    Applies tonight's new box-score stats to the session's week totals.
+
+    Each started game's per-player stats are diffed against what this session
+    last saw, mapped onto fantasy rosters (roster matrix · per-player delta),
+    and added to state['live'].
+
+    Returns:
+        (state, games) — games is today's scoreboard list
+    """
+    games   = get_todays_games()
+    cols    = state['cols']
+    players = state['roster_m'].columns
+    for game in games:
+        if game['game_state'] not in LIVE_STATES | FINAL_STATES:
+            continue
+        state['started'].update((game['home'], game['away']))
+        seen = state['seen'].get(game['game_id'])
+        if seen is not None and seen['state'] in FINAL_STATES:
+            continue  # already folded in completely
+
+        box   = get_boxscore_stats(game)
+        stats = box['stats']
+        if stats.empty:
+            continue
+        prev  = seen['stats'] if seen is not None else stats.iloc[0:0]
+        delta = stats.sub(prev, fill_value=0).reindex(columns=cols, fill_value=0)
+        delta = delta.groupby(delta.index.map(state['id_map'])).sum()
+        if not delta.empty:
+            state['live'] = state['live'] + state['roster_m'].dot(delta.reindex(players, fill_value=0))
+        state['seen'][game['game_id']] = {'stats': stats, 'state': box['state']}
+    return state, games
+
+
+def live_totals(state):
+    """
+    Current (through yesterday) + tonight so far + projection for games not yet started.
+
+    Returns:
+        Dict shaped like project_matchup() output, with an extra 'live' frame
+    """
+    week = state['week']
+    rem_games = dict(week['rem_games'])
+    for team in state['started']:
+        if team in rem_games:
+            rem_games[team] = max(rem_games[team] - 1, 0)
+
+    projected = project_matchup(week['rosters'], None, week['proj_df'], rem_games,
+                                state['cats'], teams=list(state['roster_m'].index))
+    remaining = projected['remaining']
+    current = state['current'] + state['live']
+    return {
+        'cats':      state['cats'],
+        'current':   apply_rates(current, state['cats']),
+        'live':      apply_rates(state['live'], state['cats']),
+        'remaining': remaining,
+        'final':     combine_totals(current, remaining, state['cats']),
+        'games':     projected['games'],
+    }
@@ -0,0 +1,360 @@
+"""
+matchup_engine.py — H2H Matchup Engine
+Pure, Streamlit-free weekly category projection for fantasy teams.
+
+    remaining = roster indicator (teams × players)
+              @ per-game rates (players × cats) * remaining games (players)
+
+Current, remaining and final category totals for every team in `rosters`
+come out of one pass — no per-player loops, no per-player schedule scans.
+
+simulate_matchup() turns the point estimate into win probabilities by drawing
+the remaining week tens of thousands of times as NumPy arrays; all_play_matrix()
+scores every possible pairing of the league's teams in one tensor comparison.
+
+Rate categories (GAA, SV%) are never summed or projected directly: their
+components (GA, SA, SV, goalie minutes) are, and the rate is derived from the
+team's component totals — exactly how the fantasy platforms score them.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+LOWER_IS_BETTER = {'GAA', 'GA', 'L'}
+
+# Rate category → (numerator, denominator, scale) over additive component stats
+RATE_STATS = {
+    'GAA': ('GA', 'TOI_min', 60.0),
+    'SV%': ('SV', 'SA', 1.0),
+}
+
+# Additive stats that are not non-negative counts — simulated with a normal
+# approximation instead of a Poisson draw; goalie minutes are taken as projected
+NON_COUNT_CATS = {'+/-', 'TOI'}
+FIXED_STATS    = {'TOI_min'}
+
+# Per skater-game variance of the normal-approximated stats (TOI in seconds):
+# the remaining week's variance is this × the team's remaining skater games
+NON_COUNT_GAME_VAR = {'+/-': 1.0, 'TOI': 180.0 ** 2}
+
+DEFAULT_SIMS = 20000
+
+
+def remaining_games_by_team(schedule, start_str, end_str):
+    """
+    Counts games per NHL team between start_str and end_str (inclusive)
+    from a get_nhl_schedule() dict, in a single pass over the schedule.
+    """
+    counts = {}
+    for day, games in (schedule or {}).items():
+        if start_str <= day <= end_str:
+            for team in games:
+                counts[team] = counts.get(team, 0) + 1
+    return counts
+
+
+def additive_columns(cats):
+    """Categories with every rate stat replaced by the components it is derived from."""
+    cols = []
+    for c in cats:
+        for part in (RATE_STATS[c][:2] if c in RATE_STATS else (c,)):
+            if part not in cols:
+                cols.append(part)
+    return cols
+
+
+def apply_rates(frame, cats):
+    """
+    Derives the rate categories in `cats` from component columns of `frame`.
+    A team without the denominator (no goalie minutes / shots) gets NaN, which compares as a tie.
+
+    Returns:
+        frame with rate columns (re)computed, columns ordered cats + remaining components
+    """
+    out = frame.copy()
+    for c in cats:
+        if c in RATE_STATS:
+            num, den, scale = RATE_STATS[c]
+            out[c] = (out[num] * scale / out[den].where(out[den] > 0)).astype(float)
+    return out[list(cats) + [c for c in out.columns if c not in cats]]
+
+
+def combine_totals(current, remaining, cats):
+    """current + remaining on the additive columns, with rates re-derived from the summed components."""
+    cols = additive_columns(cats)
+    return apply_rates(current[cols] + remaining[cols], cats)
+
+
+def _roster_matrix(rosters):
+    """Teams × players indicator matrix (a player counted once per roster spot)."""
+    return pd.crosstab(rosters['Fantasy_Team'], rosters['match_key'])
+
+
+def _per_player(df, cats):
+    """Sums category columns per match_key (missing categories count as 0)."""
+    if df is None or df.empty or 'match_key' not in df.columns:
+        return pd.DataFrame(columns=cats, dtype=float)
+    out = df[['match_key']].copy()
+    for c in cats:
+        out[c] = pd.to_numeric(df[c], errors='coerce').fillna(0) if c in df.columns else 0.0
+    return out.groupby('match_key')[cats].sum()
+
+
+def project_rates(proj_df, cats, rem_games):
+    """
+    Remaining-week projection per player: (stat / GP) × remaining games of the player's NHL team.
+
+    Args:
+        proj_df:   match_key, Team, GP + category columns (season stats or ROS projections)
+        cats:      categories to project
+        rem_games: {NHL team: games left this week}
+
+    Returns:
+        DataFrame indexed by match_key with one column per category
+    """
+    if proj_df is None or proj_df.empty:
+        return pd.DataFrame(columns=cats, dtype=float)
+    gp    = pd.to_numeric(proj_df['GP'], errors='coerce').fillna(0).clip(lower=1)
+    rem_g = proj_df['Team'].map(rem_games).fillna(0) if 'Team' in proj_df.columns else 0
+    scale = rem_g / gp
+    out = proj_df[['match_key']].copy()
+    for c in cats:
+        vals = pd.to_numeric(proj_df[c], errors='coerce').fillna(0) if c in proj_df.columns else 0.0
+        out[c] = vals * scale
+    return out.groupby('match_key')[cats].sum()
+
+
+def remaining_skater_games(proj_df, rem_games):
+    """Remaining NHL games per skater (match_key) — goalies are left out."""
+    if proj_df is None or proj_df.empty or 'Team' not in proj_df.columns:
+        return pd.Series(dtype=float)
+    games = proj_df['Team'].map(rem_games).fillna(0).astype(float)
+    if 'Pos' in proj_df.columns:
+        games = games.where(proj_df['Pos'].astype(str).str.upper() != 'G', 0.0)
+    return games.groupby(proj_df['match_key']).max()
+
+
+def project_matchup(rosters, current_df, proj_df, rem_games, cats, teams=None):
+    """
+    Projects weekly category totals for every fantasy team in `rosters`.
+
+    Args:
+        rosters:    DataFrame with Fantasy_Team, match_key — one row per rostered player
+        current_df: week-to-date stats per player (match_key + category columns)
+        proj_df:    projection source per player (match_key, Team, GP + category columns)
+        rem_games:  {NHL team: remaining games this week}
+        cats:       categories to total
+        teams:      optional team order (teams without players get all-zero rows)
+
+    Returns:
+        Dict with 'cats' and DataFrames indexed by Fantasy_Team — current,
+        remaining, final (= current + remaining) — holding one column per
+        category followed by the components of any rate categories, plus
+        'games': remaining skater games per team (sets the +/- spread in simulation)
+    """
+    cats = list(cats)
+    cols = additive_columns(cats)
+    if rosters is None or rosters.empty:
+        empty = apply_rates(pd.DataFrame(columns=cols, dtype=float), cats)
+        return {'cats': cats, 'current': empty, 'remaining': empty, 'final': empty,
+                'games': pd.Series(dtype=float)}
+
+    roster_m = _roster_matrix(rosters)
+    if teams is not None:
+        roster_m = roster_m.reindex(list(teams), fill_value=0)
+    players  = roster_m.columns
+
+    current   = roster_m.dot(_per_player(current_df, cols).reindex(players, fill_value=0)).astype(float)
+    remaining = roster_m.dot(project_rates(proj_df, cols, rem_games).reindex(players, fill_value=0)).astype(float)
+    games     = roster_m.dot(remaining_skater_games(proj_df, rem_games).reindex(players, fill_value=0)).astype(float)
+
+    return {
+        'cats':      cats,
+        'current':   apply_rates(current, cats),
+        'remaining': apply_rates(remaining, cats),
+        'final':     combine_totals(current, remaining, cats),
+        'games':     games,
+    }
+
+
+def category_winners(final, team_a, team_b, lower_is_better=LOWER_IS_BETTER):
+    """
+    Compares two teams' final totals category by category.
+
+    Args:
+        final: teams × cats frame restricted to the scored categories (totals['final'][totals['cats']])
+
+    Returns:
+        (winners, a_wins, b_wins, ties) — winners is a Series of team name / "Tie" per category
+    """
+    a, b  = final.loc[team_a], final.loc[team_b]
+    lower = a.index.isin(list(lower_is_better))
+    a_better = ((a > b) & ~lower) | ((a < b) & lower)
+    b_better = ((b > a) & ~lower) | ((b < a) & lower)
+
+    winners = pd.Series("Tie", index=a.index)
+    winners[a_better] = team_a
+    winners[b_better] = team_b
+    return winners, int(a_better.sum()), int(b_better.sum()), int((~a_better & ~b_better).sum())
+
+
+# ── Monte Carlo ──────────────────────────────────────────────────────────────
+
+def simulate_remaining(remaining, n_sims=DEFAULT_SIMS, seed=None, games=None):
+    """
+    Draws the rest of the week for every team and category at once.
+
+    Each player's remaining games are independent Poisson draws at his per-game
+    rate, and a sum of independent Poissons is Poisson with the summed mean — so
+    drawing once per team × category from the `remaining` totals is exactly the
+    same distribution as drawing every player-game, at a fraction of the cost.
+
+    Shots against are drawn as saves + goals against so every simulated SV% is consistent.
+    +/- and TOI are normal around the expected total with variance
+    NON_COUNT_GAME_VAR × remaining skater games: a team whose +/- nets out near 0
+    still carries a full week of game-to-game swing.
+
+    Args:
+        remaining: teams × additive-stat DataFrame of expected remaining totals
+        n_sims:    number of simulated weeks
+        seed:      optional RNG seed
+        games:     remaining skater games per team (project_matchup()['games']);
+                   None falls back to a spread of √|mean|
+
+    Returns:
+        float array of shape (n_sims, teams, additive stats)
+    """
+    rng   = np.random.default_rng(seed)
+    cols  = list(remaining.columns)
+    means = remaining.to_numpy(dtype=float)
+    fixed  = np.isin(cols, list(FIXED_STATS))
+    normal = np.isin(cols, list(NON_COUNT_CATS))
+    count  = ~fixed & ~normal
+
+    draws = np.empty((n_sims,) + means.shape)
+    draws[:, :, count]  = rng.poisson(np.clip(means[:, count], 0, None), size=(n_sims,) + means[:, count].shape)
+    if games is not None:
+        team_games = pd.Series(games, dtype=float).reindex(remaining.index).fillna(0).to_numpy()
+        game_var   = np.array([NON_COUNT_GAME_VAR.get(c, 1.0) for c in np.array(cols)[normal]])
+        spread     = np.sqrt(team_games[:, None] * game_var[None, :])
+    else:
+        spread = np.sqrt(np.abs(means[:, normal]))
+    draws[:, :, normal] = rng.normal(means[:, normal], spread, size=(n_sims,) + means[:, normal].shape)
+    draws[:, :, fixed]  = means[:, fixed]
+    if {'SA', 'SV', 'GA'} <= set(cols):
+        draws[:, :, cols.index('SA')] = draws[:, :, cols.index('SV')] + draws[:, :, cols.index('GA')]
+    return draws
+
+
+def _rates_array(values, cols, cats):
+    """(…, additive stats) array → (…, cats) array, deriving rate categories from their components."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = []
+        for c in cats:
+            if c in RATE_STATS:
+                num, den, scale = RATE_STATS[c]
+                d = values[..., cols.index(den)]
+                out.append(np.where(d > 0, values[..., cols.index(num)] * scale / d, np.nan))
+            else:
+                out.append(values[..., cols.index(c)])
+    return np.stack(out, axis=-1)
+
+
+def simulate_matchup(totals, team_a, team_b, n_sims=DEFAULT_SIMS, seed=None, lower_is_better=LOWER_IS_BETTER):
+    """
+    Monte Carlo head-to-head: current score + simulated remaining week, n_sims times.
+
+    Args:
+        totals: project_matchup() output containing both teams
+        team_a: first team name
+        team_b: second team name
+
+    Returns:
+        Dict with
+          categories: DataFrame per category — win_a, tie, win_b probabilities
+          outcome:    {'win', 'tie', 'loss'} probabilities for team_a over the whole matchup
+          scores:     Series of category scorelines ("a-b-ties") → probability, most likely first
+    """
+    pair  = [team_a, team_b]
+    cats  = totals['cats']
+    cols  = additive_columns(cats)
+    parts = totals['current'].loc[pair, cols].to_numpy(dtype=float) + simulate_remaining(
+        totals['remaining'].loc[pair, cols], n_sims, seed, games=totals.get('games'))
+    final = _rates_array(parts, cols, cats)
+    a, b  = final[:, 0, :], final[:, 1, :]
+
+    lower    = np.isin(cats, list(lower_is_better))
+    a_better = np.where(lower, a < b, a > b)
+    b_better = np.where(lower, b < a, b > a)
+    tie      = ~a_better & ~b_better
+
+    a_wins, b_wins = a_better.sum(axis=1), b_better.sum(axis=1)
+
+    categories = pd.DataFrame({
+        'win_a': a_better.mean(axis=0),
+        'tie':   tie.mean(axis=0),
+        'win_b': b_better.mean(axis=0),
+    }, index=pd.Index(cats, name='Category'))
+
+    outcome = {
+        'win':  float((a_wins > b_wins).mean()),
+        'tie':  float((a_wins == b_wins).mean()),
+        'loss': float((a_wins < b_wins).mean()),
+    }
+
+    # Encode each simulated (a_wins, b_wins) scoreline as one integer to count them in one pass
+    n, k = len(cats), len(cats) + 1
+    codes, freq = np.unique(a_wins * k + b_wins, return_counts=True)
+    labels = [f"{c // k}-{c % k}-{n - c // k - c % k}" for c in codes]
+    scores = pd.Series(freq / n_sims, index=labels, name='Probability').sort_values(ascending=False)
+
+    return {'categories': categories, 'outcome': outcome, 'scores': scores}
+
+
+# ── All-play ─────────────────────────────────────────────────────────────────
+
+def all_play_matrix(final, lower_is_better=LOWER_IS_BETTER):
+    """
+    Expected category wins for every team against every other team this week.
+
+    One (teams × teams × cats) comparison of the projected final totals replaces
+    N×(N-1)/2 separate matchup runs; a tied category counts half.
+
+    Args:
+        final: teams × cats DataFrame (project_matchup()['final'][cats] for the whole league)
+
+    Returns:
+        teams × teams DataFrame — row team's expected category wins vs the column team (diagonal NaN)
+    """
+    x     = final.to_numpy(dtype=float)
+    lower = final.columns.isin(list(lower_is_better))
+    diff  = x[:, None, :] - x[None, :, :]
+    diff[:, :, lower] *= -1
+
+    wins = (diff > 0).sum(axis=2) + 0.5 * ((diff == 0) | np.isnan(diff)).sum(axis=2)
+    np.fill_diagonal(wins, np.nan)
+    return pd.DataFrame(wins, index=final.index, columns=final.index)
+
+
+def schedule_adjusted_rankings(matrix, n_cats):
+    """
+    Power ranking from an all_play_matrix(): how each team's projected week
+    (roster strength × NHL games left) would fare against the whole league.
+
+    Returns:
+        DataFrame sorted best-first with Avg_Cat_Wins, All_Play W/L/T, All_Play_Pct
+    """
+    wins  = matrix.to_numpy()
+    opps  = ~np.isnan(wins)
+    half  = n_cats / 2
+    out = pd.DataFrame({
+        'Avg_Cat_Wins': np.nanmean(wins, axis=1),
+        'W': ((wins > half) & opps).sum(axis=1),
+        'L': ((wins < half) & opps).sum(axis=1),
+        'T': ((wins == half) & opps).sum(axis=1),
+    }, index=matrix.index)
+    out['All_Play_Pct'] = (out['W'] + 0.5 * out['T']) / opps.sum(axis=1).clip(min=1)
+    out = out.sort_values(['All_Play_Pct', 'Avg_Cat_Wins'], ascending=False)
+    out.insert(0, 'Rank', range(1, len(out) + 1))
+    return out
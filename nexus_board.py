@@ -8,6 +8,7 @@ import requests
 import pandas as pd
 from datetime import date, datetime, timedelta
 from data_fetcher import get_nhl_schedule, get_fantasy_weeks
+from league_overlay import slice_overlay
 
 
 # ── Opponent quality: goals allowed per game by team (lower = tougher defense) ──
@@ -92,7 +93,7 @@ def build_nexusboard(
     num_days=7,
     evaluated_df=None,
     g_df_global=None,
-    yahoo_df=None,
+    league_overlay=None,
     weights=None,
     cats=None,
     season="20252026",
@@ -196,19 +197,17 @@ def build_nexusboard(
     team_my_players = {}   # team -> [player names on my roster]
     team_top_fa     = {}   # team -> [(name, score), ...]
 
-    if yahoo_df is not None and not yahoo_df.empty and evaluated_df is not None and not evaluated_df.empty:
-        merged = pd.merge(
-            yahoo_df[['name', 'Status', 'Is_Mine', 'match_key']],
-            evaluated_df[['Player', 'Team', 'NexusScore', 'match_key']],
-            on='match_key', how='inner'
-        )
+    if league_overlay is not None and not league_overlay.empty:
+        # Skaters only — goalies don't ride the skater schedule value
+        merged = slice_overlay(league_overlay, scored=True)
+        if 'Pos' in merged.columns:
+            merged = merged[merged['Pos'] != 'G']
 
         # My players per team
         mine = merged[merged['Is_Mine'] == True]
-        for _, row in mine.iterrows():
-            t = row.get('Team', '')
+        for t, group in mine.groupby('Team'):
             if t:
-                team_my_players.setdefault(t, []).append(row['name'])
+                team_my_players[t] = group['name'].tolist()
 
         # Top FAs per team
         fa = merged[merged['Status'] == 'Free Agent'].sort_values('NexusScore', ascending=False)
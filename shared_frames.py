@@ -0,0 +1,70 @@
+"""
+shared_frames.py — Shared Read-Only Frames
+One in-process copy of each season / timeframe frame, served to every session.
+
+st.cache_data hands every session its own deserialized copy, so resident memory
+grows with the number of concurrent users. Frames cached with st.cache_resource
+are shared by reference instead, which is only safe if nobody can mutate them:
+freeze_frame() returns a FrozenFrame whose buffers are read-only and whose
+column-level setters raise. Copy-on-write is switched on so that anything
+derived from a shared frame (filters, .copy(deep=False), .assign) is a cheap
+lazy view that copies only the columns a tab actually writes.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    pd.set_option("mode.copy_on_write", True)
+except (KeyError, pd.errors.OptionError):
+    pass  # pandas 3+: copy-on-write is always on
+
+
+class SharedFrameMutationError(TypeError):
+    """Raised on any attempt to write into a frame shared across sessions."""
+
+
+def _refuse(*args, **kwargs):
+    raise SharedFrameMutationError(
+        "This DataFrame is shared read-only across sessions — derive a new frame "
+        "(df.assign(...), df.copy(deep=False)) instead of writing into it."
+    )
+
+
+class FrozenFrame(pd.DataFrame):
+    """
+    Read-only DataFrame. Every operation that returns a new frame
+    (filters, merges, sort_values, copy ...) returns a plain, writable DataFrame.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    __setitem__     = _refuse
+    __delitem__     = _refuse
+    insert          = _refuse
+    pop             = _refuse
+    _update_inplace = _refuse
+
+    def __setattr__(self, name, value):
+        # Block axis relabels and `df.GP = ...` column writes; pandas' private attributes pass through
+        if name in ('index', 'columns') and '_mgr' in self.__dict__:
+            _refuse()
+        if not name.startswith('_') and name in getattr(self, 'columns', ()):
+            _refuse()
+        super().__setattr__(name, value)
+
+
+def freeze_frame(df):
+    """
+    Returns a FrozenFrame over a private copy of `df` with read-only buffers,
+    so .loc / .iloc / .at writes fail loudly instead of corrupting the shared copy.
+    """
+    if df is None or isinstance(df, FrozenFrame):
+        return df
+    frozen = FrozenFrame(df.copy())
+    for arr in frozen._mgr.arrays:
+        if isinstance(arr, np.ndarray):
+            arr.flags.writeable = False
+    return frozen
@@ -0,0 +1,174 @@
+"""
+streaming_planner.py — Weekly Streaming Planner
+Plans the day-by-day add/drop sequence for my streaming spots over the rest of
+the fantasy week, under the league's weekly add limit.
+
+  1. My core lineup (everyone but the streaming spots) is set day by day with
+     lineup_optimizer; whatever slots it leaves empty are open to a streamer.
+  2. Per-day value of every candidate = value when his team plays and one of
+     his eligible slots is open that day, else 0 — one (players × days) matrix.
+     A goalie's value is scaled by his start share (gp_planner.goalie_start_shares):
+     he starts only part of his team's games.
+  3. Dynamic programming over days with state (adds used, player on the spot):
+         dp[a, p] = V[p, d] + max(dp[a, p]                 keep,
+                                   max_{q≠p} dp[a-1, q])    add p, drop whoever was there
+     Each day is one vectorized update, so 7 days × 100 FAs × 10 adds is instant.
+
+A dropped player cannot be picked back up (he goes to waivers): a plan that
+re-adds one is re-solved with him worth nothing after his first stint.
+One streaming spot is planned exactly; several spots are planned one after the
+other, each taking the slots, players and adds the previous ones left.
+"""
+
+import numpy as np
+import pandas as pd
+from config import DEFAULT_ROSTER_SLOTS
+from lineup_optimizer import optimize_week, eligible_slots
+
+
+def open_slots_by_day(core, days, schedule, slots=None):
+    """
+    Lineup slots my core roster leaves empty each day.
+
+    Returns:
+        DataFrame days × slot type with counts of open spots
+    """
+    slots = slots or DEFAULT_ROSTER_SLOTS
+    open_ = pd.DataFrame([dict(slots) for _ in days], index=days, dtype=int)
+    lineup, _ = optimize_week(core, days, schedule, slots)
+    if not lineup.empty:
+        used = lineup[lineup['Slot'] != 'BN'].groupby(['Day', 'Slot']).size().unstack(fill_value=0)
+        open_ = open_.sub(used.reindex(index=days, columns=open_.columns, fill_value=0))
+    return open_.clip(lower=0)
+
+
+def _plan_spot(V, max_adds, blocked):
+    """
+    Best keep/add sequence for one spot.
+
+    Args:
+        V:        (P, D) per-day values; row 0 is the incumbent on the spot
+        max_adds: adds available
+        blocked:  (P,) players that cannot be added (row 0, or used by another spot)
+
+    Returns:
+        (total value, [player index held each day], adds used)
+    """
+    P, D = V.shape
+    A = max_adds
+    dp = np.full((A + 1, P), -np.inf)
+    dp[0, 0] = 0.0
+    switched = np.zeros((D, A + 1, P), dtype=bool)
+    came_from = np.zeros((D, A + 1, P), dtype=int)
+    players = np.arange(P)
+
+    for d in range(D):
+        # Best previous holder q ≠ p for every p: the row's best, or its runner-up where p is the best
+        top2   = np.argsort(-dp, axis=1)[:, :2]
+        second = top2[:, 1] if P > 1 else top2[:, 0]
+        src    = np.where(players[None, :] == top2[:, :1], second[:, None], top2[:, :1])
+        src_v  = np.take_along_axis(dp, src, axis=1) if P > 1 else np.full_like(dp, -np.inf)
+        keep   = dp + V[:, d]
+        switch = np.full_like(dp, -np.inf)
+        switch[1:] = src_v[:-1] + V[:, d][None, :]
+        switch[:, blocked] = -np.inf
+        switched[d] = switch > keep
+        came_from[d, 1:] = src[:-1]
+        dp = np.where(switched[d], switch, keep)
+
+    a, p = np.unravel_index(np.argmax(dp), dp.shape)
+    total, adds = dp[a, p], int(a)
+    held = []
+    for d in range(D - 1, -1, -1):
+        held.append(p)
+        if switched[d, a, p]:
+            p, a = came_from[d, a, p], a - 1
+    return float(total), held[::-1], adds
+
+
+def _first_readd(held):
+    """(player row, day his first stint ended) for the first player held twice with a gap, else None."""
+    ended = {}
+    for d, k in enumerate(held):
+        if k in ended and ended[k] != d - 1:
+            return k, ended[k] + 1
+        ended[k] = d
+    return None
+
+
+def plan_streams(roster, fa, days, schedule, spots, max_adds, slots=None, value_col='NexusScore', mode='value',
+                 start_share=None):
+    """
+    Add/drop plan for the rest of the week.
+
+    Args:
+        roster:   my players (Player, Team, Pos, optional Eligible, value_col)
+        fa:       free agents, same columns
+        days:     date strings left in the fantasy week
+        schedule: get_nhl_schedule() dict
+        spots:    roster players whose spots may be streamed (dropped first time they're replaced)
+        max_adds: adds left this week
+        mode:     'value' (value_col per start) or 'games' (every start counts 1)
+        start_share: {Player: share of team games started} for goalies
+                     (goalie_start_shares); a goalie missing here starts every game
+
+    Returns:
+        (plan, summary) — plan: Day, Spot, Player, Action, Opp, Starts, Share
+        (expected starts, < 1 for a goalie); summary: {'starts', 'value', 'adds'}
+        totals for the streaming spots, counting expected starts
+    """
+    if roster.empty or not days or not spots:
+        return pd.DataFrame(), {'starts': 0, 'value': 0.0, 'adds': 0}
+    roster = roster.reset_index(drop=True)
+    fa     = fa.reset_index(drop=True)
+    core   = roster[~roster['Player'].isin(spots)]
+    open_  = open_slots_by_day(core, days, schedule, slots)
+
+    pool  = pd.concat([roster[roster['Player'].isin(spots)], fa], ignore_index=True)
+    raw   = pd.to_numeric(pool[value_col], errors='coerce').fillna(0).to_numpy(dtype=float)
+    value = np.ones(len(pool)) if mode == 'games' else raw - min(raw.min(), 0) + 0.1
+    plays = np.array([[team in (schedule or {}).get(d, {}) for d in days] for team in pool['Team']])
+    elig  = [eligible_slots(r) for r in pool.to_dict('records')]
+    share = start_share or {}
+    share = np.array([float(share.get(name, 1.0)) if e == {'G'} else 1.0 for name, e in zip(pool['Player'], elig)])
+
+    rows, used_players = [], set()
+    adds_left, total_starts, total_value, adds_used = max_adds, 0, 0.0, 0
+    for spot in spots:
+        inc = pool.index[pool['Player'] == spot][0]
+        # Row 0 = incumbent, then every FA not claimed by an earlier spot
+        cands = [inc] + [i for i in range(len(pool)) if pool.at[i, 'Player'] not in spots]
+        startable = np.array([[any(open_.at[d, s] > 0 for s in elig[i] if s in open_.columns) for d in days]
+                              for i in cands])
+        V = np.where(plays[cands] & startable, (value * share)[cands][:, None], 0.0)
+        blocked = np.array([k == 0 or cands[k] in used_players for k in range(len(cands))])
+
+        for _ in days:
+            _, held, spot_adds = _plan_spot(V, adds_left, blocked)
+            readd = _first_readd(held)
+            if readd is None:
+                break
+            V[readd[0], readd[1]:] = 0.0
+        adds_left -= spot_adds
+        adds_used += spot_adds
+
+        prev = 0
+        for d_i, day in enumerate(days):
+            k, i = held[d_i], cands[held[d_i]]
+            used_players.add(i)
+            starts = bool(V[k, d_i] > 0)
+            if starts:
+                slot = next(s for s in elig[i] if s in open_.columns and open_.at[day, s] > 0)
+                open_.at[day, slot] -= 1
+                total_starts += share[i]
+                total_value  += raw[i] * share[i]
+            action = f"Add (drop {pool.at[cands[prev], 'Player']})" if k != prev else ('Keep' if d_i else 'Hold')
+            team = pool.at[i, 'Team']
+            rows.append({
+                'Day': day, 'Spot': spot, 'Player': pool.at[i, 'Player'], 'Action': action,
+                'Opp': (schedule or {}).get(day, {}).get(team, '—'), 'Starts': starts,
+                'Share': round(float(share[i]), 2) if starts else 0.0,
+            })
+            prev = k
+
+    return pd.DataFrame(rows), {'starts': round(float(total_starts), 1), 'value': float(total_value), 'adds': adds_used}
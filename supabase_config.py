@@ -1,15 +1,38 @@
 import os
-from dotenv import load_dotenv, find_dotenv
-from supabase import create_client, Client
+import threading
 
-load_dotenv(find_dotenv(), override=True)
+_client      = None
+_initialized = False
+_init_lock   = threading.Lock()
 
-url = os.environ.get("SUPABASE_URL")
-key = os.environ.get("SUPABASE_KEY")
 
-if not url or not key:
-    print("❌ Error: Missing credentials.")
-    supabase = None
-else:
-    supabase: Client = create_client(url, key)
-    print(f"🚀 PuckNexus: Connection Initialized")
\ No newline at end of file
+def get_supabase():
+    """
+    Returns the shared Supabase client, creating it on first use.
+    The supabase package is slow to import, so nothing is loaded until a
+    cache read/write actually needs it. Returns None if credentials are missing.
+    """
+    global _client, _initialized
+    if _initialized:
+        return _client
+
+    with _init_lock:
+        if _initialized:
+            return _client
+
+        from dotenv import load_dotenv, find_dotenv
+        load_dotenv(find_dotenv(), override=True)
+
+        url = os.environ.get("SUPABASE_URL")
+        key = os.environ.get("SUPABASE_KEY")
+
+        if not url or not key:
+            print("❌ Error: Missing credentials.")
+            _client = None
+        else:
+            from supabase import create_client
+            _client = create_client(url, key)
+            print(f"🚀 PuckNexus: Connection Initialized")
+
+        _initialized = True
+        return _client
@@ -0,0 +1,161 @@
+"""
+swr_cache.py — Stale-While-Revalidate Snapshots
+Last good copy of each expensive NHL pull, served immediately while a
+background thread refreshes it.
+
+  - fresh snapshot        → returned as-is
+  - stale snapshot        → returned as-is, one background refresh started
+  - nothing in memory     → last good snapshot from disk (previous process), same as stale
+  - nothing anywhere      → the only case that blocks on the NHL API
+
+Snapshots are frozen (see shared_frames) and shared by every session.
+"""
+
+import os
+import glob
+import hashlib
+import threading
+import time
+import pandas as pd
+from shared_frames import freeze_frame
+
+
+SNAPSHOT_DIR       = os.environ.get("PUCKNEXUS_SNAPSHOT_DIR", ".snapshots")
+SNAPSHOT_RETENTION = 3 * 24 * 60 * 60   # seconds before an unused disk snapshot is pruned
+
+_lock       = threading.Lock()
+_key_locks  = {}     # key -> threading.Lock (one cold build per key)
+_entries    = {}     # key -> {'value', 'fetched_at', 'version'}
+_refreshing = set()  # keys with a background refresh in flight
+_version    = 0
+
+
+def _is_good(value):
+    """Empty pulls (API down, bad window) are never allowed to replace a good snapshot."""
+    if value is None:
+        return False
+    if isinstance(value, pd.DataFrame):
+        return not value.empty
+    if isinstance(value, dict):
+        if 'skaters' in value:
+            return value['skaters'] is not None and not value['skaters'].empty
+        return bool(value)
+    return True
+
+
+def _freeze(value):
+    if isinstance(value, pd.DataFrame):
+        return freeze_frame(value)
+    if isinstance(value, dict):
+        return {k: freeze_frame(v) if isinstance(v, pd.DataFrame) else v for k, v in value.items()}
+    return value
+
+
+def _disk_path(key):
+    return os.path.join(SNAPSHOT_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + '.pkl')
+
+
+def _load_disk(key):
+    try:
+        saved = pd.read_pickle(_disk_path(key))
+        if saved.get('key') == key and _is_good(saved.get('value')):
+            print(f"💾 Last good snapshot loaded from disk: {key}")
+            return saved
+    except Exception:
+        pass
+    return None
+
+
+def _save_disk(key, value, fetched_at):
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        pd.to_pickle({'key': key, 'value': value, 'fetched_at': fetched_at}, _disk_path(key))
+        cutoff = time.time() - SNAPSHOT_RETENTION
+        for path in glob.glob(os.path.join(SNAPSHOT_DIR, '*.pkl')):
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+    except Exception as e:
+        print(f"⚠️ Snapshot save failed: {e}")
+
+
+def _store(key, value, fetched_at=None, persist=True):
+    global _version
+    fetched_at = fetched_at or time.time()
+    with _lock:
+        _version += 1
+        entry = {'value': _freeze(value), 'fetched_at': fetched_at, 'version': _version}
+        _entries[key] = entry
+    if persist:
+        _save_disk(key, value, fetched_at)
+    return entry
+
+
+def _refresh_in_background(key, build_fn):
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            value = build_fn()
+            if _is_good(value):
+                _store(key, value)
+                print(f"🔄 Background refresh swapped in: {key}")
+        except Exception as e:
+            print(f"⚠️ Background refresh failed for {key}: {e}")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_swr(key, build_fn, max_age):
+    """
+    Returns the snapshot for `key` without waiting on the network whenever
+    any good copy exists; refreshes it in the background once older than `max_age` seconds.
+
+    Args:
+        key:      hashable, repr-stable cache key (tuple of strings / None)
+        build_fn: zero-arg callable doing the real pull
+        max_age:  seconds a snapshot counts as fresh
+    """
+    entry = _entries.get(key)
+    if entry is None:
+        with _lock:
+            key_lock = _key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = _entries.get(key)
+            if entry is None:
+                saved = _load_disk(key)
+                if saved is not None:
+                    entry = _store(key, saved['value'], saved['fetched_at'], persist=False)
+                else:
+                    # Cold with no snapshot anywhere — nothing to show, so block once
+                    value = build_fn()
+                    if not _is_good(value):
+                        return value
+                    return _store(key, value)['value']
+
+    if time.time() - entry['fetched_at'] >= max_age:
+        _refresh_in_background(key, build_fn)
+    return entry['value']
+
+
+def snapshot_status(keys):
+    """
+    Freshness summary for the snapshots a page rendered from.
+
+    Returns:
+        Dict with oldest fetched_at, whether any refresh is in flight, and
+        {key: version} so a caller can tell when new data was swapped in.
+    """
+    entries = {k: _entries[k] for k in keys if k in _entries}
+    if not entries:
+        return None
+    return {
+        'fetched_at': min(e['fetched_at'] for e in entries.values()),
+        'refreshing': any(k in _refreshing for k in entries),
+        'versions':   {k: e['version'] for k, e in entries.items()},
+    }
@@ -0,0 +1,63 @@
+"""
+sync_bench.py — League Sync Throughput Bench
+Runs the LeagueBridge sync that Yahoo's full pull and Sync All use in
+production (yahoo_bridge.YahooBridge) against FakeLeagueBridge leagues,
+offline, and reports wall time, requests and peak concurrency for each
+worker count. The knobs map to yahoo_bridge's FA_WORKERS (--workers),
+FA_PAGE_WAVE (--wave) and LEAGUE_SYNC_WORKERS (--league-workers).
+
+Usage:
+    python sync_bench.py                              # 20-team league, 800 FAs, 50 ms latency
+    python sync_bench.py --leagues 5 --latency 0.12 --workers 4 8 16 --league-workers 2
+"""
+
+import argparse
+import time
+from league_bridge import FakeLeagueBridge
+from yahoo_bridge import FA_PAGE_WAVE, FA_WORKERS, LEAGUE_SYNC_WORKERS
+
+
+def run(n_leagues, workers, wave, league_workers, **league_kw):
+    """One timed sync of `n_leagues` fake leagues; returns the measurements."""
+    bridge = FakeLeagueBridge(max_workers=workers, league_workers=league_workers, **league_kw)
+    bridge.fa_page_wave = wave
+    ids = [f"fake.l.{i}" for i in range(n_leagues)]
+    t0 = time.perf_counter()
+    snaps = bridge.sync_leagues(ids)
+    elapsed = time.perf_counter() - t0
+    players = sum(len(s['players']) for s in snaps.values() if s is not None)
+    return {
+        'elapsed':  elapsed,
+        'requests': bridge.stats['requests'],
+        'peak':     bridge.stats['peak_in_flight'],
+        'players':  players,
+        'failed':   sum(s is None for s in snaps.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PuckNexus league sync throughput (offline, fake leagues)")
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--roster', type=int, default=16, help="players per team")
+    parser.add_argument('--fa', type=int, default=800, help="free agents per league")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds per request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="± seconds per request")
+    parser.add_argument('--wave', type=int, default=FA_PAGE_WAVE, help="FA pages requested at once per position")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, FA_WORKERS, 20], help="requests in flight per league")
+    parser.add_argument('--league-workers', type=int, default=LEAGUE_SYNC_WORKERS, help="leagues synced at once")
+    args = parser.parse_args()
+
+    print(f"🏒 {args.leagues} × {args.teams}-team league(s), {args.fa} FAs, "
+          f"{args.latency * 1000:.0f} ms ± {args.jitter * 1000:.0f} ms per request")
+    for workers in args.workers:
+        r = run(args.leagues, workers, args.wave, args.league_workers, n_teams=args.teams, roster_size=args.roster,
+                fa_pool=args.fa, latency=args.latency, jitter=args.jitter)
+        rate = r['players'] / r['elapsed'] if r['elapsed'] else 0
+        print(f"   workers={workers:>3}  {r['elapsed']:6.2f}s  {r['requests']:>4} requests  "
+              f"peak {r['peak']:>3} in flight  {rate:8.0f} players/s"
+              + (f"  ❌ {r['failed']} failed" if r['failed'] else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import unicodedata
 from config import get_team_logo, get_headshot
+from league_overlay import slice_overlay, league_teams
 
 
 def render(tab, final, evaluated_df, evaluated_goalies, cats, g_cats,
@@ -13,9 +14,9 @@ def render(tab, final, evaluated_df, evaluated_goalies, cats, g_cats,
         if not evaluated_df.empty and not evaluated_goalies.empty:
             df = pd.concat([evaluated_df, evaluated_goalies], ignore_index=True)
         elif not evaluated_df.empty:
-            df = evaluated_df.copy()
+            df = evaluated_df.copy(deep=False)
         elif not evaluated_goalies.empty:
-            df = evaluated_goalies.copy()
+            df = evaluated_goalies.copy(deep=False)
         else:
             st.error("No data available.")
             return
@@ -46,20 +47,17 @@ def render(tab, final, evaluated_df, evaluated_goalies, cats, g_cats,
             return unicodedata.normalize('NFKD', str(name)).encode('ASCII', 'ignore').decode('utf-8').lower().strip()
 
         actual_num_teams = num_teams
+        overlay = st.session_state.get('league_overlay')
+        league_keys = set()
+        df['match_key'] = df['Player'].apply(clean_name)
         try:
-            if 'yahoo_data' in st.session_state:
-                y_data = st.session_state['yahoo_data'].copy()
-                y_data['match_key'] = y_data['name'].apply(clean_name)
-                actual_teams = y_data['Fantasy_Team'].nunique()
+            if overlay is not None and not overlay.empty:
+                actual_teams = len(league_teams(overlay))
                 if actual_teams > 0:
                     actual_num_teams = actual_teams
-                own_map = y_data[['match_key', 'Status', 'Is_Mine']].drop_duplicates('match_key')
-                def determine_own(row):
-                    if row.get('Is_Mine') == True: return "Mine"
-                    if row.get('Status') == 'Rostered': return "Taken"
-                    return "FA"
-                own_map['Own'] = own_map.apply(determine_own, axis=1)
-                df['match_key'] = df['Player'].apply(clean_name)
+                own_map = slice_overlay(overlay)[['name', 'Own']]
+                own_map = own_map.assign(match_key=own_map['name'].apply(clean_name)).drop_duplicates('match_key')
+                league_keys = set(own_map['match_key'])
                 df = pd.merge(df, own_map[['match_key', 'Own']], on='match_key', how='left')
                 df['Own'] = df['Own'].fillna("FA")
             else:
@@ -69,15 +67,14 @@ def render(tab, final, evaluated_df, evaluated_goalies, cats, g_cats,
 
         st.markdown("### 🎯 Unified Player Value Dashboard")
 
-        if 'yahoo_data' in st.session_state:
+        if overlay is not None:
             view_mode = st.radio("View", ["🏒 League Pool", "🌐 Full NHL"], horizontal=True, label_visibility="collapsed")
         else:
             view_mode = "🌐 Full NHL"
             st.caption("💡 Sync your Yahoo/ESPN league to enable League Pool view.")
 
-        if view_mode == "🏒 League Pool" and 'yahoo_data' in st.session_state:
-            league_players = st.session_state['yahoo_data']['name'].str.lower().str.strip().tolist()
-            df = df[df['Player'].str.lower().str.strip().isin(league_players)]
+        if view_mode == "🏒 League Pool" and overlay is not None:
+            df = df[df['match_key'].isin(league_keys)]
 
         st.caption(f"Players sorted by **NexusScore**. 🟩 = Your Roster | ⬛ = Taken | Blank = Free Agent. (Separator lines every {actual_num_teams} players).")
 
@@ -88,7 +85,7 @@ def render(tab, final, evaluated_df, evaluated_goalies, cats, g_cats,
         if 'Team' in df.columns: df['Logo'] = df['Team'].apply(get_team_logo)
         if 'playerId' in df.columns: df['Headshot'] = df.apply(get_headshot, axis=1)
 
-        display_df = df.copy()
+        display_df = df.copy(deep=False)
         display_df['Rank'] = range(1, len(display_df) + 1)
         if 'Team' in display_df.columns:
             display_df = display_df.rename(columns={'Team': 'NHL Team'})
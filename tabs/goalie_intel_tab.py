@@ -1,8 +1,24 @@
 import streamlit as st
+from datetime import datetime
 from goalie_intel import (
-    get_todays_goalies, calculate_sos_score,
+    fill_rotation_projections, calculate_sos_score,
     get_goalie_streaming_ranks, GOALIE_RESOURCES
 )
+from goalie_poller import get_goalie_status, goalie_status_version, request_goalie_poll
+from league_overlay import slice_overlay
+
+
+GOALIE_WATCH_SECONDS = 20   # how often an open tab checks the shared store for a new version
+
+
+def _watch_goalie_status(rendered_version):
+    """Reruns the page as soon as the shared poller publishes a goalie change."""
+    @st.fragment(run_every=GOALIE_WATCH_SECONDS)
+    def goalie_watch():
+        if goalie_status_version() != rendered_version:
+            st.rerun()
+
+    goalie_watch()
 
 
 def render(tab, g_df_global):
@@ -22,14 +38,28 @@ def render(tab, g_df_global):
 
             with col_l:
                 st.subheader("🏒 Tonight's Starters")
-                if st.button("🔄 Refresh Goalie Status", use_container_width=True):
-                    st.session_state['today_goalies'] = get_todays_goalies(season_goalie_df=g_df_global)
+                status = get_goalie_status()
+                tg = fill_rotation_projections(status['goalies'], status['games'], g_df_global,
+                                               status['played_yesterday'])
 
-                if 'today_goalies' not in st.session_state:
-                    with st.spinner("Loading tonight's goalies..."):
-                        st.session_state['today_goalies'] = get_todays_goalies(season_goalie_df=g_df_global)
-
-                tg = st.session_state['today_goalies']
+                if not status['version']:
+                    st.caption("📡 Checking tonight's goalies… the table appears as soon as the first check lands.")
+                else:
+                    polled = datetime.fromtimestamp(status['polled_at']).strftime('%H:%M')
+                    upcoming = datetime.fromtimestamp(status['next_poll_at']).strftime('%H:%M')
+                    st.caption(f"📡 Shared goalie feed checked {polled} · next check {upcoming} "
+                               f"(more often as puck drop nears)")
+                if st.button("🔄 Check Goalie Status Now", use_container_width=True):
+                    request_goalie_poll()
+                    st.toast("Goalie check requested — the table updates when anything changes.")
+                _watch_goalie_status(status['version'])
+
+                if status['changes']:
+                    with st.expander(f"🆕 Recent goalie changes ({len(status['changes'])})"):
+                        for c in status['changes'][:10]:
+                            at = datetime.fromtimestamp(c['at']).strftime('%H:%M')
+                            was = f"{c['From']} → " if c['From'] else ""
+                            st.markdown(f"`{at}` **{c['Team']}** vs {c['Opponent']}: {was}**{c['To']}** ({c['Status']})")
 
                 if not tg.empty:
                     n_confirmed = len(tg[tg['Status'] == 'Confirmed'])
@@ -56,7 +86,7 @@ def render(tab, g_df_global):
                         )
                     st.dataframe(tg_d.style.applymap(status_color, subset=['Status']),
                                  hide_index=True, use_container_width=True)
-                else:
+                elif status['version']:
                     st.info("No games today or goalie data unavailable.")
 
             with col_r:
@@ -83,13 +113,9 @@ def render(tab, g_df_global):
             st.caption("Best free-agent streaming options: SV% (60%) + win rate (40%).")
 
             if not g_df_global.empty:
-                if 'yahoo_data' in st.session_state:
-                    yahoo_d = st.session_state['yahoo_data']
-                    fa_names = set(
-                        yahoo_d[yahoo_d['Status'] == 'Free Agent']['match_key'].tolist()
-                    ) if 'match_key' in yahoo_d.columns else set(
-                        yahoo_d[yahoo_d['Status'] == 'Free Agent']['name'].str.lower().str.strip().tolist()
-                    )
+                overlay = st.session_state.get('league_overlay')
+                if overlay is not None:
+                    fa_names = set(slice_overlay(overlay, status='Free Agent')['match_key'])
                     fa_goalies = g_df_global[g_df_global['Player'].str.lower().str.strip().isin(fa_names)]
                     if fa_goalies.empty:
                         st.caption("⚠️ No free agent goalies found — showing all.")
@@ -1,153 +1,165 @@
 import streamlit as st
 import pandas as pd
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from data_fetcher import get_nhl_skater_stats, get_nhl_goalie_stats, get_nhl_schedule, get_fantasy_weeks
 from config import DEFAULT_G_CATS
+from league_overlay import slice_overlay, league_teams, my_team_name
+from matchup_engine import (remaining_games_by_team, project_matchup, category_winners,
+                            simulate_matchup, DEFAULT_SIMS, RATE_STATS)
+from live_scoring import (start_live_week, poll_live_week, live_totals,
+                          LIVE_POLL_SECONDS, LIVE_STATES, FINAL_STATES)
+
+
+def project_week(overlay, s_df_global, g_df_global, cats, weights, calc_season, teams=None):
+    """
+    Current-week category totals for fantasy teams: stats so far this week plus
+    the projection for every remaining NHL game.
+
+    Args:
+        overlay: league overlay (see league_overlay)
+        teams:   fantasy teams to project (None = every team in the league)
+
+    Returns:
+        (totals, all_cats, week) — project_matchup() output, the active categories,
+        and the week's inputs: 'start' / 'end' / 'current_end' / 'today' date strings,
+        'rosters', 'proj_df', 'rem_games' and 'id_map' ({playerId: match_key})
+    """
+    # 1. DATE LOGIC
+    today_date    = date.today()
+    yesterday_str = str(today_date - timedelta(days=1))
+    today_str     = str(today_date)
+    weeks         = get_fantasy_weeks()
+    current_week  = next((w for w in weeks if w['start'] <= today_date <= w['end']), weeks[0])
+    start_str     = str(current_week['start'])
+    end_str       = str(current_week['end'])
+    cw_end_str    = today_str if yesterday_str < start_str else yesterday_str
+
+    active_cats   = [c for c in cats if weights[c] > 0]
+    available_g   = [c for c in ['W', 'GAA', 'SV%', 'SHO'] if c in g_df_global.columns]
+    active_g_cats = [c for c in available_g if weights.get(c, 1.0) > 0] or available_g
+
+    # 2. CURRENT WEEK STATS
+    cw_df   = get_nhl_skater_stats(calc_season, start_date=start_str, end_date=cw_end_str)
+    g_cw_df = get_nhl_goalie_stats(calc_season, start_date=start_str, end_date=cw_end_str)
+    current_df = pd.concat(
+        [df.assign(match_key=df['Player'].str.lower().str.strip()) for df in (cw_df, g_cw_df) if not df.empty]
+        or [pd.DataFrame(columns=['match_key'])],
+        ignore_index=True,
+    )
+
+    # 3. PROJECTIONS (skater + goalie sources, one frame)
+    proj_df = pd.concat(
+        [df.assign(match_key=df['Player'].str.lower().str.strip()) for df in (s_df_global, g_df_global) if not df.empty]
+        or [pd.DataFrame(columns=['match_key', 'Team', 'GP'])],
+        ignore_index=True,
+    )
+
+    # 4. REMAINING SCHEDULE (one pass over the schedule)
+    rem_games = remaining_games_by_team(get_nhl_schedule(today_str), today_str, end_str)
+
+    # 5. PROJECT
+    all_cats = active_cats + active_g_cats
+    rosters  = slice_overlay(overlay, status='Rostered')[['Fantasy_Team', 'match_key']]
+    if teams is not None:
+        rosters = rosters[rosters['Fantasy_Team'].isin(teams)]
+    totals = project_matchup(rosters, current_df, proj_df, rem_games, all_cats, teams=teams)
+    id_map = {}
+    for df in (proj_df, current_df):
+        if 'playerId' in df.columns:
+            id_map.update(zip(pd.to_numeric(df['playerId'], errors='coerce'), df['match_key']))
+
+    week = {
+        'start': start_str, 'end': end_str, 'current_end': cw_end_str, 'today': today_str,
+        'rosters': rosters, 'proj_df': proj_df, 'rem_games': rem_games, 'id_map': id_map,
+    }
+    return totals, all_cats, week
+
+
+def _format_rates(styler, df, cols):
+    """GAA / SV% rows need three decimals in tables formatted for counting stats."""
+    rate_rows = df.index[df['Category'].isin(list(RATE_STATS))]
+    return styler.format("{:.3f}", subset=pd.IndexSlice[rate_rows, cols], na_rep="-")
+
+
+@st.fragment(run_every=LIVE_POLL_SECONDS)
+def render_live_matchup(state, team_a, team_b):
+    """Polls in-progress box scores and redraws the live score for the followed matchup."""
+    state, games = poll_live_week(state)
+    totals = live_totals(state)
+    winners, a_wins, b_wins, ties = category_winners(totals['final'][totals['cats']], team_a, team_b)
+
+    in_progress = sum(g['game_state'] in LIVE_STATES for g in games)
+    finished    = sum(g['game_state'] in FINAL_STATES for g in games)
+    st.subheader("📡 Live Matchup")
+    st.caption(f"{in_progress} games in progress, {finished} final tonight · "
+               f"updated {datetime.now().strftime('%H:%M:%S')}")
+
+    cats  = totals['cats']
+    table = pd.DataFrame({
+        'Category':          cats,
+        f"{team_a} (now)":   totals['current'].loc[team_a, cats].values,
+        f"{team_b} (now)":   totals['current'].loc[team_b, cats].values,
+        f"{team_a} (final)": totals['final'].loc[team_a, cats].values,
+        f"{team_b} (final)": totals['final'].loc[team_b, cats].values,
+        'Winner':            winners.reindex(cats).values,
+    })
+    st.metric("Projected final", f"{a_wins} - {b_wins} - {ties}")
+    num_cols = [c for c in table.columns if c not in ('Category', 'Winner')]
+    st.dataframe(_format_rates(table.style.format({c: "{:.1f}" for c in num_cols}), table, num_cols),
+                 use_container_width=True, hide_index=True)
 
 
 def render(tab, s_df_global, g_df_global, cats, g_cats, weights, calc_season, timeframe, projection_mode="Season Stats"):
     with tab:
         st.header("⚔️ H2H Matchup Simulator")
         try:
-            if 'yahoo_data' not in st.session_state:
+            overlay = st.session_state.get('league_overlay')
+            if overlay is None:
                 st.info("Sync your Yahoo or ESPN league in the Control Center above.")
                 return
 
-            yahoo_df = st.session_state['yahoo_data']
-            yahoo_df['match_key'] = yahoo_df['name'].str.lower().str.strip()
-
-            my_team_name = (
-                yahoo_df[yahoo_df['Is_Mine'] == True]['Fantasy_Team'].iloc[0]
-                if 'Is_Mine' in yahoo_df.columns and not yahoo_df[yahoo_df['Is_Mine'] == True].empty
-                else None
-            )
-
-            teams = sorted(yahoo_df['Fantasy_Team'].dropna().unique())
+            my_team = my_team_name(overlay)
+            teams   = league_teams(overlay)
 
             if len(teams) < 2:
                 st.info("Not enough teams found. Ensure you have run the sync.")
                 return
 
             col1, col2 = st.columns(2)
-            default_idx_a = teams.index(my_team_name) if my_team_name and my_team_name in teams else 0
+            default_idx_a = teams.index(my_team) if my_team and my_team in teams else 0
             default_idx_b = 1 if default_idx_a == 0 else 0
 
             with col1: team_a = st.selectbox("Team A", teams, index=default_idx_a)
             with col2: team_b = st.selectbox("Team B", teams, index=default_idx_b)
 
+            col_sim, col_live = st.columns(2)
+            with col_sim:
+                run_sims = st.toggle("🎲 Monte Carlo win probabilities", value=True,
+                                     help=f"Simulates the rest of the week {DEFAULT_SIMS:,} times.")
+            with col_live:
+                live_mode = st.toggle("📡 Live scoring", value=False,
+                                      help=f"Adds tonight's games from NHL box scores, refreshed every {LIVE_POLL_SECONDS}s.")
+
             if st.button("🔮 Run Live Matchup Engine", use_container_width=True):
                 with st.spinner(f"Crunching live weekly stats based on {timeframe} trends..."):
 
-                    # 1. DATE LOGIC
-                    today_date   = date.today()
-                    yesterday_str = str(today_date - timedelta(days=1))
-                    today_str    = str(today_date)
-                    weeks        = get_fantasy_weeks()
-                    current_week = next((w for w in weeks if w['start'] <= today_date <= w['end']), weeks[0])
-                    start_str    = str(current_week['start'])
-                    end_str      = str(current_week['end'])
-                    cw_end_str   = today_str if yesterday_str < start_str else yesterday_str
-
-                    active_cats   = [c for c in cats if weights[c] > 0]
-                    available_g   = [c for c in ['W', 'GAA', 'SV%', 'SHO'] if c in g_df_global.columns]
-                    active_g_cats = [c for c in available_g if weights.get(c, 1.0) > 0] or available_g
-
-                    # 2. CURRENT WEEK STATS
-                    cw_df = get_nhl_skater_stats(calc_season, start_date=start_str, end_date=cw_end_str)
-                    if not cw_df.empty:
-                        cw_df['match_key'] = cw_df['Player'].str.lower().str.strip()
-                    else:
-                        cw_df = pd.DataFrame(columns=['match_key'] + active_cats)
-
-                    g_cw_df = get_nhl_goalie_stats(calc_season, start_date=start_str, end_date=cw_end_str)
-                    if not g_cw_df.empty:
-                        g_cw_df['match_key'] = g_cw_df['Player'].str.lower().str.strip()
-
-                    # 3. PROJECTIONS
-                    proj_df = s_df_global.copy()
-                    proj_df['match_key'] = proj_df['Player'].str.lower().str.strip()
-                    for c in active_cats:
-                        if c in proj_df.columns:
-                            proj_df[c] = pd.to_numeric(proj_df[c], errors='coerce').fillna(0)
-                            proj_df[f"{c}_pg"] = proj_df[c] / proj_df['GP'].clip(lower=1)
-                        else:
-                            proj_df[f"{c}_pg"] = 0.0
-
-                    g_proj_df = g_df_global.copy()
-                    g_proj_df['match_key'] = g_proj_df['Player'].str.lower().str.strip()
-                    for c in active_g_cats:
-                        if c in g_proj_df.columns:
-                            g_proj_df[c] = pd.to_numeric(g_proj_df[c], errors='coerce').fillna(0)
-                            g_proj_df[f"{c}_pg"] = g_proj_df[c] / g_proj_df['GP'].clip(lower=1)
-                        else:
-                            g_proj_df[f"{c}_pg"] = 0.0
-
-                    # 4. REMAINING SCHEDULE
-                    rem_sched = get_nhl_schedule(today_str)
-                    def get_rem_games(nhl_team):
-                        if not rem_sched: return 0
-                        return sum(1 for day, games in rem_sched.items() if today_str <= day <= end_str and nhl_team in games)
-
-                    proj_df['Rem_G']   = proj_df['Team'].apply(get_rem_games)
-                    g_proj_df['Rem_G'] = g_proj_df['Team'].apply(get_rem_games)
-
-                    # 5. ROSTER SPLITS
-                    roster_a = yahoo_df[(yahoo_df['Fantasy_Team'] == team_a) & (yahoo_df['Status'] == 'Rostered')]
-                    roster_b = yahoo_df[(yahoo_df['Fantasy_Team'] == team_b) & (yahoo_df['Status'] == 'Rostered')]
-
-                    # 6. SKATER TOTALS
-                    def merge_cw(roster, cw):
-                        return pd.merge(roster, cw, on='match_key', how='inner') if not cw.empty else pd.DataFrame()
-
-                    a_cw = merge_cw(roster_a, cw_df)
-                    b_cw = merge_cw(roster_b, cw_df)
-                    a_proj = pd.merge(roster_a, proj_df, on='match_key', how='inner')
-                    b_proj = pd.merge(roster_b, proj_df, on='match_key', how='inner')
-
-                    a_cur = {c: a_cw[c].sum() if c in a_cw.columns else 0 for c in active_cats}
-                    b_cur = {c: b_cw[c].sum() if c in b_cw.columns else 0 for c in active_cats}
-                    a_rem = {c: sum(r[f"{c}_pg"] * r['Rem_G'] for _, r in a_proj.iterrows()) for c in active_cats}
-                    b_rem = {c: sum(r[f"{c}_pg"] * r['Rem_G'] for _, r in b_proj.iterrows()) for c in active_cats}
-
-                    # 7. GOALIE TOTALS
-                    a_gcw  = merge_cw(roster_a, g_cw_df)
-                    b_gcw  = merge_cw(roster_b, g_cw_df)
-                    a_gproj = pd.merge(roster_a, g_proj_df, on='match_key', how='inner')
-                    b_gproj = pd.merge(roster_b, g_proj_df, on='match_key', how='inner')
-
-                    a_cur_g = {c: a_gcw[c].sum() if c in a_gcw.columns else 0 for c in active_g_cats}
-                    b_cur_g = {c: b_gcw[c].sum() if c in b_gcw.columns else 0 for c in active_g_cats}
-                    a_rem_g = {c: sum(r[f"{c}_pg"] * r['Rem_G'] for _, r in a_gproj.iterrows()) for c in active_g_cats}
-                    b_rem_g = {c: sum(r[f"{c}_pg"] * r['Rem_G'] for _, r in b_gproj.iterrows()) for c in active_g_cats}
-
-                    # 8. COMPILE
-                    current_data, rem_data, final_data = [], [], []
-                    a_wins, b_wins, ties = 0, 0, 0
-
-                    for c in active_cats:
-                        a_tot = a_cur[c] + a_rem[c]
-                        b_tot = b_cur[c] + b_rem[c]
-                        current_data.append({'Category': c, team_a: a_cur[c], team_b: b_cur[c]})
-                        rem_data.append({'Category': c, team_a: a_rem[c], team_b: b_rem[c]})
-                        if a_tot > b_tot:   winner, a_wins = team_a, a_wins + 1
-                        elif b_tot > a_tot: winner, b_wins = team_b, b_wins + 1
-                        else:               winner, ties   = "Tie", ties + 1
-                        final_data.append({'Category': c, team_a: a_tot, team_b: b_tot, 'Winner': winner})
-
-                    for c in active_g_cats:
-                        a_tot = a_cur_g.get(c, 0) + a_rem_g.get(c, 0)
-                        b_tot = b_cur_g.get(c, 0) + b_rem_g.get(c, 0)
-                        current_data.append({'Category': c, team_a: a_cur_g.get(c, 0), team_b: b_cur_g.get(c, 0)})
-                        rem_data.append({'Category': c, team_a: a_rem_g.get(c, 0), team_b: b_rem_g.get(c, 0)})
-                        if c == 'GAA':
-                            if a_tot < b_tot:   winner, a_wins = team_a, a_wins + 1
-                            elif b_tot < a_tot: winner, b_wins = team_b, b_wins + 1
-                            else:               winner, ties   = "Tie", ties + 1
-                        else:
-                            if a_tot > b_tot:   winner, a_wins = team_a, a_wins + 1
-                            elif b_tot > a_tot: winner, b_wins = team_b, b_wins + 1
-                            else:               winner, ties   = "Tie", ties + 1
-                        final_data.append({'Category': c, team_a: a_tot, team_b: b_tot, 'Winner': winner})
+                    totals, all_cats, week = project_week(
+                        overlay, s_df_global, g_df_global, cats, weights, calc_season, teams=[team_a, team_b])
+                    start_str, end_str, cw_end_str = week['start'], week['end'], week['current_end']
+                    if live_mode:
+                        st.session_state['live_matchup'] = {
+                            'teams': (team_a, team_b),
+                            'state': start_live_week(totals, week, week['id_map']),
+                        }
+                    winners, a_wins, b_wins, ties = category_winners(totals['final'][totals['cats']], team_a, team_b)
+
+                    def as_table(frame):
+                        table = frame.loc[[team_a, team_b], all_cats].T
+                        return table.rename_axis('Category').reset_index()
+
+                    current_data = as_table(totals['current'])
+                    rem_data     = as_table(totals['remaining'])
+                    final_data   = as_table(totals['final']).assign(Winner=winners.reindex(all_cats).values)
 
                     # 9. UI
                     color = '#00CC96' if a_wins > b_wins else ('#FF914D' if a_wins == b_wins else '#FF4B4B')
@@ -169,7 +181,7 @@ def render(tab, s_df_global, g_df_global, cats, g_cats, weights, calc_season, ti
                         else:
                             st.dataframe(
                                 df_cur.style.highlight_max(subset=[team_a, team_b], color='#2e7b50', axis=1)
-                                .format({team_a: "{:.0f}", team_b: "{:.0f}"}),
+                                .format({team_a: "{:.0f}", team_b: "{:.0f}"}).pipe(_format_rates, df_cur, [team_a, team_b]),
                                 use_container_width=True, hide_index=True
                             )
                     with col_rem:
@@ -178,7 +190,7 @@ def render(tab, s_df_global, g_df_global, cats, g_cats, weights, calc_season, ti
                         df_rem = pd.DataFrame(rem_data)
                         st.dataframe(
                             df_rem.style.highlight_max(subset=[team_a, team_b], color='#2e7b50', axis=1)
-                            .format({team_a: "{:.1f}", team_b: "{:.1f}"}),
+                            .format({team_a: "{:.1f}", team_b: "{:.1f}"}).pipe(_format_rates, df_rem, [team_a, team_b]),
                             use_container_width=True, hide_index=True
                         )
 
@@ -187,10 +199,40 @@ def render(tab, s_df_global, g_df_global, cats, g_cats, weights, calc_season, ti
                     df_final = pd.DataFrame(final_data)
                     st.dataframe(
                         df_final.style.highlight_max(subset=[team_a, team_b], color='#2e7b50', axis=1)
-                        .format({team_a: "{:.1f}", team_b: "{:.1f}"}),
+                        .format({team_a: "{:.1f}", team_b: "{:.1f}"}).pipe(_format_rates, df_final, [team_a, team_b]),
                         use_container_width=True, hide_index=True
                     )
 
+                    # 10. MONTE CARLO
+                    if run_sims and team_a != team_b:
+                        sim = simulate_matchup(totals, team_a, team_b)
+                        outcome = sim['outcome']
+                        st.subheader("🎲 Simulated Outcome")
+                        st.caption(f"{DEFAULT_SIMS:,} simulated weeks: current score + Poisson draws of every rostered player's remaining games.")
+                        m1, m2, m3 = st.columns(3)
+                        m1.metric(f"{team_a} wins", f"{outcome['win']:.0%}")
+                        m2.metric("Tie", f"{outcome['tie']:.0%}")
+                        m3.metric(f"{team_b} wins", f"{outcome['loss']:.0%}")
+
+                        col_cat, col_score = st.columns([2, 1])
+                        with col_cat:
+                            df_prob = sim['categories'].rename(columns={'win_a': team_a, 'tie': 'Tie', 'win_b': team_b}).reset_index()
+                            st.dataframe(
+                                df_prob.style.highlight_max(subset=[team_a, team_b], color='#2e7b50', axis=1)
+                                .format({team_a: "{:.0%}", 'Tie': "{:.0%}", team_b: "{:.0%}"}),
+                                use_container_width=True, hide_index=True
+                            )
+                        with col_score:
+                            df_scores = sim['scores'].head(8).rename_axis('Score (W-L-T)').reset_index()
+                            st.dataframe(df_scores.style.format({'Probability': "{:.1%}"}),
+                                         use_container_width=True, hide_index=True)
+
+            # 11. LIVE SCORING (survives reruns until the teams change)
+            live = st.session_state.get('live_matchup')
+            if (live_mode and live and live['teams'] == (team_a, team_b)
+                    and live['state']['week']['today'] == str(date.today())):
+                render_live_matchup(live['state'], team_a, team_b)
+
         except Exception as e:
             st.warning(f"⚠️ Error in matchup simulator: {e}")
             import traceback; st.code(traceback.format_exc())
@@ -16,7 +16,7 @@ def render(tab, evaluated_df, g_df_global, cats, weights, season):
             "and top free agents — all in one view."
         )
 
-        yahoo_df = st.session_state.get('yahoo_data', None)
+        overlay = st.session_state.get('league_overlay', None)
 
         # ── Controls ──────────────────────────────────────────────────────────
         ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([2, 2, 2, 2])
@@ -46,7 +46,7 @@ def render(tab, evaluated_df, g_df_global, cats, weights, season):
                     week_label   = week_choice,
                     evaluated_df = evaluated_df,
                     g_df_global  = g_df_global,
-                    yahoo_df     = yahoo_df,
+                    league_overlay = overlay,
                     weights      = weights,
                     cats         = cats,
                     season       = season,
@@ -200,7 +200,7 @@ def render(tab, evaluated_df, g_df_global, cats, weights, season):
         )
 
         # ── No sync warning ───────────────────────────────────────────────────
-        if yahoo_df is None:
+        if overlay is None:
             st.info(
                 "💡 Sync your Yahoo or ESPN league to see **My Players** "
                 "and **Top FAs** for each team."
@@ -1,39 +1,31 @@
 import streamlit as st
-import plotly.express as px
+from league_overlay import slice_overlay, league_teams
+from matchup_engine import all_play_matrix, schedule_adjusted_rankings
+from tabs.matchup import project_week
 
 
-def render(tab, evaluated_df, evaluated_goalies, cats, weights):
+def render(tab, evaluated_df, evaluated_goalies, cats, weights, s_df_global=None, g_df_global=None, calc_season=None):
     with tab:
         st.header("🏆 League Power Rankings")
         try:
-            if 'yahoo_data' not in st.session_state:
+            overlay = st.session_state.get('league_overlay')
+            if overlay is None:
                 st.info("Sync your Yahoo or ESPN league in the Control Center above.")
                 return
 
-            yahoo_df = st.session_state['yahoo_data']
-
             active_cats = [c for c in cats if weights[c] > 0]
             s_cat_cols  = [f"{c}V" for c in active_cats]
             g_cat_cols  = ['WV', 'GAAV', 'SV%V', 'SHOV']
 
-            s_cols = ['match_key', 'NexusScore'] + [c for c in s_cat_cols if c in evaluated_df.columns]
-            g_cols = ['match_key', 'NexusScore'] + [c for c in g_cat_cols if c in evaluated_goalies.columns]
-
-            skater_league = evaluated_df[s_cols].pipe(lambda d: d.merge(yahoo_df, on='match_key', how='inner')) \
-                if not evaluated_df.empty else None
-            goalie_league = evaluated_goalies[g_cols].pipe(lambda d: d.merge(yahoo_df, on='match_key', how='inner')) \
-                if not evaluated_goalies.empty else None
-
-            import pandas as pd
-            parts = [df for df in [skater_league, goalie_league] if df is not None]
-            if not parts:
+            rostered_df = slice_overlay(overlay, status='Rostered', scored=True)
+            if rostered_df.empty:
                 st.warning("No data to display.")
                 return
 
-            full_league_df = pd.concat(parts).fillna(0)
-            rostered_df    = full_league_df[full_league_df['Status'] == 'Rostered']
+            import plotly.express as px  # deferred: only needed once a league is synced
 
             all_cat_cols = [c for c in s_cat_cols + g_cat_cols if c in rostered_df.columns]
+            rostered_df  = rostered_df.fillna({c: 0 for c in ['NexusScore'] + all_cat_cols})
             team_power   = (
                 rostered_df.groupby(['Fantasy_Team', 'Manager'])[['NexusScore'] + all_cat_cols]
                 .sum().reset_index()
@@ -54,5 +46,31 @@ def render(tab, evaluated_df, evaluated_goalies, cats, weights):
             fig2.update_layout(height=600, barmode='relative', legend_title_text='Categories')
             st.plotly_chart(fig2, use_container_width=True)
 
+            if s_df_global is None or g_df_global is None:
+                return
+
+            st.divider()
+            st.subheader("📅 This Week's All-Play Matrix")
+            st.caption("Every team's projected week (current score + remaining NHL games) against every other team — "
+                       "expected category wins for the row team.")
+            if st.button("📅 Run All-Play Matrix", use_container_width=True):
+                with st.spinner("Projecting every team's week..."):
+                    totals, all_cats, week = project_week(
+                        overlay, s_df_global, g_df_global, cats, weights, calc_season, teams=league_teams(overlay))
+                    matrix   = all_play_matrix(totals['final'][all_cats])
+                    rankings = schedule_adjusted_rankings(matrix, len(all_cats))
+
+                st.caption(f"Fantasy week {week['start']} to {week['end']}.")
+                st.dataframe(
+                    rankings.rename_axis('Fantasy_Team').reset_index().style.format(
+                        {'Avg_Cat_Wins': "{:.2f}", 'All_Play_Pct': "{:.0%}"}),
+                    use_container_width=True, hide_index=True
+                )
+                fig3 = px.imshow(matrix.loc[rankings.index, rankings.index], text_auto='.1f',
+                                 color_continuous_scale='RdYlGn', zmin=0, zmax=len(all_cats),
+                                 labels={'x': 'Opponent', 'y': 'Team', 'color': 'Cat Wins'})
+                fig3.update_layout(height=600)
+                st.plotly_chart(fig3, use_container_width=True)
+
         except Exception as e:
             st.warning(f"⚠️ No league data found. Sync your league. ({e})")
@@ -1,11 +1,19 @@
 import streamlit as st
 import pandas as pd
 from datetime import date
-from data_fetcher import get_fantasy_weeks, get_nhl_schedule
-from config import get_team_logo, get_headshot
+from data_fetcher import get_fantasy_weeks, get_nhl_schedule, get_schedule_range, NHL_SEASON_END
+from config import get_team_logo, get_headshot, DEFAULT_ROSTER_SLOTS
+from league_overlay import slice_overlay, my_team_name
+from trade_engine import find_trades
+from lineup_optimizer import optimize_week
+from gp_planner import plan_season, default_gp_limits, goalie_start_shares
+from matchup_engine import RATE_STATS
+from swr_cache import get_swr
 
+SCHEDULE_MAX_AGE = 6 * 60 * 60
 
-def render(tab, final, cats, weights):
+
+def render(tab, final, g_df_global, cats, g_cats, weights):
     with tab:
         st.header("⚖️ WAR ROOM: Blockbuster Trade Machine")
 
@@ -83,6 +91,32 @@ def render(tab, final, cats, weights):
         else:
             st.info("Select at least one player for both teams to analyze the trade.")
 
+        st.divider()
+        st.header("🔎 TRADE FINDER")
+        overlay = st.session_state.get('league_overlay')
+        my_team = my_team_name(overlay) if overlay is not None else None
+        if my_team is None:
+            st.info("Sync your Yahoo or ESPN league in the Control Center above to search every roster for trades.")
+        else:
+            st.caption(f"1-for-1, 2-for-1 and 2-for-2 deals for **{my_team}** that raise both teams' "
+                       "expected category wins against the league.")
+            if st.button("🔎 Search League for Trades", use_container_width=True):
+                with st.spinner("Scoring every package against every roster..."):
+                    rostered = slice_overlay(overlay, status='Rostered', scored=True)
+                    active   = [c for c in cats + g_cats if weights.get(c, 0) > 0]
+                    cat_cols = [f"{c}V" for c in active if f"{c}V" in rostered.columns]
+                    deals    = find_trades(rostered, my_team, cat_cols,
+                                           cat_weights={f"{c}V": weights.get(c, 1.0) for c in active})
+                if deals.empty:
+                    st.warning("No mutually beneficial trades found.")
+                else:
+                    st.dataframe(
+                        deals.drop(columns='Fairness').style.format(
+                            {'Your_Gain': "{:+.2f}", 'Their_Gain': "{:+.2f}", 'Nexus_Change': "{:+.2f}"}),
+                        use_container_width=True, hide_index=True
+                    )
+                    st.caption("Gains are expected category wins per all-play week (both teams must gain).")
+
         st.divider()
         st.header("🚦 DAILY START / SIT OPTIMIZER")
         st.caption("Select players competing for your active roster spots tonight.")
@@ -112,3 +146,98 @@ def render(tab, final, cats, weights):
                 )
             else:
                 st.warning("None of the selected players have a game tonight.")
+
+        st.divider()
+        st.header("🗓️ WEEKLY LINEUP OPTIMIZER")
+        if my_team is None:
+            st.info("Sync your league to optimize your lineup for the rest of the week.")
+            return
+
+        today_date   = date.today()
+        weeks        = get_fantasy_weeks()
+        current_week = next((w for w in weeks if w['start'] <= today_date <= w['end']), weeks[0])
+        days = [str(d.date()) for d in pd.date_range(max(today_date, current_week['start']), current_week['end'])]
+        slots = st.session_state.get('league_roster_slots') or DEFAULT_ROSTER_SLOTS
+        mine = slice_overlay(overlay, mine=True, scored=True)
+        mine = mine.assign(Player=mine['Player'].fillna(mine['name'])) if 'Player' in mine.columns else mine.assign(Player=mine['name'])
+        if not days:
+            st.info("No days left in the current fantasy week.")
+        else:
+            st.caption(f"Best {', '.join(f'{n} {s}' for s, n in slots.items())} lineup for "
+                       f"**{my_team}**, {days[0]} to {days[-1]}, by NexusScore.")
+            if st.button("🗓️ Optimize Week", use_container_width=True):
+                with st.spinner("Solving each day's lineup..."):
+                    week_sched = get_swr(('schedule', days[0]), lambda: get_nhl_schedule(days[0]), SCHEDULE_MAX_AGE)
+                    lineup, summary = optimize_week(mine, days, week_sched or {}, slots)
+                st.session_state['weekly_lineup'] = {'key': (my_team, days[0]), 'lineup': lineup, 'summary': summary}
+
+            # Kept in the session so picking another day doesn't re-solve the week
+            saved = st.session_state.get('weekly_lineup')
+            if saved is not None and saved['key'] == (my_team, days[0]):
+                lineup, summary = saved['lineup'], saved['summary']
+                if lineup.empty:
+                    st.warning("None of your players have games left this week.")
+                else:
+                    benched = int((lineup['Slot'] == 'BN').sum())
+                    c_l, c_r = st.columns(2)
+                    c_l.metric("Starts this week", int((lineup['Slot'] != 'BN').sum()))
+                    c_r.metric("Games lost to the bench", benched)
+
+                    day_pick = st.selectbox("Day", list(dict.fromkeys(lineup['Day'])), key="lineup_day")
+                    st.dataframe(
+                        lineup[lineup['Day'] == day_pick].drop(columns='Day').style.format({'Value': "{:.2f}"}),
+                        use_container_width=True, hide_index=True
+                    )
+                    with st.expander("Weekly start counts"):
+                        st.dataframe(summary.style.format({'Value': "{:.2f}"}), use_container_width=True, hide_index=True)
+
+        st.divider()
+        st.header("📏 GAMES-PLAYED LIMIT PLANNER")
+        season_end = st.session_state.get('league_end_date') or str(NHL_SEASON_END)
+        season_days = [str(d.date()) for d in pd.date_range(today_date, season_end)]
+        if not season_days:
+            st.info("The season is over.")
+            return
+        st.caption(f"How **{my_team}** spends its capped games from {season_days[0]} to {season_days[-1]}: "
+                   "best starts first, each into the slot with the fewest games left.")
+
+        default_caps = default_gp_limits(slots)
+        caps = st.data_editor(
+            pd.DataFrame({'Slot': list(default_caps), 'Cap': list(default_caps.values()), 'Used': 0}),
+            disabled=['Slot'], hide_index=True, key="gp_caps",
+        )
+        st.caption("Cap 0 = no limit for that slot. Used = games already spent this season.")
+        goalie_min = st.number_input("Minimum goalie starts left", min_value=0, max_value=200, value=0, key="gp_goalie_min")
+
+        # Cleared editor cells come back as NaN
+        caps = caps.assign(Cap=pd.to_numeric(caps['Cap'], errors='coerce').fillna(0),
+                           Used=pd.to_numeric(caps['Used'], errors='coerce').fillna(0))
+
+        if not st.button("📏 Plan Remaining Season", use_container_width=True):
+            return
+        with st.spinner("Pulling the season schedule and planning every start..."):
+            season_sched = get_swr(('schedule', season_days[0], season_days[-1]),
+                                   lambda: get_schedule_range(season_days[0], season_days[-1]), SCHEDULE_MAX_AGE)
+            plan = plan_season(
+                mine, season_days, season_sched or {},
+                limits={r['Slot']: int(r['Cap']) for r in caps.to_dict('records') if r['Cap'] > 0},
+                used={r['Slot']: int(r['Used']) for r in caps.to_dict('records')},
+                slots=slots, cats=[c for c in cats + g_cats if weights.get(c, 0) > 0], goalie_min=int(goalie_min),
+                start_share=goalie_start_shares(g_df_global),
+            )
+        if plan['starts'].empty:
+            st.warning("No remaining games found for your roster.")
+            return
+
+        if plan['goalie_short']:
+            st.error(f"Projected {plan['goalie_short']} goalie starts short of the minimum — add a goalie.")
+        st.dataframe(plan['slots'], use_container_width=True, hide_index=True)
+        st.caption("Goalie starts are expected starts: each team game × the goalie's share of his team's starts.")
+        shown = plan['totals'][[c for c in plan['totals'].index if c in cats or c in g_cats]]
+        st.caption("Projected category totals from the planned starts (per-game rates × starts):")
+        st.dataframe(shown.to_frame("Projected").T.style.format(
+            {c: "{:.3f}" if c in RATE_STATS else "{:.0f}" for c in shown.index}), use_container_width=True)
+        with st.expander("Starts by player"):
+            st.dataframe(plan['players'], use_container_width=True, hide_index=True)
+        with st.expander("Start calendar"):
+            st.dataframe(plan['starts'], use_container_width=True, hide_index=True)
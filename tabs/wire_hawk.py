@@ -1,42 +1,41 @@
 import streamlit as st
 import pandas as pd
 from datetime import date, datetime
-from data_fetcher import get_fantasy_weeks, get_nhl_schedule
+from data_fetcher import get_fantasy_weeks, get_nhl_schedule, get_remaining_games_by_team, NHL_SEASON_END
 from config import get_team_logo, get_headshot
+from league_overlay import slice_overlay
+from swr_cache import get_swr
+from add_drop import add_drop_matrix, rank_add_drops
+from streaming_planner import plan_streams
+from gp_planner import goalie_start_shares
 
+REM_GAMES_MAX_AGE = 6 * 60 * 60   # the NHL schedule barely moves within a day
 
-def render(tab, final, cats, weights):
+
+def render(tab, final, g_df_global, cats, g_cats, weights):
     with tab:
         st.subheader("🦅 THE WIRE HAWK")
         st.caption("Cross-references your synced league against the PuckNexus calculation engine.")
 
-        if 'yahoo_data' not in st.session_state:
+        overlay = st.session_state.get('league_overlay')
+        if overlay is None:
             st.info("Sync your Yahoo or ESPN league in the Control Center above.")
             return
 
-        yahoo_df = st.session_state['yahoo_data']
-
         if final.empty:
             st.warning("No player data available.")
             return
 
         try:
-            wire_df = final.copy()
-            wire_df['match_key'] = wire_df['Player'].str.lower().str.strip()
-            y_data = yahoo_df.copy()
-            y_data['match_key'] = y_data['name'].str.lower().str.strip()
-
-            cols_to_use = [c for c in wire_df.columns if c not in y_data.columns or c == 'match_key']
-            merged = pd.merge(y_data, wire_df[cols_to_use], on='match_key', how='inner')
-            merged = merged.drop_duplicates(subset=['match_key'])
-
-            if 'Team' in merged.columns:   merged['Logo']     = merged['Team'].apply(get_team_logo)
-            if 'playerId' in merged.columns: merged['Headshot'] = merged.apply(get_headshot, axis=1)
+            fa  = slice_overlay(overlay, status='Free Agent', scored=True).sort_values('NexusScore', ascending=False)
+            ros = slice_overlay(overlay, mine=True, scored=True).sort_values('NexusScore', ascending=False)
 
-            fa  = merged[merged['Status'] == 'Free Agent'].sort_values('NexusScore', ascending=False)
-            ros = merged[merged['Is_Mine'] == True].sort_values('NexusScore', ascending=False) \
-                if 'Is_Mine' in merged.columns else \
-                merged[merged['Status'] == 'Rostered'].sort_values('NexusScore', ascending=False)
+            def with_images(part):
+                if part.empty: return part
+                if 'Team' in part.columns:     part = part.assign(Logo=part['Team'].apply(get_team_logo))
+                if 'playerId' in part.columns: part = part.assign(Headshot=part.apply(get_headshot, axis=1))
+                return part
+            fa, ros = with_images(fa), with_images(ros)
 
             # Remaining schedule
             today_date = date.today()
@@ -60,6 +59,7 @@ def render(tab, final, cats, weights):
 
             fa['Rem G']     = fa['Team'].map(team_rem_games).fillna(0).astype(int)
             fa['Off-Nights'] = fa['Team'].map(team_rem_off).fillna(0).astype(int)
+            ros['Rem G']    = ros['Team'].map(team_rem_games).fillna(0).astype(int) if 'Team' in ros.columns else 0
 
             # Advanced Scout
             active_cats = [c for c in cats if weights[c] > 0]
@@ -80,6 +80,69 @@ def render(tab, final, cats, weights):
                             </div>
                         """, unsafe_allow_html=True)
 
+            # Add/Drop matrix: every FA × every roster spot, this week and rest of season
+            st.divider()
+            st.subheader("🔁 Add / Drop Matrix")
+            ad_g_cats = [c for c in g_cats if weights.get(c, 0) > 0 and f"{c}V" in final.columns]
+            ad_cats   = active_cats + ad_g_cats
+            ad_fa     = fa[fa['NexusScore'].notna() & fa['Team'].notna()]
+            shares    = goalie_start_shares(g_df_global)
+            if ad_fa.empty or ros.empty or not ad_cats:
+                st.info("No scored free agents to compare against your roster.")
+            else:
+                horizon = st.radio("Rank by", ["This week", "Rest of season"], horizontal=True, key="add_drop_horizon")
+                # The season schedule crawl only runs once someone asks for the season view
+                season_games = None
+                if horizon == "Rest of season":
+                    season_end = st.session_state.get('league_end_date') or str(NHL_SEASON_END)
+                    with st.spinner("Pulling the rest of the season's schedule..."):
+                        season_games = get_swr(('rem_games', today_str, season_end),
+                                               lambda: get_remaining_games_by_team(today_str, season_end),
+                                               REM_GAMES_MAX_AGE) or {}
+                matrix = add_drop_matrix(ad_fa, ros, final, ad_cats, weights, team_rem_games, season_games, shares)
+                ranked = rank_add_drops(matrix, ad_fa, ros, ad_cats, by='week' if season_games is None else 'season')
+                gains  = [c for c in ('Week_Gain', 'Season_Gain') if c in ranked.columns]
+                st.caption("Change in your weighted category totals (league standard units) from making the swap, "
+                           "counting each player's remaining NHL games (goalies: expected starts).")
+                st.dataframe(
+                    ranked.style.format({c: "{:+.2f}" for c in gains})
+                    .background_gradient(cmap="RdYlGn", subset=gains),
+                    hide_index=True, use_container_width=True
+                )
+
+            # Streaming planner: day-by-day add/drop sequence under the weekly add limit
+            st.divider()
+            st.subheader("📆 Streaming Planner")
+            if ros.empty or ad_fa.empty:
+                st.info("Needs a synced roster and scored free agents.")
+            else:
+                named   = ros.assign(Player=ros['name'])
+                c_spots, c_adds, c_mode = st.columns([3, 1, 1])
+                with c_spots:
+                    spots = st.multiselect("Streaming spots (players you'd drop)", named['Player'].tolist(),
+                                           default=named['Player'].tail(1).tolist(), key="stream_spots")
+                with c_adds:
+                    max_adds = st.number_input("Adds left", min_value=0, max_value=14, value=4, key="stream_adds")
+                with c_mode:
+                    mode = st.radio("Maximize", ["Value", "Games"], key="stream_mode")
+                days = [str(d.date()) for d in pd.date_range(today_str, end_str)]
+                if not days:
+                    st.info("No days left in the current fantasy week.")
+                elif not spots:
+                    st.info("Pick at least one streaming spot.")
+                else:
+                    plan, summary = plan_streams(named, ad_fa.head(100).assign(Player=ad_fa['name']), days, rem_sched,
+                                                 spots, int(max_adds), slots=st.session_state.get('league_roster_slots'),
+                                                 mode=mode.lower(), start_share=shares)
+                    if plan.empty:
+                        st.info("No streaming starts found for the rest of the week.")
+                    else:
+                        m1, m2, m3 = st.columns(3)
+                        m1.metric("Streamer starts", summary['starts'])
+                        m2.metric("NexusScore started", f"{summary['value']:.2f}")
+                        m3.metric("Adds used", f"{summary['adds']} / {int(max_adds)}")
+                        st.dataframe(plan, hide_index=True, use_container_width=True)
+
             st.divider()
             heatmap_subset = ['NexusScore'] + cats
 
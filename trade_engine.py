@@ -0,0 +1,154 @@
+"""
+trade_engine.py — League-Wide Trade Search
+Enumerates 1-for-1, 2-for-1 and 2-for-2 trades between my roster and every
+other synced roster and scores them on both teams' category z-profiles.
+
+A team's value is its smooth all-play standing: for each category, the
+probability of beating every other team, given summed {cat}V profiles. It is
+non-linear, so the same players can be worth more to a team that is thin in
+their categories — that is what makes a deal mutually beneficial.
+
+Candidates for a partner are scored as one (my packages × their packages × cats)
+array. A Lipschitz bound on the gain prunes, before the exact scoring, every
+candidate that cannot beat the bar — min_gain for the partner, and for me the
+worst deal already in the top list (branch-and-bound across partners).
+"""
+
+from itertools import combinations
+import numpy as np
+import pandas as pd
+
+
+TRADE_SHAPES = [(1, 1), (2, 1), (2, 2)]   # (players I give, players I get)
+_LOGIT_SCALE = 1.702                       # logistic ≈ normal CDF at this scale
+
+
+def team_profiles(rostered, cat_cols):
+    """Fantasy_Team × cat_cols matrix of summed z-values."""
+    return rostered.groupby('Fantasy_Team')[cat_cols].sum()
+
+
+def _category_scale(profiles):
+    """Per-category spread of team profiles, used to turn profile gaps into win probabilities."""
+    spread = profiles.std(axis=0, ddof=0).to_numpy(dtype=float)
+    return np.where(spread > 1e-9, spread, 1.0)
+
+
+def _standing(team, others, head, scale, w):
+    """
+    Weighted expected category wins of `team` profiles against a fixed field plus one head-to-head opponent.
+
+    Args:
+        team:   (..., C) candidate profiles
+        others: (O, C) profiles of the rest of the league
+        head:   (..., C) the trade partner's profiles in the same candidates
+    """
+    z_field = (team[..., None, :] - others) / scale * _LOGIT_SCALE
+    z_head  = (team - head) / scale * _LOGIT_SCALE
+    field   = (1 / (1 + np.exp(-z_field))).sum(axis=-2)
+    return ((field + 1 / (1 + np.exp(-z_head))) * w).sum(axis=-1)
+
+
+def _packages(values, size):
+    """All `size`-player packages from a roster: (index tuples, summed (P, C) values)."""
+    idx = list(combinations(range(len(values)), size))
+    if not idx:
+        return [], np.empty((0, values.shape[1]))
+    return idx, values[np.array(idx)].sum(axis=1)
+
+
+def find_trades(rostered, my_team, cat_cols, cat_weights=None, min_gain=0.05, top_n=25, shapes=TRADE_SHAPES):
+    """
+    Best mutually beneficial trades between `my_team` and every other team.
+
+    Args:
+        rostered:    rostered players — Fantasy_Team, Player, NexusScore + cat_cols ({cat}V z-values)
+        my_team:     fantasy team name
+        cat_cols:    z-value columns that make up a team's profile
+        cat_weights: optional {col: weight}; defaults to 1.0
+        min_gain:    minimum expected-category-win gain each side must get
+        top_n:       number of deals returned
+
+    Returns:
+        DataFrame sorted best-first: Partner, Shape, You_Give, You_Get, Your_Gain,
+        Their_Gain, Nexus_Change (your summed NexusScore delta)
+    """
+    cat_cols = list(cat_cols)
+    rostered = rostered.fillna({c: 0 for c in cat_cols + ['NexusScore']})
+    profiles = team_profiles(rostered, cat_cols)
+    if my_team not in profiles.index or len(profiles) < 2:
+        return pd.DataFrame()
+
+    w     = np.array([(cat_weights or {}).get(c, 1.0) for c in cat_cols], dtype=float)
+    scale = _category_scale(profiles)
+    P     = profiles.to_numpy(dtype=float)
+    teams = list(profiles.index)
+    me    = teams.index(my_team)
+
+    # Max slope of the standing in one category: 1/4 per opponent (logistic) × scale factor;
+    # the head-to-head gap moves twice as fast since both profiles shift
+    n_field = len(teams) - 2
+    lip     = _LOGIT_SCALE / 4 * (n_field + 2) * w / scale
+
+    mine       = rostered[rostered['Fantasy_Team'] == my_team]
+    mine_v     = mine[cat_cols].to_numpy(dtype=float)
+    mine_pkgs  = {s: _packages(mine_v, s) for s in {g for g, _ in shapes}}
+    found      = []
+    bar        = min_gain   # my gain needed to enter the current top_n
+
+    for partner in teams:
+        if partner == my_team:
+            continue
+        pt     = teams.index(partner)
+        field  = np.delete(P, [me, pt], axis=0)
+        theirs = rostered[rostered['Fantasy_Team'] == partner]
+        th_v   = theirs[cat_cols].to_numpy(dtype=float)
+        th_pkgs = {s: _packages(th_v, s) for s in {r for _, r in shapes}}
+
+        base_me   = _standing(P[me], field, P[pt], scale, w)
+        base_them = _standing(P[pt], field, P[me], scale, w)
+
+        for give_n, get_n in shapes:
+            give_idx, give_sum = mine_pkgs[give_n]
+            get_idx,  get_sum  = th_pkgs[get_n]
+            if not give_idx or not get_idx:
+                continue
+
+            # (G, R, C) profile change for me; the partner moves by the opposite
+            delta = get_sum[None, :, :] - give_sum[:, None, :]
+
+            # Prune: a side can gain at most lip · (its positive category moves)
+            bound_me   = (np.clip(delta, 0, None) * lip).sum(axis=-1)
+            bound_them = (np.clip(-delta, 0, None) * lip).sum(axis=-1)
+            gi, ri = np.nonzero((bound_me >= bar) & (bound_them >= min_gain))
+            if gi.size == 0:
+                continue
+
+            d        = delta[gi, ri]
+            new_me   = P[me] + d
+            new_them = P[pt] - d
+            gain_me   = _standing(new_me, field, new_them, scale, w) - base_me
+            gain_them = _standing(new_them, field, new_me, scale, w) - base_them
+
+            keep = np.nonzero((gain_me >= bar) & (gain_them >= min_gain))[0]
+            keep = keep[np.argsort(-gain_me[keep])][:top_n]   # only these can make the final list
+            for k in keep:
+                g_rows = mine.iloc[list(give_idx[gi[k]])]
+                r_rows = theirs.iloc[list(get_idx[ri[k]])]
+                found.append({
+                    'Partner':      partner,
+                    'Shape':        f"{give_n}-for-{get_n}",
+                    'You_Give':     ", ".join(g_rows['Player']),
+                    'You_Get':      ", ".join(r_rows['Player']),
+                    'Your_Gain':    float(gain_me[k]),
+                    'Their_Gain':   float(gain_them[k]),
+                    'Nexus_Change': float(r_rows['NexusScore'].sum() - g_rows['NexusScore'].sum()),
+                })
+            if len(found) >= top_n:
+                bar = max(bar, sorted((f['Your_Gain'] for f in found), reverse=True)[top_n - 1])
+
+    if not found:
+        return pd.DataFrame()
+    deals = pd.DataFrame(found)
+    deals['Fairness'] = deals[['Your_Gain', 'Their_Gain']].min(axis=1)
+    return deals.sort_values(['Your_Gain', 'Fairness'], ascending=False).head(top_n).reset_index(drop=True)
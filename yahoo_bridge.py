@@ -1,13 +1,19 @@
-import os
-import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import date as date_type
 import requests
 import base64
 import pandas as pd
 import xml.etree.ElementTree as ET
-from yahoo_oauth import OAuth2
-import yahoo_fantasy_api as yfa
 import streamlit as st
+from league_bridge import LeagueBridge
+from league_cache import get_league_snapshot, peek_league_snapshot
+from swr_cache import get_swr
+
+# yahoo_oauth / yahoo_fantasy_api are imported on first use — they are slow to
+# import and most page loads never talk to Yahoo.
 
 def get_yahoo_auth_url():
     """Generates the secure Yahoo login URL."""
@@ -46,39 +52,107 @@ def exchange_code_for_token(auth_code):
         "token_type": "bearer"
     }
 
+# ── OAuth sessions ────────────────────────────────────────────────────────────
+# One live OAuth2 object per Yahoo user, held in process memory and shared by
+# every session of that user: tokens refresh in memory and the underlying
+# HTTP session (and its connection pool) is reused across calls.
+OAUTH_IDLE_TTL     = 24 * 60 * 60   # drop sessions unused for a day
+YAHOO_MAX_IN_FLIGHT = 8             # concurrent Yahoo requests per user
+YAHOO_MAX_RPS       = 20            # request starts per second per user
+
+_oauth_lock     = threading.Lock()
+_oauth_sessions = {}   # guid -> {'sc': OAuth2, 'lock': Lock, 'limiter': _UserLimiter, 'used': ts}
+
+class _UserLimiter:
+    """One user's share of the Yahoo API: at most N requests in flight, started at most R per second."""
+
+    def __init__(self, max_in_flight, rps):
+        self._slots    = threading.BoundedSemaphore(max_in_flight)
+        self._lock     = threading.Lock()
+        self._interval = 1.0 / rps
+        self._next     = 0.0
+
+    def __enter__(self):
+        self._slots.acquire()
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        self._slots.release()
+
+def _oauth_entry(token_data):
+    key = token_data.get('guid') or token_data['refresh_token']
+    now = time.time()
+    with _oauth_lock:
+        for k in [k for k, e in _oauth_sessions.items() if now - e['used'] > OAUTH_IDLE_TTL]:
+            del _oauth_sessions[k]
+        entry = _oauth_sessions.setdefault(key, {
+            'sc': None, 'lock': threading.Lock(), 'used': now,
+            'limiter': _UserLimiter(YAHOO_MAX_IN_FLIGHT, YAHOO_MAX_RPS),
+        })
+        entry['used'] = now
+        return entry
+
 def _get_yahoo_oauth_session():
-    """Silently builds the OAuth2 object using Streamlit's session memory."""
+    """Returns this user's OAuth2 object, refreshing the access token in memory when it expires."""
     if 'yahoo_token_data' not in st.session_state:
         raise Exception("User is not authenticated.")
-        
-    temp_oauth_file = 'temp_oauth.json'
-    with open(temp_oauth_file, 'w') as f:
-        json.dump(st.session_state['yahoo_token_data'], f)
-        
-    sc = OAuth2(None, None, from_file=temp_oauth_file)
-    
-    # If the token expired and refreshed itself, save the new one back to session memory!
-    with open(temp_oauth_file, 'r') as f:
-        current_tokens = json.load(f)
-    if current_tokens['access_token'] != st.session_state['yahoo_token_data']['access_token']:
-        st.session_state['yahoo_token_data'] = current_tokens
-        
-    return sc, temp_oauth_file
+
+    from yahoo_oauth import OAuth2
+
+    token_data = st.session_state['yahoo_token_data']
+    entry = _oauth_entry(token_data)
+    with entry['lock']:
+        sc = entry['sc']
+        if sc is None or token_data.get('token_time', 0) > sc.token_time:
+            # A newer login than the cached one wins; OAuth2 refreshes on build if already expired
+            fields = {k: token_data[k] for k in ('access_token', 'refresh_token', 'token_type', 'token_time', 'guid') if k in token_data}
+            sc = OAuth2(token_data['consumer_key'], token_data['consumer_secret'], store_file=False, **fields)
+            sc.limiter = entry['limiter']
+            entry['sc'] = sc
+        elif not sc.token_is_valid():
+            for k, v in sc.refresh_access_token().items():
+                setattr(sc, k, v)
+            sc.session = sc.oauth.get_session(token=sc.access_token)
+
+    # If the token refreshed, save the new one back to session memory
+    if sc.access_token != token_data['access_token']:
+        st.session_state['yahoo_token_data'] = {
+            **token_data, 'access_token': sc.access_token, 'refresh_token': sc.refresh_token, 'token_time': sc.token_time,
+        }
+    return sc
+
+@contextmanager
+def _yahoo_get(sc, url, stream=False):
+    """GET against the Yahoo API inside the user's rate limit (held until the body is read)."""
+    with getattr(sc, 'limiter', None) or nullcontext():
+        with sc.session.get(url, stream=stream) as res:
+            yield res
+
+def forget_yahoo_session(guid):
+    """Drops a user's cached OAuth session (on disconnect)."""
+    with _oauth_lock:
+        _oauth_sessions.pop(guid, None)
 
 def get_user_leagues():
     """Fetches NHL leagues for the dropdown."""
-    sc, temp_oauth_file = _get_yahoo_oauth_session()
-    try:
-        res = sc.session.get("https://fantasysports.yahooapis.com/fantasy/v2/users;use_login=1/games;game_keys=nhl/leagues")
+    sc = _get_yahoo_oauth_session()
+    with _yahoo_get(sc, "https://fantasysports.yahooapis.com/fantasy/v2/users;use_login=1/games;game_keys=nhl/leagues") as res:
         root = ET.fromstring(res.text)
-        ns = {'ns': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
-        
-        leagues_dict = {}
-        for league in root.findall('.//ns:league', ns):
-            leagues_dict[league.find('ns:name', ns).text] = league.find('ns:league_key', ns).text
-        return leagues_dict
-    finally:
-        if os.path.exists(temp_oauth_file): os.remove(temp_oauth_file)
+    ns = {'ns': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
+
+    leagues_dict = {}
+    for league in root.findall('.//ns:league', ns):
+        leagues_dict[league.find('ns:name', ns).text] = league.find('ns:league_key', ns).text
+    return leagues_dict
+
+YAHOO_API = "https://fantasysports.yahooapis.com/fantasy/v2"
+YAHOO_NS  = '{http://fantasysports.yahooapis.com/fantasy/v2/base.rng}'
 
 # Yahoo stat ID → PuckNexus internal column name
 YAHOO_STAT_MAP = {
@@ -112,120 +186,330 @@ YAHOO_STAT_MAP = {
     '32': 'BLK',
 }
 
-def get_league_end_date(selected_league_key):
-    """
-    Fetches the actual last date of the fantasy season directly from Yahoo.
-    Uses the league end_date field which accounts for non-standard playoff weeks.
-    Works for any league regardless of how many weeks or playoff format.
-    """
-    sc, temp_oauth_file = _get_yahoo_oauth_session()
+LEAGUE_META_TTL = 24 * 60 * 60      # settings / cats / end date almost never change mid-season
+NON_STARTING_SLOTS = {'BN', 'IR', 'IR+', 'NA'}
+
+def _fetch_league_meta(sc, league_key):
+    """One /league/{key}/settings pull parsed into everything the app needs about the league."""
     try:
-        res = sc.session.get(
-            f"https://fantasysports.yahooapis.com/fantasy/v2/league/{selected_league_key}"
-        )
-        root = ET.fromstring(res.text)
-        ns = {'ns': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
-
-        from datetime import date as date_type
-        end_date_el = root.find('.//ns:end_date', ns)
-        if end_date_el is not None and end_date_el.text:
-            end_date = date_type.fromisoformat(end_date_el.text)
-            print(f"📅 League end date from Yahoo: {end_date}")
-            return end_date
-        return None
+        with _yahoo_get(sc, f"{YAHOO_API}/league/{league_key}/settings") as res:
+            res.raise_for_status()
+            league = ET.fromstring(res.content).find(f'{YAHOO_NS}league')
+        settings = league.find(f'{YAHOO_NS}settings')
 
+        cats = []
+        for stat in settings.iterfind(f'{YAHOO_NS}stat_categories/{YAHOO_NS}stats/{YAHOO_NS}stat'):
+            stat_id = stat.findtext(f'{YAHOO_NS}stat_id')
+            if stat.findtext(f'{YAHOO_NS}enabled') == '1' and stat_id in YAHOO_STAT_MAP:
+                cats.append(YAHOO_STAT_MAP[stat_id])
+
+        slots = {}
+        for rp in settings.iterfind(f'{YAHOO_NS}roster_positions/{YAHOO_NS}roster_position'):
+            pos = rp.findtext(f'{YAHOO_NS}position')
+            starting = rp.findtext(f'{YAHOO_NS}is_starting_position')
+            if pos and (starting == '1' if starting is not None else pos not in NON_STARTING_SLOTS):
+                slots[pos] = int(rp.findtext(f'{YAHOO_NS}count') or 0)
+
+        end_text = league.findtext(f'{YAHOO_NS}end_date')
+        end_week = int(league.findtext(f'{YAHOO_NS}end_week') or 0)
+        playoff_start = int(settings.findtext(f'{YAHOO_NS}playoff_start_week') or 0)
+        meta = {
+            'name':          league.findtext(f'{YAHOO_NS}name'),
+            'cats':          cats or None,
+            'roster_slots':  slots or None,
+            'start_date':    league.findtext(f'{YAHOO_NS}start_date'),
+            'end_date':      date_type.fromisoformat(end_text) if end_text else None,
+            'current_week':  int(league.findtext(f'{YAHOO_NS}current_week') or 0),
+            'end_week':      end_week,
+            'playoff_weeks': list(range(playoff_start, end_week + 1)) if playoff_start else [],
+            'num_teams':     int(league.findtext(f'{YAHOO_NS}num_teams') or 0),
+        }
+        print(f"📅 League settings from Yahoo: {len(cats)} cats, ends {meta['end_date']}")
+        return meta
     except Exception as e:
-        print(f"⚠️ Could not fetch league end date: {e}")
+        print(f"⚠️ Could not fetch league settings: {e}")
         return None
-    finally:
-        if os.path.exists(temp_oauth_file):
-            os.remove(temp_oauth_file)
 
-def get_league_cats(selected_league_key):
-    """Fetches the scoring categories active in the user's league."""
-    sc, temp_oauth_file = _get_yahoo_oauth_session()
+def get_league_meta(selected_league_key, sc=None):
+    """
+    League settings, scoring categories, starting roster slots, end date and
+    playoff weeks — one request per league per LEAGUE_META_TTL, shared by every
+    session (and across restarts) through the snapshot cache.
+    """
+    sc = sc or _get_yahoo_oauth_session()
+    return get_swr(('yahoo_league_meta', selected_league_key),
+                   lambda: _fetch_league_meta(sc, selected_league_key), LEAGUE_META_TTL)
+
+def get_my_team_key(selected_league_key):
+    """Finds the logged-in user's team key in a league (filters to NHL to bypass the library crash)."""
+    sc = _get_yahoo_oauth_session()
     try:
-        res = sc.session.get(
-            f"https://fantasysports.yahooapis.com/fantasy/v2/league/{selected_league_key}/settings"
-        )
-        root = ET.fromstring(res.text)
-        ns = {'ns': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
-        
-        active_cats = []
-        for stat in root.findall('.//ns:stat', ns):
-            stat_id = stat.findtext('ns:stat_id', namespaces=ns)
-            enabled = stat.findtext('ns:enabled', namespaces=ns)
-            if enabled == '1' and stat_id in YAHOO_STAT_MAP:
-                active_cats.append(YAHOO_STAT_MAP[stat_id])
-        
-        return active_cats if active_cats else None
+        with _yahoo_get(sc, "https://fantasysports.yahooapis.com/fantasy/v2/users;use_login=1/games;game_keys=nhl/teams") as res:
+            root = ET.fromstring(res.text) if res.status_code == 200 else None
+        if root is not None:
+            ns = {'ns': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
+            for team in root.findall('.//ns:team', ns):
+                t_key = team.find('ns:team_key', ns).text
+                if t_key and t_key.startswith(selected_league_key):
+                    return t_key
     except Exception as e:
-        print(f"⚠️ Could not fetch league cats: {e}")
-        return None
-    finally:
-        if os.path.exists(temp_oauth_file): os.remove(temp_oauth_file)
+        print(f"Warning: Could not isolate manager's team key: {e}")
+    return None
 
-def fetch_yahoo_data(selected_league_key):
-    """Pulls roster and free agent data, accurately identifying the user's specific team."""
-    sc, temp_oauth_file = _get_yahoo_oauth_session()
+FA_POSITIONS  = ['C', 'LW', 'RW', 'D', 'G']
+FA_PAGE       = 25                 # Yahoo's max players per collection request
+FA_PAGE_WAVE  = 4                  # pages requested at once per position
+FA_MAX_PAGES  = 40                 # per position — a safety stop, well past any real pool
+FA_WORKERS    = 10                 # parallel free agent page requests
+FA_POOL_TTL   = 15 * 60            # availability moves with every claim — keep it short
+LEAGUE_SYNC_WORKERS = 4            # leagues synced at once; the user's limiter caps the requests underneath
+
+def _iter_elements(sc, url, tag):
+    """
+    Streams a Yahoo response and yields each complete <tag> element as it is
+    parsed, clearing it afterwards — the body is never held as one tree.
+    """
+    with _yahoo_get(sc, url, stream=True) as res:
+        res.raise_for_status()
+        res.raw.decode_content = True
+        for _, el in ET.iterparse(res.raw, events=('end',)):
+            if el.tag == YAHOO_NS + tag:
+                yield el
+                el.clear()
+
+def _player_row(player, status, team_name, manager):
+    name = player.findtext(f'{YAHOO_NS}name/{YAHOO_NS}full', default='')
+    return {
+        'name': name, 'Status': status, 'Fantasy_Team': team_name,
+        'Manager': manager, 'match_key': name.lower().strip(),
+        'Eligible': ",".join(p.text for p in player.iterfind(f'{YAHOO_NS}eligible_positions/{YAHOO_NS}position') if p.text),
+        'player_key': player.findtext(f'{YAHOO_NS}player_key', default=''),
+    }
+
+def _fetch_rosters(sc, league_key):
+    """Every team, its managers and its roster in one collection request."""
+    players, team_info = [], {}
+    for team in _iter_elements(sc, f"{YAHOO_API}/league/{league_key}/teams/roster", 'team'):
+        team_name = team.findtext(f'{YAHOO_NS}name', default='Unknown Team')
+        managers  = team.findall(f'{YAHOO_NS}managers/{YAHOO_NS}manager')
+        manager_name = managers[0].findtext(f'{YAHOO_NS}nickname', default='Unknown GM') if managers else 'Unknown GM'
+        team_info[team_name] = {
+            'key':     team.findtext(f'{YAHOO_NS}team_key'),
+            'owners':  [g for g in (m.findtext(f'{YAHOO_NS}guid') for m in managers) if g],
+            'manager': manager_name,
+        }
+        for p in team.iterfind(f'{YAHOO_NS}roster/{YAHOO_NS}players/{YAHOO_NS}player'):
+            players.append(_player_row(p, 'Rostered', team_name, manager_name))
+    return players, team_info
+
+def _fetch_fa_page(sc, league_key, pos, start):
+    """
+    One page of available players: [(player_key, row)]. Raises on failure — an
+    empty page means the end of the listing, so a failed one must not look like it.
+    """
+    url = f"{YAHOO_API}/league/{league_key}/players;status=A;position={pos};start={start};count={FA_PAGE}"
     try:
-        gm = yfa.Game(sc, 'nhl')
-        lg = gm.to_league(selected_league_key)
-        
-        # FIX 3: Safely get the Team Key by specifically filtering for NHL (Bypasses the library crash)
-        my_team_key = None
-        try:
-            res = sc.session.get("https://fantasysports.yahooapis.com/fantasy/v2/users;use_login=1/games;game_keys=nhl/teams")
-            if res.status_code == 200:
-                root = ET.fromstring(res.text)
-                ns = {'ns': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
-                for team in root.findall('.//ns:team', ns):
-                    t_key = team.find('ns:team_key', ns).text
-                    if t_key and t_key.startswith(selected_league_key):
-                        my_team_key = t_key
-                        break
-        except Exception as e:
-            print(f"Warning: Could not isolate manager's team key: {e}")
-
-        all_players = []
-
-        # Fetch Rosters
-        teams = lg.teams()
-        for team_key, team_data in teams.items():
-            team_name = team_data.get('name', 'Unknown Team')
-            manager_name = team_data.get('managers', [{}])[0].get('manager', {}).get('nickname', 'Unknown GM')
-            
-            # Identify if this team belongs to the logged-in user
-            is_my_team = (team_key == my_team_key)
-            
-            try:
-                for p in lg.to_team(team_key).roster():
-                    all_players.append({
-                        'name': p['name'], 'Status': 'Rostered', 'Fantasy_Team': team_name,
-                        'Manager': manager_name, 'Is_Mine': is_my_team, 'match_key': p['name'].lower().strip()
-                    })
-            except Exception as e:
-                pass
-
-        # Fetch Free Agents
-        try:
-            for pos in ['C', 'LW', 'RW', 'D', 'G']:
-                for p in lg.free_agents(pos)[:20]:
-                    all_players.append({
-                        'name': p['name'], 'Status': 'Free Agent', 'Fantasy_Team': 'Available',
-                        'Manager': 'None', 'Is_Mine': False, 'match_key': p['name'].lower().strip()
-                    })
-        except Exception as e:
-            pass
+        page = []
+        for p in _iter_elements(sc, url, 'player'):
+            row = _player_row(p, 'Free Agent', 'Available', 'None')
+            page.append((row['player_key'] or row['match_key'], row))
+        return page
+    except Exception as e:
+        print(f"⚠️ Free agent page {pos}@{start} failed: {e}")
+        raise
+
+class YahooBridge(LeagueBridge):
+    """
+    Yahoo through one user's OAuth session — the league pull, FA paging and
+    multi-league fan-out run on the shared LeagueBridge code (tunable offline
+    with sync_bench.py). Every request still goes through _yahoo_get, so the
+    user's limiter caps the requests underneath all of its pools.
+    """
+
+    platform       = 'Yahoo'
+    fa_positions   = FA_POSITIONS
+    fa_page_size   = FA_PAGE
+    fa_page_wave   = FA_PAGE_WAVE
+    fa_max_pages   = FA_MAX_PAGES
+    max_workers    = FA_WORKERS
+    league_workers = LEAGUE_SYNC_WORKERS
+
+    def __init__(self, sc):
+        self.sc = sc
+
+    def fetch_rosters(self, league_key):
+        return _fetch_rosters(self.sc, league_key)
+
+    def fetch_fa_page(self, league_key, position, start):
+        return _fetch_fa_page(self.sc, league_key, position, start)
 
-        df = pd.DataFrame(all_players)
-        df = df.drop_duplicates(subset=['match_key'])
-        return df
+    def fetch_settings(self, league_key):
+        return get_league_meta(league_key, self.sc)
+
+    def fetch_fa_pool(self, league_key, pool):
+        """
+        Every available player (free agents and waivers), shared by every session
+        for FA_POOL_TTL. A rebuild may run in the background, so it pages on its
+        own pool; any failed page fails it, so a truncated pool is never cached.
+        """
+        def build():
+            with ThreadPoolExecutor(max_workers=self.max_workers) as own:
+                rows = LeagueBridge.fetch_fa_pool(self, league_key, own)
+            print(f"💎 Yahoo free agent pool: {len(rows)} players")
+            return pd.DataFrame(rows)
+
+        return get_swr(('yahoo_fa_pool', league_key), build, FA_POOL_TTL).to_dict('records')
+
+def fetch_yahoo_league(selected_league_key, sc=None):
+    """
+    Pulls the league-wide roster and free agent data — identical for every manager
+    in the league, so it carries no per-user Is_Mine flag and can be shared.
+
+    All rosters and managers come back from one collection request; the full
+    free agent pool (see YahooBridge.fetch_fa_pool) is paged in parallel alongside it.
+
+    Returns:
+        Dict with keys:
+          players: DataFrame (name, Status, Fantasy_Team, Manager, match_key, Eligible, player_key)
+          teams:   { team_name: {'key': team_key, 'owners': [manager guids], 'manager': nickname} }
+        or None on failure.
+    """
+    sc = sc or _get_yahoo_oauth_session()
+    try:
+        return YahooBridge(sc).fetch_league(selected_league_key)
 
     except Exception as e:
-        print(f"❌ fetch_yahoo_data crashed: {e}")
+        print(f"❌ fetch_yahoo_league crashed: {e}")
         import traceback
         traceback.print_exc()
         return None
-    finally:
-        if os.path.exists(temp_oauth_file): os.remove(temp_oauth_file)
\ No newline at end of file
+
+# ── Incremental sync ─────────────────────────────────────────────────────────
+TXN_PAGE        = 100                 # newest transactions read per incremental sync
+TXN_OVERLAP     = 5 * 60              # re-read this much before the watermark (clock skew; re-applying is harmless)
+FULL_RESYNC_AGE = 24 * 60 * 60        # full pull at least daily so the FA pool doesn't drift
+
+def _fetch_transactions(sc, league_key, since):
+    """
+    Successful add / drop / trade moves newer than `since`, oldest first, as
+    (timestamp, player_key, player name, display position, destination team name or None).
+    Returns None if the page holds nothing older than `since` (moves may be missing).
+    """
+    url = f"{YAHOO_API}/league/{league_key}/transactions;types=add,drop,trade;count={TXN_PAGE}"
+    moves, reached, seen = [], False, 0
+    for txn in _iter_elements(sc, url, 'transaction'):
+        seen += 1
+        ts = int(txn.findtext(f'{YAHOO_NS}timestamp') or 0)
+        if ts <= since:
+            reached = True
+            break
+        if txn.findtext(f'{YAHOO_NS}status') != 'successful':
+            continue
+        for p in txn.iterfind(f'{YAHOO_NS}players/{YAHOO_NS}player'):
+            data = p.find(f'{YAHOO_NS}transaction_data')
+            if data is None:
+                continue
+            dest = data.findtext(f'{YAHOO_NS}destination_team_name') \
+                if data.findtext(f'{YAHOO_NS}destination_type') == 'team' else None
+            moves.append((ts, p.findtext(f'{YAHOO_NS}player_key', default=''),
+                          p.findtext(f'{YAHOO_NS}name/{YAHOO_NS}full', default=''),
+                          p.findtext(f'{YAHOO_NS}display_position', default=''), dest))
+    if not reached and seen >= TXN_PAGE:
+        return None
+    return sorted(moves, key=lambda m: m[0])
+
+def apply_transactions(players, teams, moves):
+    """
+    Replays roster moves onto a league frame. Each move finds its player by
+    Yahoo player_key; the name is only a fallback for rows without one (a
+    snapshot saved before player keys were kept), so one move never touches
+    every player sharing a name.
+
+    Returns:
+        (new players DataFrame, set of match_keys whose row changed)
+    """
+    df = players.copy().reset_index(drop=True)
+    if 'player_key' not in df.columns:
+        df['player_key'] = ''
+    changed = set()
+    for _, player_key, name, positions, dest in moves:
+        key = name.lower().strip()
+        row = {'Status': 'Rostered', 'Fantasy_Team': dest, 'Manager': teams.get(dest, {}).get('manager', 'Unknown GM')} \
+            if dest else {'Status': 'Free Agent', 'Fantasy_Team': 'Available', 'Manager': 'None'}
+        hit = df.index[df['player_key'] == player_key] if player_key else df.index[:0]
+        if hit.empty:
+            hit = df.index[(df['match_key'] == key) & (df['player_key'] == '')][:1]
+        if hit.empty:
+            df = pd.concat([df, pd.DataFrame([{'name': name, 'match_key': key, 'Eligible': positions,
+                                               'player_key': player_key, **row}])], ignore_index=True)
+        else:
+            df.loc[hit, list(row)] = list(row.values())
+            if player_key:
+                df.loc[hit, 'player_key'] = player_key
+        changed.add(key)
+    return df, changed
+
+def sync_yahoo_league(selected_league_key, previous=None, sc=None):
+    """
+    Brings a league snapshot up to date. With a recent previous snapshot only
+    the transactions feed since its watermark is read and replayed; otherwise
+    (or if the feed can't cover the gap) the full league is pulled.
+
+    Returns:
+        fetch_yahoo_league() dict plus 'watermark', 'full_synced_at',
+        'changed' (match_keys touched, or None after a full pull) and
+        'base_version' (snapshot version the changes apply to)
+    """
+    started = time.time()
+    if previous and previous.get('watermark') and started - previous.get('full_synced_at', 0) < FULL_RESYNC_AGE:
+        try:
+            moves = _fetch_transactions(sc or _get_yahoo_oauth_session(), selected_league_key,
+                                        previous['watermark'] - TXN_OVERLAP)
+        except Exception as e:
+            print(f"⚠️ Transactions feed failed, doing a full sync: {e}")
+            moves = None
+        if moves is not None:
+            players, changed = apply_transactions(previous['players'], previous['teams'], moves)
+            print(f"🔁 Incremental Yahoo sync: {len(moves)} moves, {len(changed)} players changed")
+            return {'players': players, 'teams': previous['teams'], 'watermark': started,
+                    'full_synced_at': previous['full_synced_at'], 'changed': changed,
+                    'base_version': previous.get('version')}
+
+    league = fetch_yahoo_league(selected_league_key, sc)
+    if league is None:
+        return None
+    return {**league, 'watermark': started, 'full_synced_at': started, 'changed': None}
+
+def sync_all_yahoo_leagues(league_keys):
+    """
+    Syncs every league of the logged-in user at once — roster/FA snapshot and
+    settings per league, each stored under its own league key, so switching
+    leagues afterwards is a cache read.
+
+    Returns:
+        { league_key: (snapshot or None, league meta or None) }
+    """
+    bridge = YahooBridge(_get_yahoo_oauth_session())   # resolved here: worker threads have no session state
+
+    def sync_one(key):
+        snapshot = get_league_snapshot('Yahoo', key, lambda: sync_yahoo_league(key, peek_league_snapshot('Yahoo', key), bridge.sc),
+                                       force=True)
+        return snapshot, bridge.fetch_settings(key)
+
+    results = {key: r or (None, None) for key, r in bridge.sync_leagues(league_keys, sync_one).items()}
+    print(f"🏒 Synced {sum(snap is not None for snap, _ in results.values())}/{len(results)} Yahoo leagues")
+    return results
+
+def find_my_yahoo_team(league, selected_league_key):
+    """Resolves the logged-in user's team name in a shared league snapshot."""
+    guid = st.session_state.get('yahoo_token_data', {}).get('guid')
+    for team_name, info in league.get('teams', {}).items():
+        if guid and guid in info.get('owners', []):
+            return team_name
+
+    # Fallback: one per-user lookup of the team key
+    my_team_key = get_my_team_key(selected_league_key)
+    for team_name, info in league.get('teams', {}).items():
+        if info.get('key') == my_team_key:
+            return team_name
+    return None